@@ -3,29 +3,176 @@ Agent 1: 기획자 에이전트 (Gemini)
 업종을 분석하고 인기 주제와 키워드를 추천합니다.
 """
 import os
-from typing import List
-from langchain_google_genai import ChatGoogleGenerativeAI
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import SystemMessage, HumanMessage
-from workflow_state import WorkflowState, TopicSuggestion
+from langchain_core.runnables import RunnableConfig
+import telemetry
+from json_extract import extract_json
+from llm_cache import ResponseCache, get_default_cache
+from llm_invoke import CHARS_PER_TOKEN, invoke_llm
+from llm_pool import get_chat_model
+from llm_router import LLMRouter
+from multi_model_agent import llm_from_config
+from topic_index import TopicIndex, get_topic_index, normalize_text
+from workflow_state import WorkflowState, TopicSuggestion, updated_fields
+
+# 업종 하나당 추천 주제 5개 응답의 예상 토큰 수 (배치 분할 기준)
+TOKENS_PER_BUSINESS = 600
+# 배치 요청 하나의 입력+출력 예상 토큰 수 상한
+DEFAULT_BATCH_TOKEN_BUDGET = 8000
+# 배치 요청/개별 재시도를 동시에 실행할 최대 수
+MAX_BATCH_WORKERS = 4
+# 기획 요청 하나에서 추천받는 주제 수 (프롬프트의 "5개"와 같음)
+TOPICS_PER_REQUEST = 5
+# 작성 주제와 겹치지 않는 추천 주제가 이보다 적으면 추가 후보를 한 번 더 요청
+MIN_NEW_TOPICS = 3
+# 추가 후보 요청 시 피해야 할 주제로 알려줄 최대 개수
+MAX_AVOID_TOPICS = 10
+
+_TOPIC_CRITERIA = """당신은 한국의 블로그 마케팅 전문가입니다.
+사용자의 업종을 분석하여 SEO에 유리하고 실제 고객이 많이 검색하는 주제를 추천해야 합니다.
+
+다음 기준으로 주제를 선정하세요:
+1. 높은 검색 볼륨을 가진 키워드
+2. 실용적이고 즉시 적용 가능한 정보
+3. 계절성 또는 최신 트렌드 반영
+4. 전문성을 드러낼 수 있는 주제
+"""
+
+SYSTEM_PROMPT = _TOPIC_CRITERIA + """
+반드시 JSON 형식으로 응답하세요:
+{
+  "suggestions": [
+    {
+      "keyword": "핵심 키워드",
+      "title": "블로그 제목 (35자 이내)",
+      "reason": "이 주제를 추천하는 이유"
+    }
+  ]
+}
+"""
+
+BATCH_SYSTEM_PROMPT = _TOPIC_CRITERIA + """
+여러 업종이 주어지면 업종마다 따로 주제를 추천하고, 업종 이름은 입력 그대로 사용하세요.
+반드시 JSON 형식으로 응답하세요:
+{
+  "results": [
+    {
+      "business_type": "업종",
+      "suggestions": [
+        {
+          "keyword": "핵심 키워드",
+          "title": "블로그 제목 (35자 이내)",
+          "reason": "이 주제를 추천하는 이유"
+        }
+      ]
+    }
+  ]
+}
+"""
+
+# 항상 같은 시스템 프롬프트로 시작하도록 미리 만들어 재사용 (프롬프트 캐시 적중)
+_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+_BATCH_SYSTEM_MESSAGE = SystemMessage(content=BATCH_SYSTEM_PROMPT)
+
+
+def _topics_from(suggestions: Any) -> List[TopicSuggestion]:
+    """JSON의 suggestions 목록을 TopicSuggestion 리스트로 변환 (키워드/제목이 없는 항목은 제외)"""
+    if not isinstance(suggestions, list):
+        return []
+
+    return [
+        TopicSuggestion(
+            keyword=str(s.get("keyword", "")),
+            title=str(s.get("title", "")),
+            reason=str(s.get("reason", ""))
+        )
+        for s in suggestions
+        if isinstance(s, dict) and (s.get("keyword") or s.get("title"))
+    ]
+
+
+def split_batches(business_types: List[str], token_budget: int) -> List[List[str]]:
+    """
+    업종 목록을 요청 하나의 예상 토큰 수가 token_budget을 넘지 않도록 나눕니다.
+    (업종 하나가 예산을 넘더라도 최소 한 개씩은 배치에 넣음)
+    """
+    base = len(BATCH_SYSTEM_PROMPT) // CHARS_PER_TOKEN
+    batches: List[List[str]] = []
+    current: List[str] = []
+    used = base
+
+    for business_type in business_types:
+        cost = TOKENS_PER_BUSINESS + len(business_type) // CHARS_PER_TOKEN + 1
+        if current and used + cost > token_budget:
+            batches.append(current)
+            current, used = [], base
+        current.append(business_type)
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
 
 
 class PlannerAgent:
     """Gemini 기반 주제 기획 에이전트"""
 
-    def __init__(self, model_name: str = "gemini-1.5-pro"):
+    provider = "gemini"
+
+    def __init__(
+        self,
+        model_name: str = "gemini-1.5-pro",
+        cache: Optional[ResponseCache] = None,
+        llm: Optional[BaseChatModel] = None,
+        provider: Optional[str] = None,
+        router: Optional[LLMRouter] = None,
+        json_mode: Optional[bool] = None,
+        topic_index: Optional[TopicIndex] = None
+    ):
+        """
+        Args:
+            model_name: 사용할 Gemini 모델 이름
+            cache: LLM 응답 캐시 (None이면 캐시하지 않음)
+            llm: 사용할 채팅 모델 (지정하면 model_name과 GOOGLE_API_KEY 무시)
+            provider: llm의 프로바이더 이름 (속도 제한에 사용)
+            router: 대체 프로바이더 라우터 (지정하면 llm 대신 라우터로 호출)
+            json_mode: 프로바이더의 JSON 응답 모드 사용 여부
+                (기본값: PLANNER_JSON_MODE 환경 변수, 설정하지 않으면 사용)
+            topic_index: 작성 주제 색인 (지정하면 이미 작성한 주제와 비슷한 추천을 걸러냄)
+        """
+        self.cache = cache
+        self.router = router
+        self.topic_index = topic_index
+        if json_mode is None:
+            json_mode = os.getenv("PLANNER_JSON_MODE", "1") != "0"
+        self.json_mode = json_mode
+        if provider is not None:
+            self.provider = provider
+
+        if llm is not None:
+            self.llm = llm
+            return
+
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_API_KEY가 설정되지 않았습니다.")
 
-        self.llm = ChatGoogleGenerativeAI(
+        # 프로세스 전역 풀에서 클라이언트 재사용 (HTTP 연결 유지)
+        self.llm = get_chat_model(
+            "gemini",
             model=model_name,
-            google_api_key=api_key,
+            api_key=api_key,
             temperature=0.7
         )
 
     def suggest_topics(self, state: WorkflowState) -> WorkflowState:
         """
         업종을 분석하여 블로그 주제를 추천합니다.
+        주제 색인이 있으면 이미 작성한 주제와 비슷한 추천은 빼고,
+        남은 주제가 MIN_NEW_TOPICS개보다 적을 때만 추가 후보를 요청합니다.
 
         Args:
             state: 현재 워크플로우 상태 (business_type 필요)
@@ -34,70 +181,222 @@ class PlannerAgent:
             업데이트된 상태 (topic_suggestions 추가)
         """
         business_type = state["business_type"]
+        topics = self._exclude_written(business_type, self._plan(business_type))
 
-        system_prompt = """당신은 한국의 블로그 마케팅 전문가입니다.
-사용자의 업종을 분석하여 SEO에 유리하고 실제 고객이 많이 검색하는 주제를 추천해야 합니다.
+        # 상태 업데이트
+        state["topic_suggestions"] = topics
+        state["current_step"] = "topic_selection"
 
-다음 기준으로 주제를 선정하세요:
-1. 높은 검색 볼륨을 가진 키워드
-2. 실용적이고 즉시 적용 가능한 정보
-3. 계절성 또는 최신 트렌드 반영
-4. 전문성을 드러낼 수 있는 주제
+        return state
 
-반드시 JSON 형식으로 응답하세요:
-{
-  "suggestions": [
-    {
-      "keyword": "핵심 키워드",
-      "title": "블로그 제목 (35자 이내)",
-      "reason": "이 주제를 추천하는 이유"
-    }
-  ]
-}
-"""
+    def suggest_topics_batch(
+        self,
+        business_types: List[str],
+        token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET
+    ) -> Dict[str, List[TopicSuggestion]]:
+        """
+        여러 업종의 블로그 주제를 한 요청에 묶어 추천합니다.
+        예상 토큰 수가 token_budget(모델의 max_tokens가 더 작으면 그 값)을 넘지 않도록
+        요청을 나누고, 배치 응답에서 빠지거나 파싱되지 않은 업종은 개별 요청으로 다시 추천합니다.
+        주제 색인이 있으면 업종별로 suggest_topics와 같은 방식으로 작성한 주제를 걸러냅니다.
+        개별 요청까지 실패한 업종은 결과에서 빠지며, 나머지 업종의 결과는 그대로 반환합니다.
+
+        Args:
+            business_types: 업종 목록 (중복은 한 번만 요청)
+            token_budget: 배치 요청 하나의 입력+출력 예상 토큰 수 상한
+
+        Returns:
+            {업종: 추천 주제 리스트} (기획에 실패한 업종 제외)
+        """
+        business_types = list(dict.fromkeys(business_types))
+        max_tokens = getattr(self.llm, "max_tokens", None)
+        if max_tokens:
+            token_budget = min(token_budget, int(max_tokens))
+
+        batches = split_batches(business_types, token_budget)
+        results: Dict[str, List[TopicSuggestion]] = {}
+
+        with ThreadPoolExecutor(max_workers=min(MAX_BATCH_WORKERS, len(batches) or 1)) as executor:
+            for planned in executor.map(telemetry.bind(self._plan_batch), batches):
+                results.update(planned)
+
+            # 배치 응답에서 빠진 업종만 개별 요청 (한 업종이 실패해도 이미 기획한 결과는 유지)
+            missing = [b for b in business_types if not results.get(b)]
+            futures = {
+                executor.submit(telemetry.bind(self._plan), business_type): business_type
+                for business_type in missing
+            }
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception:
+                    telemetry.registry.inc(
+                        "llm_json_parse_total", agent="planner", result="fallback"
+                    )
+
+            planned = [b for b in business_types if results.get(b)]
+            if self.topic_index is not None:
+                results = dict(zip(planned, executor.map(
+                    telemetry.bind(lambda b: self._exclude_written(b, results[b])),
+                    planned
+                )))
+
+        return {business_type: results[business_type] for business_type in planned}
+
+    def extend_topics(
+        self, business_type: str, topics: List[TopicSuggestion], minimum: int
+    ) -> List[TopicSuggestion]:
+        """
+        주제가 minimum개 이상이 될 때까지 기존 주제와 겹치지 않는 주제를 추가로 요청합니다.
+        같은 업종의 입력 여러 개가 서로 다른 주제를 쓰도록 할 때 사용하며,
+        새 주제가 나오지 않거나 요청이 실패하면 그때까지 모은 주제를 반환합니다.
+        """
+        topics = list(topics)
+        keywords = {normalize_text(t.keyword) for t in topics}
+        # 요청 하나에 TOPICS_PER_REQUEST개씩 추천받으므로, 겹치는 추천을 감안해 한 번 더 여유를 둠
+        max_requests = max(0, minimum - len(topics)) // TOPICS_PER_REQUEST + 2
+        for _ in range(max_requests):
+            if len(topics) >= minimum:
+                break
+            try:
+                extra = self._plan(business_type, avoid=topics)
+            except Exception:
+                break
+            new = [t for t in extra if normalize_text(t.keyword) not in keywords]
+            if not new:
+                break
+            topics.extend(new)
+            keywords.update(normalize_text(t.keyword) for t in new)
+        return topics
+
+    def _exclude_written(
+        self, business_type: str, topics: List[TopicSuggestion]
+    ) -> List[TopicSuggestion]:
+        """
+        작성 주제 색인과 비슷한 추천을 제외합니다 (색인이 없으면 그대로 반환).
+        남은 주제가 MIN_NEW_TOPICS개보다 적으면 겹친 주제를 피하도록 추가 후보를 한 번 요청하고
+        (추가 요청이 실패하면 이미 걸러낸 주제만 사용),
+        그래도 모두 겹치면 작성 주제와 가장 덜 비슷한 순으로 반환합니다.
+        """
+        index = self.topic_index
+        if index is None or not topics:
+            return topics
+
+        fresh, duplicates = index.filter_new(business_type, topics)
+        if len(fresh) < MIN_NEW_TOPICS:
+            try:
+                extra = self._plan(business_type, avoid=duplicates + fresh)
+            except Exception:
+                # 추가 요청이 실패해도 이미 걸러낸 새 주제는 유지
+                extra = []
+            if extra:
+                fresh, more = index.filter_new(business_type, fresh + extra)
+                duplicates += more
+
+        telemetry.registry.inc("topic_index_checks_total", len(fresh), result="new")
+        telemetry.registry.inc("topic_index_checks_total", len(duplicates), result="duplicate")
+        if fresh:
+            return fresh
+        return sorted(duplicates, key=lambda t: index.max_similarity(business_type, t))
+
+    def _plan(
+        self, business_type: str, avoid: Optional[List[TopicSuggestion]] = None
+    ) -> List[TopicSuggestion]:
+        """
+        업종 하나의 주제 추천 (LLM 호출 1회)
 
+        Args:
+            business_type: 업종
+            avoid: 이미 작성했거나 추천된 주제 (추가 후보 요청 시 겹치지 않도록 알려줌)
+        """
         user_prompt = f"""업종: {business_type}
 
 위 업종에 적합한 블로그 주제를 5개 추천해주세요.
 각 주제는 실제로 고객이 검색할 만한 키워드를 포함해야 합니다."""
 
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
-        ]
+        if avoid:
+            listing = "\n".join(
+                f"- {t.keyword}: {t.title}" for t in avoid[:MAX_AVOID_TOPICS]
+            )
+            user_prompt += f"""
 
-        response = self.llm.invoke(messages)
+다음 주제는 이미 작성했거나 추천된 주제이므로, 키워드와 관점이 겹치지 않는 새 주제를 추천해주세요:
+{listing}"""
 
-        # 응답 파싱 (간단한 구현)
-        topics = self._parse_response(response.content, business_type)
+        response = self._invoke([_SYSTEM_MESSAGE, HumanMessage(content=user_prompt)])
+        return self._parse_response(response, business_type)
 
-        # 상태 업데이트
-        state["topic_suggestions"] = topics
-        state["current_step"] = "topic_selection"
+    def _plan_batch(self, business_types: List[str]) -> Dict[str, List[TopicSuggestion]]:
+        """
+        업종 여러 개를 한 요청으로 추천합니다.
+        호출이 실패하거나 파싱되지 않은 업종은 결과에서 빠지고, 호출한 쪽에서 개별 요청합니다.
+        """
+        if len(business_types) == 1:
+            return {business_types[0]: self._plan(business_types[0])}
 
-        return state
+        listing = "\n".join(f"- {business_type}" for business_type in business_types)
+        user_prompt = f"""업종 목록:
+{listing}
+
+위 업종마다 적합한 블로그 주제를 5개씩 추천해주세요.
+각 주제는 실제로 고객이 검색할 만한 키워드를 포함해야 합니다."""
+
+        try:
+            response = self._invoke([_BATCH_SYSTEM_MESSAGE, HumanMessage(content=user_prompt)])
+        except Exception:
+            telemetry.registry.inc(
+                "llm_json_parse_total", agent="planner_batch", result="fallback"
+            )
+            return {}
+
+        data, method = extract_json(response)
+
+        # {"results": [{"business_type", "suggestions"}]} 외에 {업종: [...]} 형태도 허용
+        entries = data.get("results", data) if isinstance(data, dict) else data
+        if isinstance(entries, dict):
+            entries = [
+                {"business_type": key, "suggestions": value} for key, value in entries.items()
+            ]
+
+        requested = set(business_types)
+        planned: Dict[str, List[TopicSuggestion]] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            business_type = str(entry.get("business_type", "")).strip()
+            topics = _topics_from(entry.get("suggestions"))
+            if business_type in requested and topics:
+                planned[business_type] = topics
+
+        telemetry.registry.inc(
+            "llm_json_parse_total", agent="planner_batch",
+            result=method if len(planned) == len(requested) else "fallback"
+        )
+        return planned
+
+    def _invoke(self, messages) -> str:
+        """LLM 호출 (캐시 적중 시 호출 생략, 프로바이더 속도 제한 적용)"""
+        if self.router is not None:
+            return self.router.invoke(messages, self.cache, json_mode=self.json_mode)
+        return invoke_llm(
+            self.llm, messages, self.provider, self.cache, json_mode=self.json_mode
+        )
 
     def _parse_response(self, response: str, business_type: str) -> List[TopicSuggestion]:
-        """LLM 응답을 파싱하여 TopicSuggestion 리스트로 변환"""
-        import json
-        import re
+        """
+        LLM 응답을 파싱하여 TopicSuggestion 리스트로 변환
+        코드 블록이나 앞뒤 설명이 있어도 JSON 부분만 찾고, 끝 쉼표나 잘린 응답은 복구해서 사용합니다.
+        """
+        data, method = extract_json(response)
 
-        # JSON 블록 추출
-        json_match = re.search(r'\{[\s\S]*\}', response)
-        if json_match:
-            try:
-                data = json.loads(json_match.group())
-                suggestions = data.get("suggestions", [])
-                return [
-                    TopicSuggestion(
-                        keyword=s.get("keyword", ""),
-                        title=s.get("title", ""),
-                        reason=s.get("reason", "")
-                    )
-                    for s in suggestions
-                ]
-            except json.JSONDecodeError:
-                pass
+        # {"suggestions": [...]} 외에 목록만 응답한 경우도 허용
+        topics = _topics_from(data.get("suggestions") if isinstance(data, dict) else data)
+
+        telemetry.registry.inc(
+            "llm_json_parse_total", agent="planner", result=method if topics else "fallback"
+        )
+        if topics:
+            return topics
 
         # 파싱 실패 시 기본값 반환
         return [
@@ -109,7 +408,24 @@ class PlannerAgent:
         ]
 
 
-def planner_node(state: WorkflowState) -> WorkflowState:
-    """LangGraph 노드로 사용할 함수"""
-    agent = PlannerAgent()
-    return agent.suggest_topics(state)
+def planner_node(
+    state: WorkflowState, config: Optional[RunnableConfig] = None
+) -> Dict[str, Any]:
+    """
+    LangGraph 노드로 사용할 함수 (바뀐 필드만 반환)
+    config의 configurable에 planner_model이 있으면 해당 모델을 사용하고,
+    topic_index(또는 TOPIC_INDEX_PATH 환경 변수)가 있으면 작성한 주제와 비슷한 추천을 걸러냅니다.
+    """
+    # 주제 목록이 이미 있으면 (사전 지정된 주제 등) 기획 단계를 건너뜀
+    if state.get("topic_suggestions"):
+        return {}
+
+    before = dict(state)
+    agent = PlannerAgent(
+        cache=get_default_cache(),
+        topic_index=get_topic_index(config),
+        **llm_from_config(
+            config, "planner", temperature=0.7, default_provider=PlannerAgent.provider
+        )
+    )
+    return updated_fields(before, agent.suggest_topics(state))
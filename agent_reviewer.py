@@ -0,0 +1,233 @@
+"""
+Agent 3: 검수 에이전트 (GPT-4o)
+플랫폼별 글을 채점하고, 기준에 못 미치는 글에는 다시 작성할 때 반영할 피드백을 남깁니다.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+import telemetry
+from json_extract import extract_json
+from llm_cache import ResponseCache, get_default_cache
+from llm_invoke import invoke_llm
+from llm_pool import get_chat_model
+from llm_router import LLMRouter
+from multi_model_agent import llm_from_config
+from workflow_state import (
+    ContentVersion, ReviewResult, WorkflowState, add_review_usage, text_hash, updated_fields
+)
+
+# 통과 기준 점수 (0~100)
+PASS_SCORE = 70
+
+# 검수 → 재작성 루프 기본 한도 (configurable의 max_review_retries,
+# review_token_budget, review_time_budget으로 변경)
+MAX_REVIEW_RETRIES = 2
+DEFAULT_REVIEW_TOKEN_BUDGET = 60_000
+DEFAULT_REVIEW_TIME_BUDGET = 300.0
+
+SYSTEM_PROMPT = f"""당신은 한국어 블로그 콘텐츠 편집자입니다.
+주어진 플랫폼용 블로그 글을 다음 기준으로 0~100점으로 채점하세요:
+1. 주제와 키워드에 맞는 내용인지
+2. 정확하고 실용적인 정보인지
+3. 플랫폼 특성(톤, 형식)에 맞는지
+4. 읽기 쉬운 구성과 자연스러운 문장인지
+
+{PASS_SCORE}점 미만이면 다시 작성할 때 바로 반영할 수 있도록 고칠 점을 구체적으로 적으세요.
+
+반드시 JSON 형식으로 응답하세요:
+{{"score": 85, "feedback": "고칠 점 (통과면 빈 문자열)"}}
+"""
+
+_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
+
+def rejected_platforms(state: WorkflowState) -> List[str]:
+    """검수에서 불합격한 플랫폼 목록"""
+    return [
+        platform for platform, result in (state.get("review_results") or {}).items()
+        if not result.passed
+    ]
+
+
+def can_retry_review(state: WorkflowState, config: Optional[RunnableConfig] = None) -> bool:
+    """
+    불합격한 플랫폼을 다시 작성해도 되는지 (상태는 바꾸지 않음)
+    조건 분기(should_retry)와 writer 노드가 함께 사용하므로, 한도를 넘긴 실행을
+    체크포인트에서 이어서 실행해도 다시 작성하지 않습니다.
+
+    configurable:
+        max_review_retries: 최대 재작성 횟수 (기본값: 2)
+        review_token_budget: 검수/재작성 루프의 토큰 예산 (기본값: 60,000)
+        review_time_budget: 검수/재작성 루프의 시간 예산(초) (기본값: 300)
+    """
+    if state.get("review_passed") is not False or not rejected_platforms(state):
+        return False
+
+    configurable = (config or {}).get("configurable") or {}
+    if state.get("retry_count", 0) >= configurable.get("max_review_retries", MAX_REVIEW_RETRIES):
+        return False
+
+    usage = state.get("review_usage") or {}
+    if usage.get("tokens", 0) >= configurable.get(
+        "review_token_budget", DEFAULT_REVIEW_TOKEN_BUDGET
+    ):
+        return False
+    return usage.get("seconds", 0.0) < configurable.get(
+        "review_time_budget", DEFAULT_REVIEW_TIME_BUDGET
+    )
+
+
+class ReviewerAgent:
+    """GPT 기반 콘텐츠 검수 에이전트"""
+
+    provider = "gpt"
+
+    def __init__(
+        self,
+        model_name: str = "gpt-4o",
+        cache: Optional[ResponseCache] = None,
+        llm: Optional[BaseChatModel] = None,
+        provider: Optional[str] = None,
+        router: Optional[LLMRouter] = None,
+        pass_score: int = PASS_SCORE
+    ):
+        """
+        Args:
+            model_name: 사용할 OpenAI 모델 이름
+            cache: LLM 응답 캐시 (None이면 캐시하지 않음)
+            llm: 사용할 채팅 모델 (지정하면 model_name과 OPENAI_API_KEY 무시)
+            provider: llm의 프로바이더 이름 (속도 제한에 사용)
+            router: 대체 프로바이더 라우터 (지정하면 llm 대신 라우터로 호출)
+            pass_score: 통과 기준 점수
+        """
+        self.cache = cache
+        self.router = router
+        self.pass_score = pass_score
+        if provider is not None:
+            self.provider = provider
+
+        if llm is not None:
+            self.llm = llm
+            return
+
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+
+        # 프로세스 전역 풀에서 클라이언트 재사용 (HTTP 연결 유지)
+        self.llm = get_chat_model(
+            "gpt",
+            model=model_name,
+            api_key=api_key,
+            temperature=0.3
+        )
+
+    def review_content(self, state: WorkflowState) -> WorkflowState:
+        """
+        플랫폼별 글을 검수합니다.
+        이전 검수를 통과했고 그 뒤로 본문이 바뀌지 않은 플랫폼은 기존 결과를 그대로 사용하므로,
+        재작성 후에는 다시 작성한 플랫폼만 검수합니다.
+
+        Args:
+            state: 현재 워크플로우 상태 (selected_topic, content_versions 필요)
+
+        Returns:
+            업데이트된 상태 (review_results, review_passed, review_feedback)
+        """
+        versions = state.get("content_versions") or []
+        if not versions:
+            raise ValueError("검수할 콘텐츠가 없습니다.")
+
+        previous = state.get("review_results") or {}
+        targets = [
+            v for v in versions
+            if v.platform not in previous
+            or not previous[v.platform].passed
+            or previous[v.platform].content_hash != text_hash(v.content)
+        ]
+
+        results = {v.platform: previous[v.platform] for v in versions if v.platform in previous}
+        if targets:
+            with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+                futures = {
+                    v.platform: executor.submit(
+                        telemetry.bind(self._review_version), state, v
+                    )
+                    for v in targets
+                }
+                for platform, future in futures.items():
+                    try:
+                        results[platform] = future.result()
+                    except Exception:
+                        # 검수하지 못한 플랫폼은 결과 없이 두어 다음 검수에서 다시 시도
+                        results.pop(platform, None)
+
+        state["review_results"] = results
+        state["review_passed"] = all(
+            v.platform in results and results[v.platform].passed for v in versions
+        )
+        state["review_feedback"] = "\n".join(
+            f"[{r.platform}] {r.feedback}" for r in results.values() if not r.passed
+        ) or None
+        state["current_step"] = "image_generation" if state["review_passed"] else "content_review"
+
+        return state
+
+    def _review_version(self, state: WorkflowState, version: ContentVersion) -> ReviewResult:
+        """플랫폼 하나의 글 검수 (응답을 해석할 수 없으면 ValueError)"""
+        topic = state["selected_topic"]
+        user_prompt = f"""【플랫폼】 {version.platform} (톤: {version.tone})
+【업종】 {state["business_type"]}
+【키워드】 {topic.keyword}
+【제목】 {topic.title}
+
+【본문】
+{version.content}"""
+
+        response = self._invoke([_SYSTEM_MESSAGE, HumanMessage(content=user_prompt)])
+        data, method = extract_json(response)
+        if not isinstance(data, dict) or not isinstance(data.get("score"), (int, float)):
+            telemetry.registry.inc("llm_json_parse_total", agent="reviewer", result="fallback")
+            raise ValueError(f"검수 응답을 해석할 수 없습니다: {response[:200]}")
+
+        telemetry.registry.inc("llm_json_parse_total", agent="reviewer", result=method)
+        score = max(0, min(100, int(data["score"])))
+        return ReviewResult(
+            platform=version.platform,
+            passed=score >= self.pass_score,
+            score=score,
+            feedback=str(data.get("feedback") or ""),
+            content_hash=text_hash(version.content)
+        )
+
+    def _invoke(self, messages) -> str:
+        """LLM 호출 (캐시 적중 시 호출 생략, 프로바이더 속도 제한 적용)"""
+        if self.router is not None:
+            return self.router.invoke(messages, self.cache, json_mode=True)
+        return invoke_llm(self.llm, messages, self.provider, self.cache, json_mode=True)
+
+
+def reviewer_node(
+    state: WorkflowState, config: Optional[RunnableConfig] = None
+) -> Dict[str, Any]:
+    """
+    LangGraph 노드로 사용할 함수 (바뀐 필드만 반환)
+    config의 configurable에 reviewer_model이 있으면 해당 모델을 사용합니다.
+    검수에 쓴 토큰 수와 시간은 review_usage에 누적됩니다.
+    """
+    started = time.monotonic()
+    before = dict(state)
+    agent = ReviewerAgent(
+        cache=get_default_cache(),
+        **llm_from_config(
+            config, "reviewer", temperature=0.3, default_provider=ReviewerAgent.provider
+        )
+    )
+    state = agent.review_content(state)
+    add_review_usage(state, telemetry.current_tokens(), time.monotonic() - started)
+    return updated_fields(before, state)
+
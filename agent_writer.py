@@ -2,132 +2,365 @@
 Agent 2: 작가 에이전트 (Claude)
 선택된 주제로 플랫폼별 맞춤 콘텐츠를 작성합니다.
 """
+import hashlib
+import json
 import os
-from typing import List
-from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import SystemMessage, HumanMessage
-from workflow_state import WorkflowState, ContentVersion
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+import rate_limit
+import telemetry
+from agent_reviewer import can_retry_review, rejected_platforms
+from checkpoint import get_checkpoint_context
+from llm_cache import ResponseCache, get_default_cache
+from llm_invoke import invoke_llm, stream_llm
+from llm_pool import get_chat_model
+from llm_router import LLMRouter
+from multi_model_agent import llm_from_config
+from topic_index import get_topic_index
+from workflow_state import WorkflowState, ContentVersion, add_review_usage, updated_fields
+
+
+# 플랫폼 작성 순서와 톤 (content_versions는 항상 이 순서를 따름)
+PLATFORM_TONES: Dict[str, str] = {
+    "naver": "friendly",       # 친근하고 이모지 활용
+    "tistory": "professional",  # 정보 전달 중심, 깔끔한 구조
+    "google": "professional",  # SEO 최적화, 전문적
+}
+
+
+# 플랫폼별 글쓰기 가이드라인 (시스템 프롬프트의 고정 부분)
+PLATFORM_GUIDELINES: Dict[str, Dict[str, str]] = {
+    "naver": {
+        "tone": "친근하고 대화하듯이",
+        "structure": "짧은 문단, 이모지 활용, 공감 유도",
+        "style": "카카오톡 대화하듯 편안하게",
+        "example": "안녕하세요! 😊 오늘은 여러분께..."
+    },
+    "tistory": {
+        "tone": "정보 전달 중심, 신뢰감 있게",
+        "structure": "명확한 소제목, 리스트 활용, 단계별 설명",
+        "style": "전문가가 설명하는 느낌",
+        "example": "## 1. 핵심 정보\n\n본문 내용..."
+    },
+    "google": {
+        "tone": "전문적이고 객관적",
+        "structure": "SEO 키워드 자연스럽게 배치, H2/H3 태그 활용",
+        "style": "검색 엔진 최적화",
+        "example": "# 제목 (H1)\n\n## 주요 내용 (H2)..."
+    }
+}
+
+
+def _build_system_prompt(platform: str) -> str:
+    """플랫폼별 시스템 프롬프트 (주제/업종과 무관하게 고정)"""
+    guideline = PLATFORM_GUIDELINES[platform]
+
+    return f"""당신은 한국의 전문 블로그 작가입니다.
+주어진 주제로 {platform} 플랫폼에 최적화된 블로그 글을 작성해야 합니다.
+
+【플랫폼별 가이드라인】
+- 톤: {guideline['tone']}
+- 구조: {guideline['structure']}
+- 스타일: {guideline['style']}
+
+【작성 원칙】
+1. 독자가 실제로 적용할 수 있는 구체적인 정보 제공
+2. 전문성과 신뢰감을 주는 내용
+3. 적절한 길이 (1,200~1,800자)
+4. 자연스러운 키워드 배치
+5. 행동 유도 (CTA) 포함
+
+【금지 사항】
+- 과도한 광고성 문구
+- 검증되지 않은 정보
+- 비속어나 부적절한 표현
+"""
+
+
+# 모듈 로드 시 한 번만 만들어 모든 요청이 같은 객체(같은 프롬프트 앞부분)를 사용
+PLATFORM_SYSTEM_MESSAGES: Dict[str, SystemMessage] = {
+    platform: SystemMessage(content=_build_system_prompt(platform))
+    for platform in PLATFORM_TONES
+}
+
+
+def set_provider_concurrency(provider: str, max_in_flight: int) -> None:
+    """
+    프로바이더별 최대 동시 요청 수를 설정합니다.
+    실제 한도는 rate_limit의 적응형 동시 요청 수 조절기가 이 값 안에서 조절합니다.
+
+    Args:
+        provider: 프로바이더 이름 (예: "claude")
+        max_in_flight: 동시에 진행할 수 있는 최대 요청 수
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight는 1 이상이어야 합니다.")
+
+    rate_limit.set_max_concurrency(provider, max_in_flight)
 
 
 class WriterAgent:
     """Claude 기반 콘텐츠 작성 에이전트"""
 
-    def __init__(self, model_name: str = "claude-3-5-sonnet-20241022"):
+    provider = "claude"
+
+    def __init__(
+        self,
+        model_name: str = "claude-3-5-sonnet-20241022",
+        concurrent: bool = False,
+        cache: Optional[ResponseCache] = None,
+        llm: Optional[BaseChatModel] = None,
+        provider: Optional[str] = None,
+        router: Optional[LLMRouter] = None
+    ):
+        """
+        Args:
+            model_name: 사용할 Claude 모델 이름
+            concurrent: True면 모든 플랫폼 요청을 동시에 보냄
+                (프로바이더별 동시 요청 수는 set_provider_concurrency로 제한)
+            cache: LLM 응답 캐시 (None이면 캐시하지 않음)
+            llm: 사용할 채팅 모델 (지정하면 model_name과 ANTHROPIC_API_KEY 무시,
+                예: MultiModelAgent(...).llm)
+            provider: llm의 프로바이더 이름 (동시 요청 수/속도 제한에 사용)
+            router: 대체 프로바이더 라우터 (지정하면 llm 대신 라우터로 호출)
+        """
+        self.concurrent = concurrent
+        self.cache = cache
+        self.router = router
+        if provider is not None:
+            self.provider = provider
+
+        if llm is not None:
+            self.llm = llm
+            return
+
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY가 설정되지 않았습니다.")
 
-        self.llm = ChatAnthropic(
+        # 프로세스 전역 풀에서 클라이언트 재사용 (HTTP 연결 유지)
+        self.llm = get_chat_model(
+            "claude",
             model=model_name,
-            anthropic_api_key=api_key,
+            api_key=api_key,
             temperature=0.8,
             max_tokens=4096
         )
 
-    def write_content(self, state: WorkflowState) -> WorkflowState:
+    def write_content(
+        self,
+        state: WorkflowState,
+        on_platform_done: Optional[Callable[[ContentVersion], None]] = None
+    ) -> WorkflowState:
         """
         선택된 주제로 플랫폼별 콘텐츠를 작성합니다.
+        content_versions에 이미 있는 플랫폼은 유지하고, 빠졌거나 입력(주제, 톤 가이드라인, 모델)이
+        바뀐 플랫폼만 작성합니다 (체크포인트에서 이어서 실행하는 경우 등).
 
         Args:
             state: 현재 워크플로우 상태 (selected_topic 필요)
+            on_platform_done: 플랫폼 하나의 작성이 끝날 때마다 호출할 함수
 
         Returns:
             업데이트된 상태 (content_versions 추가)
         """
+        return self._write(state, [], on_platform_done)
+
+    def regenerate(
+        self,
+        state: WorkflowState,
+        platforms: List[str],
+        on_platform_done: Optional[Callable[[ContentVersion], None]] = None,
+        feedback: Optional[Dict[str, str]] = None
+    ) -> WorkflowState:
+        """
+        선택한 플랫폼만 다시 작성합니다 (응답 캐시를 무시하고 새로 생성).
+        나머지 플랫폼은 content_versions의 글을 유지하되, 입력이 바뀐 플랫폼은 함께 다시 작성합니다.
+        다시 작성에 실패한 플랫폼은 기존 글을 유지하고 content_errors에 기록합니다.
+
+        Args:
+            state: 현재 워크플로우 상태 (selected_topic, content_versions 필요)
+            platforms: 다시 작성할 플랫폼 목록 (예: ["naver"])
+            on_platform_done: 플랫폼 하나의 작성이 끝날 때마다 호출할 함수
+            feedback: 다시 작성할 때 프롬프트에 넣을 {플랫폼: 검수 피드백}
+
+        Returns:
+            업데이트된 상태
+        """
+        unknown = [platform for platform in platforms if platform not in PLATFORM_TONES]
+        if unknown:
+            raise ValueError(f"지원하지 않는 플랫폼: {', '.join(unknown)}")
+
+        return self._write(state, platforms, on_platform_done, feedback)
+
+    def input_hash(self, topic, business_type: str, platform: str) -> str:
+        """플랫폼 글의 입력 해시 (프롬프트, 톤, 모델이 같으면 같은 값)"""
+        return self._hash_messages(self._build_messages(topic, business_type, platform), platform)
+
+    def _hash_messages(self, messages: List[BaseMessage], platform: str) -> str:
+        payload = json.dumps({
+            "messages": [str(message.content) for message in messages],
+            "tone": PLATFORM_TONES[platform],
+            "model": telemetry.model_name(self.llm),
+        }, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def stale_platforms(self, state: WorkflowState) -> List[str]:
+        """content_versions 중 작성 당시와 입력이 달라진 플랫폼 (해시가 없는 글은 유지)"""
+        topic = state["selected_topic"]
+        return [
+            version.platform for version in state.get("content_versions") or []
+            if version.input_hash is not None
+            and version.input_hash != self.input_hash(topic, state["business_type"], version.platform)
+        ]
+
+    def _write(
+        self,
+        state: WorkflowState,
+        refresh: List[str],
+        on_platform_done: Optional[Callable[[ContentVersion], None]],
+        feedback: Optional[Dict[str, str]] = None
+    ) -> WorkflowState:
+        """refresh 플랫폼과 빠졌거나 입력이 바뀐 플랫폼을 작성하여 content_versions에 합침"""
         if not state.get("selected_topic"):
             raise ValueError("선택된 주제가 없습니다.")
 
         topic = state["selected_topic"]
         business_type = state["business_type"]
 
-        # 플랫폼별로 콘텐츠 생성
-        content_versions = []
+        existing = {c.platform: c for c in state.get("content_versions") or []}
+        outdated = set(refresh) | set(self.stale_platforms(state))
+        targets = [
+            platform for platform in PLATFORM_TONES
+            if platform not in existing or platform in outdated
+        ]
 
-        # 1. 네이버 블로그용 (친근하고 이모지 활용)
-        naver_content = self._generate_platform_content(
-            topic, business_type, "naver"
-        )
-        content_versions.append(ContentVersion(
-            platform="naver",
-            content=naver_content,
-            tone="friendly"
-        ))
-
-        # 2. 티스토리용 (정보 전달 중심, 깔끔한 구조)
-        tistory_content = self._generate_platform_content(
-            topic, business_type, "tistory"
-        )
-        content_versions.append(ContentVersion(
-            platform="tistory",
-            content=tistory_content,
-            tone="professional"
-        ))
-
-        # 3. 구글 블로그용 (SEO 최적화, 전문적)
-        google_content = self._generate_platform_content(
-            topic, business_type, "google"
+        # 플랫폼별로 콘텐츠 생성 (다시 작성 요청한 플랫폼은 캐시 무시)
+        new_versions, content_errors = self._generate_all_platforms(
+            topic, business_type, targets, on_platform_done, refresh=set(refresh),
+            feedback=feedback
         )
-        content_versions.append(ContentVersion(
-            platform="google",
-            content=google_content,
-            tone="professional"
-        ))
+
+        existing.update((c.platform, c) for c in new_versions)
+        content_versions = [
+            existing[platform] for platform in PLATFORM_TONES if platform in existing
+        ]
+
+        if not content_versions:
+            raise RuntimeError(
+                "모든 플랫폼의 콘텐츠 생성에 실패했습니다: "
+                + ", ".join(f"{p}({e})" for p, e in content_errors.items())
+            )
 
         # 상태 업데이트
         state["content_versions"] = content_versions
+        state["content_errors"] = content_errors or None
         state["current_step"] = "content_review"
 
         return state
 
-    def _generate_platform_content(
-        self, topic, business_type: str, platform: str
-    ) -> str:
-        """플랫폼별 맞춤 콘텐츠 생성"""
-
-        platform_guidelines = {
-            "naver": {
-                "tone": "친근하고 대화하듯이",
-                "structure": "짧은 문단, 이모지 활용, 공감 유도",
-                "style": "카카오톡 대화하듯 편안하게",
-                "example": "안녕하세요! 😊 오늘은 여러분께..."
-            },
-            "tistory": {
-                "tone": "정보 전달 중심, 신뢰감 있게",
-                "structure": "명확한 소제목, 리스트 활용, 단계별 설명",
-                "style": "전문가가 설명하는 느낌",
-                "example": "## 1. 핵심 정보\n\n본문 내용..."
-            },
-            "google": {
-                "tone": "전문적이고 객관적",
-                "structure": "SEO 키워드 자연스럽게 배치, H2/H3 태그 활용",
-                "style": "검색 엔진 최적화",
-                "example": "# 제목 (H1)\n\n## 주요 내용 (H2)..."
-            }
-        }
+    def _generate_all_platforms(
+        self,
+        topic,
+        business_type: str,
+        platforms: Optional[List[str]] = None,
+        on_platform_done: Optional[Callable[[ContentVersion], None]] = None,
+        refresh: Optional[Set[str]] = None,
+        feedback: Optional[Dict[str, str]] = None
+    ) -> Tuple[List[ContentVersion], Dict[str, str]]:
+        """
+        여러 플랫폼의 콘텐츠를 생성합니다.
 
-        guideline = platform_guidelines[platform]
+        실패한 플랫폼은 건너뛰고 오류 메시지를 따로 모읍니다.
 
-        system_prompt = f"""당신은 한국의 전문 블로그 작가입니다.
-주어진 주제로 {platform} 플랫폼에 최적화된 블로그 글을 작성해야 합니다.
+        Args:
+            platforms: 작성할 플랫폼 목록 (기본값: 전체)
+            on_platform_done: 플랫폼 하나의 작성이 끝날 때마다 호출할 함수
+            refresh: 응답 캐시를 무시하고 새로 생성할 플랫폼
+            feedback: 프롬프트에 넣을 {플랫폼: 검수 피드백}
 
-【플랫폼별 가이드라인】
-- 톤: {guideline['tone']}
-- 구조: {guideline['structure']}
-- 스타일: {guideline['style']}
+        Returns:
+            (PLATFORM_TONES 순서의 성공한 버전 목록, {플랫폼: 오류 메시지})
+        """
+        if platforms is None:
+            platforms = list(PLATFORM_TONES)
+        refresh = refresh or set()
+        feedback = feedback or {}
 
-【작성 원칙】
-1. 독자가 실제로 적용할 수 있는 구체적인 정보 제공
-2. 전문성과 신뢰감을 주는 내용
-3. 적절한 길이 (1,200~1,800자)
-4. 자연스러운 키워드 배치
-5. 행동 유도 (CTA) 포함
+        results: Dict[str, ContentVersion] = {}
+        errors: Dict[str, str] = {}
 
-【금지 사항】
-- 과도한 광고성 문구
-- 검증되지 않은 정보
-- 비속어나 부적절한 표현
-"""
+        if self.concurrent and platforms:
+            with ThreadPoolExecutor(max_workers=len(platforms)) as executor:
+                futures = {
+                    platform: executor.submit(
+                        telemetry.bind(self._generate_version), topic, business_type, platform,
+                        on_platform_done, platform in refresh, feedback.get(platform)
+                    )
+                    for platform in platforms
+                }
+                for platform, future in futures.items():
+                    try:
+                        results[platform] = future.result()
+                    except Exception as e:
+                        errors[platform] = str(e)
+        else:
+            for platform in platforms:
+                try:
+                    results[platform] = self._generate_version(
+                        topic, business_type, platform, on_platform_done, platform in refresh,
+                        feedback.get(platform)
+                    )
+                except Exception as e:
+                    errors[platform] = str(e)
+
+        content_versions = [
+            results[platform] for platform in PLATFORM_TONES if platform in results
+        ]
+        return content_versions, errors
+
+    def _generate_version(
+        self,
+        topic,
+        business_type: str,
+        platform: str,
+        on_platform_done: Optional[Callable[[ContentVersion], None]] = None,
+        refresh: bool = False,
+        feedback: Optional[str] = None
+    ) -> ContentVersion:
+        """
+        플랫폼 하나의 ContentVersion 생성 (refresh면 응답 캐시 무시)
+        feedback이 있으면 사용자 프롬프트 끝에 덧붙입니다 (input_hash에는 포함하지 않음).
+        """
+        messages = self._build_messages(topic, business_type, platform)
+        request = messages
+        if feedback:
+            request = messages[:-1] + [HumanMessage(content=(
+                f"{messages[-1].content}\n\n【이전 글 검수 피드백】\n{feedback}\n"
+                "위 피드백을 반영하여 새로 작성하세요."
+            ))]
+        content = self._invoke(request, refresh)
+
+        version = ContentVersion(
+            platform=platform,
+            content=content,
+            tone=PLATFORM_TONES[platform],
+            input_hash=self._hash_messages(messages, platform)
+        )
+        if on_platform_done is not None:
+            on_platform_done(version)
+        return version
 
+    def _build_messages(
+        self, topic, business_type: str, platform: str
+    ) -> List[BaseMessage]:
+        """플랫폼별 시스템/사용자 프롬프트 메시지 구성"""
         user_prompt = f"""다음 주제로 {platform} 블로그 글을 작성해주세요.
 
 【업종】 {business_type}
@@ -138,16 +371,184 @@ class WriterAgent:
 위 정보를 바탕으로 완성도 높은 블로그 글을 작성해주세요.
 반드시 한국어로 작성하고, {platform}의 특성에 맞게 작성하세요."""
 
-        messages = [
-            SystemMessage(content=system_prompt),
+        # 시스템 프롬프트는 플랫폼별로 고정되어 있어 미리 만들어 둔 것을 재사용
+        # (항상 같은 앞부분으로 시작하므로 프로바이더 측 프롬프트 캐시 적중)
+        return [
+            PLATFORM_SYSTEM_MESSAGES[platform],
             HumanMessage(content=user_prompt)
         ]
 
-        response = self.llm.invoke(messages)
-        return response.content
+    def _invoke(self, messages, refresh: bool = False) -> str:
+        """LLM 호출 (캐시 적중 시 호출 생략, refresh면 캐시를 무시하고 새 응답으로 갱신)"""
+        if self.router is not None:
+            return self.router.invoke(messages, self.cache, refresh=refresh)
+        return invoke_llm(self.llm, messages, self.provider, self.cache, refresh=refresh)
+
+    def stream_content(self, topic, business_type: str) -> Iterator[Dict[str, Any]]:
+        """
+        플랫폼별 콘텐츠를 토큰 단위로 스트리밍합니다.
+
+        concurrent 모드면 모든 플랫폼을 동시에 스트리밍하며, 이벤트는 도착 순서대로 나옵니다.
+        소비자가 중간에 멈추면(클라이언트 연결 종료 등) 플랫폼 스트림에 중단을 알리고 기다리지 않습니다.
+
+        Yields:
+            {"event": "token", "platform": ..., "text": ...}: 생성 중인 토큰
+            {"event": "platform_done", "platform": ...}: 플랫폼 작성 완료
+            {"event": "error", "platform": ..., "error": ...}: 플랫폼 작성 실패
+            {"event": "done", "content_versions": [...], "content_errors": {...}}:
+                마지막 이벤트 (PLATFORM_TONES 순서의 ContentVersion 목록)
+        """
+        platforms = list(PLATFORM_TONES)
+        buffers: Dict[str, List[str]] = {platform: [] for platform in platforms}
+        errors: Dict[str, str] = {}
+
+        if self.concurrent:
+            events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+            stop = threading.Event()
+
+            def worker(platform: str) -> None:
+                stream = self._stream_platform(topic, business_type, platform)
+                try:
+                    for event in stream:
+                        if stop.is_set():
+                            break
+                        events.put(event)
+                finally:
+                    # 중단 시 LLM 스트림도 닫아 응답 수신을 멈춤
+                    stream.close()
+                    events.put(None)
+
+            executor = ThreadPoolExecutor(max_workers=len(platforms))
+            try:
+                for platform in platforms:
+                    executor.submit(telemetry.bind(worker), platform)
+
+                remaining = len(platforms)
+                while remaining:
+                    event = events.get()
+                    if event is None:
+                        remaining -= 1
+                        continue
+                    self._collect_stream_event(event, buffers, errors)
+                    yield event
+            finally:
+                # 정상 종료면 모든 작업이 끝난 상태이고, GeneratorExit 등으로 중단되면
+                # 작업에 중단을 알리고 끝날 때까지 기다리지 않음
+                stop.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            for platform in platforms:
+                for event in self._stream_platform(topic, business_type, platform):
+                    self._collect_stream_event(event, buffers, errors)
+                    yield event
+
+        content_versions = [
+            ContentVersion(
+                platform=platform,
+                content="".join(buffers[platform]),
+                tone=PLATFORM_TONES[platform],
+                input_hash=self.input_hash(topic, business_type, platform)
+            )
+            for platform in platforms
+            if platform not in errors
+        ]
+        yield {
+            "event": "done",
+            "content_versions": content_versions,
+            "content_errors": errors,
+        }
+
+    def _stream_platform(
+        self, topic, business_type: str, platform: str
+    ) -> Iterator[Dict[str, Any]]:
+        """한 플랫폼의 토큰 스트림 (예외는 error 이벤트로 변환)"""
+        messages = self._build_messages(topic, business_type, platform)
+
+        try:
+            if self.router is not None:
+                texts = self.router.stream(messages, self.cache)
+            else:
+                texts = stream_llm(self.llm, messages, self.provider, self.cache)
+
+            for text in texts:
+                yield {"event": "token", "platform": platform, "text": text}
+
+            yield {"event": "platform_done", "platform": platform}
+
+        except Exception as e:
+            yield {"event": "error", "platform": platform, "error": str(e)}
+
+    @staticmethod
+    def _collect_stream_event(
+        event: Dict[str, Any], buffers: Dict[str, List[str]], errors: Dict[str, str]
+    ) -> None:
+        """스트림 이벤트를 플랫폼별 버퍼/오류 목록에 반영"""
+        if event["event"] == "token":
+            buffers[event["platform"]].append(event["text"])
+        elif event["event"] == "error":
+            errors[event["platform"]] = event["error"]
+
+
+def writer_node(
+    state: WorkflowState, config: Optional[RunnableConfig] = None
+) -> Dict[str, Any]:
+    """
+    LangGraph 노드로 사용할 함수 (바뀐 필드만 반환)
+    config의 configurable에 writer_model이 있으면 해당 모델을 사용하고,
+    regenerate_platforms가 있으면 해당 플랫폼만 다시 작성합니다.
+    검수에서 불합격해 돌아온 경우 불합격한 플랫폼만 검수 피드백을 반영해 다시 작성하고
+    retry_count와 review_usage를 갱신합니다.
+    글을 새로 작성하면 주제 색인(있는 경우)에 선택한 주제를 등록합니다.
+    """
+    before = dict(state)
+
+    # 플랫폼별 요청을 동시에 보내 작성 시간을 단축
+    agent = WriterAgent(
+        concurrent=True,
+        cache=get_default_cache(),
+        **llm_from_config(
+            config, "writer", temperature=0.8, default_provider=WriterAgent.provider
+        )
+    )
+
+    # 체크포인트 사용 시: 이전 실행에서 완성된 플랫폼은 재사용하고,
+    # 새로 완성되는 플랫폼은 노드가 끝나기 전에도 바로 저장
+    store, thread_id = get_checkpoint_context(config)
+    on_platform_done = None
+    if store is not None and state.get("selected_topic"):
+        title = state["selected_topic"].title
+        written = {c.platform for c in state.get("content_versions") or []}
+        saved = [
+            c for c in store.load_partial(thread_id, title)
+            if c.platform not in written
+        ]
+        if saved:
+            state["content_versions"] = list(state.get("content_versions") or []) + saved
+
+        def on_platform_done(version: ContentVersion) -> None:
+            store.save_partial(thread_id, title, version)
 
+    # 검수 불합격 후 다시 온 경우: 불합격한 플랫폼만 피드백을 반영해 다시 작성
+    # (재시도 횟수/예산은 should_retry와 같은 기준으로 확인하여, 한도를 넘긴 실행을
+    #  체크포인트에서 이어서 실행해도 다시 작성하지 않음)
+    if can_retry_review(state, config):
+        started = time.monotonic()
+        results = state["review_results"]
+        platforms = rejected_platforms(state)
+        state = agent.regenerate(
+            state, platforms, on_platform_done=on_platform_done,
+            feedback={p: results[p].feedback for p in platforms}
+        )
+        state["retry_count"] = state.get("retry_count", 0) + 1
+        add_review_usage(state, telemetry.current_tokens(), time.monotonic() - started)
+        return updated_fields(before, state)
 
-def writer_node(state: WorkflowState) -> WorkflowState:
-    """LangGraph 노드로 사용할 함수"""
-    agent = WriterAgent()
-    return agent.write_content(state)
+    platforms = ((config or {}).get("configurable") or {}).get("regenerate_platforms")
+    if platforms:
+        state = agent.regenerate(state, platforms, on_platform_done=on_platform_done)
+    else:
+        state = agent.write_content(state, on_platform_done=on_platform_done)
+        index = get_topic_index(config)
+        if index is not None and state.get("content_versions"):
+            index.add(state["business_type"], state["selected_topic"])
+    return updated_fields(before, state)
@@ -1,25 +1,57 @@
 """
 Flask 기반 멀티 에이전트 워크플로우 웹 애플리케이션
 """
+import json
 import os
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
-from werkzeug.utils import secure_filename
-from agents.planner_agent import PlannerAgentMultiModel, TopicSuggestion
-from agents.writer_agent import WriterAgentMultiModel
-from agents.reviewer_agent import ReviewerAgentMultiModel
-from agents.image_prompt_agent import ImagePromptAgent
-from agents.publisher_agent import PublisherAgent
+import time
+from flask import (
+    Flask, Response, abort, render_template, request, redirect, url_for, session,
+    flash, jsonify, send_from_directory, stream_with_context
+)
+from agent_writer import PLATFORM_TONES, WriterAgent
+from multi_model_agent import llm_from_config
+from llm_router import provider_stats
+from workflow_runner import run_workflow
+from workflow_state import (
+    ContentVersion, TopicSuggestion as WorkflowTopic, create_initial_state
+)
+from image_store import create_image_store_from_env
+from publisher import SharedImage, publish_state
+from job_queue import JOB_DONE, JOB_FAILED, FINISHED_STATUSES, create_job_queue_from_env
+from session_store import create_session_interface_from_env, get_secret_key_from_env
+import rate_limit
+import telemetry
 
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
+# 세션 ID 서명 키 (FLASK_SECRET_KEY, 여러 워커가 같은 키를 써야 세션을 공유함)
+app.secret_key = get_secret_key_from_env()
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB 제한
 
+# 워크플로우 상태는 서버에 저장하고 쿠키에는 세션 ID만 담음 (4KB 쿠키 한도 회피)
+app.session_interface = create_session_interface_from_env()
+
 # 업로드 폴더 생성
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 
+# 업로드 이미지는 내용 해시로 저장하고, WebP 축소본/썸네일은 백그라운드에서 생성
+image_store = create_image_store_from_env(app.config['UPLOAD_FOLDER'])
+IMAGE_CACHE_MAX_AGE = 365 * 24 * 60 * 60  # 내용 해시 주소라 내용이 바뀌지 않음
+PUBLISH_IMAGE_WAIT = 10  # 발행 시 축소본 생성을 기다릴 최대 시간(초)
+
+# LLM 단계(step2~5)를 실행하는 백그라운드 작업 큐
+job_queue = create_job_queue_from_env()
+MAX_SESSION_JOBS = 20  # 세션에 기록할 최대 작업 수
+JOB_EVENTS_TIMEOUT = 300  # SSE 스트림 최대 유지 시간(초)
+
+# 프로바이더별 요청 수/토큰 수/동시 요청 수 제한 ({PROVIDER}_RPM, _TPM, _MAX_CONCURRENCY)
+rate_limit.configure_rate_limits_from_env()
+
+# 노드/LLM 호출 계측 JSON 로그 (TELEMETRY_LOG)
+telemetry.configure_logging_from_env()
+
 
 def allowed_file(filename):
     """허용된 파일 확장자인지 확인"""
@@ -49,6 +81,7 @@ def setup():
     session['naver_client_id'] = request.form.get('naver_client_id', '').strip()
     session['naver_client_secret'] = request.form.get('naver_client_secret', '').strip()
     session['naver_blog_id'] = request.form.get('naver_blog_id', '').strip()
+    session['naver_access_token'] = request.form.get('naver_access_token', '').strip()
     session['google_api_key'] = request.form.get('google_api_key', '').strip()
     session['google_blog_id'] = request.form.get('google_blog_id', '').strip()
     session['google_access_token'] = request.form.get('google_access_token', '').strip()
@@ -67,41 +100,195 @@ def step1_business_type():
     return render_template('step1_business_type.html')
 
 
-@app.route('/step2', methods=['POST'])
-def step2_topic_planning():
-    """Step 2: 주제 기획"""
-    business_type = request.form.get('business_type', '').strip()
+def _llm_settings():
+    """백그라운드 작업에 넘길 API 키/모델 설정 (요청 컨텍스트 밖에서는 세션 접근 불가)"""
+    keys = (
+        'gemini_api_key', 'claude_api_key', 'openai_api_key',
+        'planner_model', 'writer_model', 'reviewer_model'
+    )
+    settings = {key: session.get(key) for key in keys}
+
+    # 기획/작성 단계는 실패 시 API 키가 입력된 다른 프로바이더로 전환 (LLM_FAILOVER=0이면 끔)
+    if os.getenv('LLM_FAILOVER', '1') != '0':
+        settings['fallback_models'] = [
+            model for model, key in (
+                ('gemini', 'gemini_api_key'),
+                ('claude', 'claude_api_key'),
+                ('gpt', 'openai_api_key')
+            )
+            if settings.get(key)
+        ]
+    # 단계별 모델 이름/엔드포인트 (예: 기획 모델이 local이면 PLANNER_BASE_URL=http://localhost:8000/v1)
+    for step in ('planner', 'writer', 'reviewer'):
+        for option in ('model_name', 'base_url'):
+            value = os.getenv(f'{step}_{option}'.upper())
+            if value:
+                settings[f'{step}_{option}'] = value
+    if os.getenv('LOCAL_LLM_API_KEY'):
+        settings['local_api_key'] = os.getenv('LOCAL_LLM_API_KEY')
+
+    settings['hedge_requests'] = os.getenv('LLM_HEDGE', '0') == '1'
+    if os.getenv('LLM_TIMEOUT'):
+        settings['llm_timeout'] = float(os.getenv('LLM_TIMEOUT'))
+    return settings
+
+
+def _wants_async():
+    """작업 큐로 실행할지 여부 (async=1 또는 JSON 응답 요청)"""
+    return (
+        request.values.get('async') == '1'
+        or request.accept_mimetypes.best == 'application/json'
+    )
 
-    if not business_type:
-        flash('업종을 입력해주세요.', 'error')
-        return redirect(url_for('step1_business_type'))
 
-    session['business_type'] = business_type
+def _plan_topics(settings, business_type):
+    """Agent 1: 주제 기획 (CLI와 같은 워크플로우를 planner까지만 실행)"""
+    state = run_workflow(
+        create_initial_state(business_type),
+        stop_after='planner',
+        configurable=settings
+    )
+    return {'topics': [t.model_dump() for t in state['topic_suggestions']]}
+
+
+def _write_contents(settings, selected_topic, business_type):
+    """Agent 2: 콘텐츠 작성 (선택한 주제로 워크플로우 실행, 기획 단계는 건너뜀)"""
+    state = run_workflow(
+        create_initial_state(business_type, WorkflowTopic(**selected_topic)),
+        configurable=settings
+    )
+    return {'contents': [c.model_dump() for c in state['content_versions']]}
 
-    try:
-        # Agent 1: 주제 기획
-        planner = PlannerAgentMultiModel(
-            model_type=session['planner_model'],
-            gemini_api_key=session.get('gemini_api_key'),
-            claude_api_key=session.get('claude_api_key'),
-            openai_api_key=session.get('openai_api_key')
-        )
 
-        topics = planner.suggest_topics(business_type)
-        session['topics'] = [t.to_dict() for t in topics]
+def _regenerate_contents(settings, selected_topic, business_type, contents, platforms):
+    """Agent 2: 선택한 플랫폼만 다시 작성 (나머지 플랫폼 글은 유지)"""
+    state = create_initial_state(business_type, WorkflowTopic(**selected_topic))
+    state['content_versions'] = [ContentVersion(**c) for c in contents]
+    state = run_workflow(
+        state,
+        configurable={**settings, 'regenerate_platforms': platforms}
+    )
+    return {
+        'contents': [c.model_dump() for c in state['content_versions']],
+        'content_errors': state.get('content_errors')
+    }
+
+
+def _review_content(settings, content_obj, platform, business_type):
+    """Agent 3: 검수 (세션에 반영할 값을 반환)"""
+    # 에이전트 모듈은 프로바이더 SDK를 불러오므로 처음 사용할 때 import (앱 시작 시간 단축)
+    from agents.reviewer_agent import ReviewerAgentMultiModel
+
+    reviewer = ReviewerAgentMultiModel(
+        model_type=settings['reviewer_model'],
+        gemini_api_key=settings.get('gemini_api_key'),
+        claude_api_key=settings.get('claude_api_key'),
+        openai_api_key=settings.get('openai_api_key')
+    )
+
+    review_result = reviewer.review_content(
+        content=content_obj['content'],
+        platform=platform,
+        business_type=business_type
+    )
+    return {'review_result': review_result.to_dict()}
+
+
+def _generate_image_prompt(settings, content, keyword, platform):
+    """Agent 4: 이미지 프롬프트 생성 (세션에 반영할 값을 반환)"""
+    from agents.image_prompt_agent import ImagePromptAgent
+
+    image_agent = ImagePromptAgent(
+        gemini_api_key=settings.get('gemini_api_key')
+    )
+
+    prompt = image_agent.generate_image_prompt(
+        content=content,
+        keyword=keyword,
+        platform=platform
+    )
+    return {'image_prompt': prompt}
+
 
+def _render_step(kind):
+    """세션에 저장된 결과로 단계별 페이지 렌더링"""
+    if kind == 'step2':
         return render_template(
             'step2_topic_selection.html',
-            business_type=business_type,
-            topics=topics,
+            business_type=session['business_type'],
+            topics=session['topics'],
             planner_model=session['planner_model']
         )
 
+    if kind == 'step3':
+        return render_template(
+            'step3_content_display.html',
+            topic=session['selected_topic'],
+            contents=session['contents'],
+            writer_model=session['writer_model']
+        )
+
+    if kind == 'step4':
+        return render_template(
+            'step4_review.html',
+            platform=session['selected_platform'],
+            content=session['selected_content'],
+            review=session['review_result'],
+            reviewer_model=session['reviewer_model']
+        )
+
+    if kind == 'step5':
+        return render_template(
+            'step5_image_upload.html',
+            prompt=session['image_prompt']
+        )
+
+    raise ValueError(f'알 수 없는 단계: {kind}')
+
+
+def _run_step(kind, fn, *args):
+    """
+    단계 실행
+    - 비동기 요청: 작업 큐에 넣고 작업 ID를 즉시 반환 (202)
+    - 일반 요청: 요청 스레드에서 실행 후 페이지 렌더링
+    """
+    if _wants_async():
+        job_id = job_queue.submit(kind, fn, *args)
+
+        # 다른 사용자의 작업 결과를 조회하지 못하도록 세션에 소유 작업 기록
+        session['job_ids'] = (session.get('job_ids', []) + [job_id])[-MAX_SESSION_JOBS:]
+
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status_url': url_for('job_status', job_id=job_id),
+            'events_url': url_for('job_events', job_id=job_id),
+            'view_url': url_for('job_view', job_id=job_id)
+        }), 202
+
+    try:
+        session.update(fn(*args))
+        return _render_step(kind)
+
     except Exception as e:
         flash(f'오류 발생: {str(e)}', 'error')
         return redirect(url_for('step1_business_type'))
 
 
+@app.route('/step2', methods=['POST'])
+def step2_topic_planning():
+    """Step 2: 주제 기획"""
+    business_type = request.form.get('business_type', '').strip()
+
+    if not business_type:
+        flash('업종을 입력해주세요.', 'error')
+        return redirect(url_for('step1_business_type'))
+
+    session['business_type'] = business_type
+
+    return _run_step('step2', _plan_topics, _llm_settings(), business_type)
+
+
 @app.route('/step3', methods=['POST'])
 def step3_content_writing():
     """Step 3: 콘텐츠 작성"""
@@ -115,35 +302,97 @@ def step3_content_writing():
     selected_topic = topics[topic_index]
     session['selected_topic'] = selected_topic
 
-    try:
-        # Agent 2: 콘텐츠 작성
-        writer = WriterAgentMultiModel(
-            model_type=session['writer_model'],
-            gemini_api_key=session.get('gemini_api_key'),
-            claude_api_key=session.get('claude_api_key'),
-            openai_api_key=session.get('openai_api_key')
-        )
+    return _run_step(
+        'step3', _write_contents,
+        _llm_settings(), selected_topic, session['business_type']
+    )
 
-        contents = writer.write_content(
-            topic_keyword=selected_topic['keyword'],
-            topic_title=selected_topic['title'],
-            topic_reason=selected_topic['reason'],
-            business_type=session['business_type']
-        )
 
-        session['contents'] = [c.to_dict() for c in contents]
+@app.route('/step3/regenerate', methods=['POST'])
+def step3_regenerate():
+    """Step 3: 선택한 플랫폼만 다시 작성 (platforms=naver&platforms=google)"""
+    platforms = request.form.getlist('platforms')
+    contents = session.get('contents')
 
-        return render_template(
-            'step3_content_display.html',
-            topic=selected_topic,
-            contents=contents,
-            writer_model=session['writer_model']
-        )
+    if not platforms or not contents or not session.get('selected_topic'):
+        flash('다시 작성할 플랫폼을 선택해주세요.', 'error')
+        return redirect(url_for('step1_business_type'))
 
-    except Exception as e:
-        flash(f'오류 발생: {str(e)}', 'error')
+    if any(p not in PLATFORM_TONES for p in platforms):
+        flash('지원하지 않는 플랫폼입니다.', 'error')
         return redirect(url_for('step1_business_type'))
 
+    return _run_step(
+        'step3', _regenerate_contents,
+        _llm_settings(), session['selected_topic'], session['business_type'],
+        contents, platforms
+    )
+
+
+@app.route('/step3/stream')
+def step3_content_stream():
+    """
+    Step 3: 콘텐츠 작성 (Server-Sent Events 스트리밍)
+    플랫폼별 토큰을 생성되는 즉시 전송하고, 완료되면 결과를 작업으로 기록하여
+    done 이벤트의 view_url로 Step 3 페이지를 볼 수 있게 합니다.
+    """
+    topic_index = request.args.get('topic_index', 0, type=int)
+    topics = session.get('topics', [])
+
+    if topic_index >= len(topics):
+        return jsonify({'success': False, 'error': '잘못된 주제 선택입니다.'}), 400
+
+    selected_topic = topics[topic_index]
+    session['selected_topic'] = selected_topic
+    business_type = session['business_type']
+
+    try:
+        writer = WriterAgent(
+            concurrent=True,
+            **llm_from_config(
+                {'configurable': _llm_settings()}, 'writer', temperature=0.8,
+                default_provider=WriterAgent.provider
+            )
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    topic = WorkflowTopic(**selected_topic)
+
+    # 스트림이 시작되면 세션을 저장할 수 없으므로 결과는 작업으로 기록
+    job_id = job_queue.start('step3')
+    session['job_ids'] = (session.get('job_ids', []) + [job_id])[-MAX_SESSION_JOBS:]
+    view_url = url_for('job_view', job_id=job_id)
+
+    def generate():
+        try:
+            for event in writer.stream_content(topic, business_type):
+                if event['event'] != 'done':
+                    yield _sse_event(event['event'], event)
+                    continue
+
+                contents = [c.model_dump() for c in event['content_versions']]
+                if contents:
+                    job_queue.complete(job_id, {'contents': contents})
+                else:
+                    job_queue.fail(job_id, '모든 플랫폼의 콘텐츠 생성에 실패했습니다.')
+
+                yield _sse_event('done', {
+                    'job_id': job_id,
+                    'view_url': view_url,
+                    'content_errors': event['content_errors']
+                })
+
+        except Exception as e:
+            job_queue.fail(job_id, str(e))
+            yield _sse_event('error', {'error': str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 
 @app.route('/step4', methods=['POST'])
 def step4_content_review():
@@ -161,34 +410,10 @@ def step4_content_review():
     session['selected_platform'] = platform
     session['selected_content'] = content_obj
 
-    try:
-        # Agent 3: 검수
-        reviewer = ReviewerAgentMultiModel(
-            model_type=session['reviewer_model'],
-            gemini_api_key=session.get('gemini_api_key'),
-            claude_api_key=session.get('claude_api_key'),
-            openai_api_key=session.get('openai_api_key')
-        )
-
-        review_result = reviewer.review_content(
-            content=content_obj['content'],
-            platform=platform,
-            business_type=session['business_type']
-        )
-
-        session['review_result'] = review_result.to_dict()
-
-        return render_template(
-            'step4_review.html',
-            platform=platform,
-            content=content_obj,
-            review=review_result,
-            reviewer_model=session['reviewer_model']
-        )
-
-    except Exception as e:
-        flash(f'오류 발생: {str(e)}', 'error')
-        return redirect(url_for('step1_business_type'))
+    return _run_step(
+        'step4', _review_content,
+        _llm_settings(), content_obj, platform, session['business_type']
+    )
 
 
 @app.route('/step5')
@@ -198,29 +423,124 @@ def step5_image_prompt():
         flash('먼저 콘텐츠를 생성해주세요.', 'error')
         return redirect(url_for('step1_business_type'))
 
-    try:
-        # Agent 4: 이미지 프롬프트 생성
-        image_agent = ImagePromptAgent(
-            gemini_api_key=session.get('gemini_api_key')
-        )
+    return _run_step(
+        'step5', _generate_image_prompt,
+        _llm_settings(),
+        session['selected_content']['content'],
+        session['selected_topic']['keyword'],
+        session['selected_platform']
+    )
 
-        prompt = image_agent.generate_image_prompt(
-            content=session['selected_content']['content'],
-            keyword=session['selected_topic']['keyword'],
-            platform=session['selected_platform']
-        )
 
-        session['image_prompt'] = prompt
+def _sse_event(name, data):
+    """Server-Sent Events 메시지 포맷"""
+    return f'event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
 
-        return render_template(
-            'step5_image_upload.html',
-            prompt=prompt
-        )
 
-    except Exception as e:
-        flash(f'오류 발생: {str(e)}', 'error')
+def _get_owned_job(job_id):
+    """현재 세션이 제출한 작업만 조회"""
+    if job_id not in session.get('job_ids', []):
+        return None
+    return job_queue.get(job_id)
+
+
+def _job_payload(job):
+    """작업 상태 응답 (결과 본문은 완료 후 한 번만 세션에 반영)"""
+    return {
+        'job_id': job['id'],
+        'kind': job['kind'],
+        'status': job['status'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'finished_at': job['finished_at']
+    }
+
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """작업 상태/결과 폴링"""
+    job = _get_owned_job(job_id)
+
+    if job is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+
+    payload = _job_payload(job)
+
+    if job['status'] == JOB_DONE:
+        session.update(job['result'])
+        payload['result'] = job['result']
+
+    return jsonify({'success': True, **payload})
+
+
+@app.route('/rate_limits')
+def rate_limit_metrics():
+    """프로바이더별 현재 제한값(동시 요청 한도 포함), 누적 통계, 지연 시간/오류율"""
+    return jsonify({
+        'success': True,
+        'providers': rate_limit.metrics(),
+        'routing': provider_stats()
+    })
+
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus 형식 지표 (노드별 실행 시간, LLM 호출/토큰/비용, 속도 제한 상태)"""
+    return Response(
+        telemetry.render_metrics(),
+        mimetype='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """작업 상태 변경을 Server-Sent Events로 전송 (완료되면 스트림 종료)"""
+    job = _get_owned_job(job_id)
+
+    if job is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+
+    def generate():
+        last_status = None
+        deadline = time.monotonic() + JOB_EVENTS_TIMEOUT
+
+        while time.monotonic() < deadline:
+            current = job_queue.get(job_id)
+            if current['status'] != last_status:
+                last_status = current['status']
+                yield _sse_event('status', _job_payload(current))
+
+            if current['status'] in FINISHED_STATUSES:
+                return
+
+            time.sleep(0.5)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/jobs/<job_id>/view')
+def job_view(job_id):
+    """완료된 작업 결과를 세션에 반영하고 해당 단계 페이지 렌더링"""
+    job = _get_owned_job(job_id)
+
+    if job is None:
+        flash('작업을 찾을 수 없습니다.', 'error')
+        return redirect(url_for('step1_business_type'))
+
+    if job['status'] == JOB_FAILED:
+        flash(f'오류 발생: {job["error"]}', 'error')
         return redirect(url_for('step1_business_type'))
 
+    if job['status'] != JOB_DONE:
+        return jsonify({'success': True, **_job_payload(job)}), 202
+
+    session.update(job['result'])
+    return _render_step(job['kind'])
+
 
 @app.route('/upload_image', methods=['POST'])
 def upload_image():
@@ -234,21 +554,43 @@ def upload_image():
         return jsonify({'success': False, 'error': '파일이 선택되지 않았습니다.'}), 400
 
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        try:
+            image_id = image_store.save(file.stream)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
 
-        session['uploaded_image'] = filename
+        # 축소본/썸네일 생성은 백그라운드에서 (준비되기 전에는 원본을 제공)
+        image_store.schedule(image_id)
+        session['uploaded_image'] = image_id
 
         return jsonify({
             'success': True,
-            'filename': filename,
-            'url': url_for('static', filename=f'uploads/{filename}')
+            'filename': image_id,
+            'url': url_for('image_file', image_id=image_id, variant='web'),
+            'thumbnail_url': url_for('image_file', image_id=image_id, variant='thumb')
         })
 
     return jsonify({'success': False, 'error': '허용되지 않는 파일 형식입니다.'}), 400
 
 
+@app.route('/images/<image_id>')
+@app.route('/images/<image_id>/<variant>')
+def image_file(image_id, variant=None):
+    """업로드 이미지 제공 (variant: web, thumb / 변형이 아직 없으면 원본)"""
+    if variant is not None and variant not in image_store.variants:
+        abort(404)
+
+    filename = image_store.filename(image_id, variant)
+    if filename is None:
+        abort(404)
+
+    # 변형이 준비되기 전의 원본 응답은 캐시하지 않아 다음 요청에서 축소본을 받도록 함
+    ready = variant is None or filename != image_store.original_filename(image_id)
+    return send_from_directory(
+        image_store.root, filename, max_age=IMAGE_CACHE_MAX_AGE if ready else 0
+    )
+
+
 @app.route('/step6')
 def step6_final_preview():
     """Step 6: 최종 미리보기"""
@@ -256,8 +598,8 @@ def step6_final_preview():
         flash('먼저 콘텐츠를 생성해주세요.', 'error')
         return redirect(url_for('step1_business_type'))
 
-    image_filename = session.get('uploaded_image')
-    image_url = url_for('static', filename=f'uploads/{image_filename}') if image_filename else None
+    image_id = session.get('uploaded_image')
+    image_url = url_for('image_file', image_id=image_id, variant='web') if image_id else None
 
     return render_template(
         'step6_preview.html',
@@ -270,44 +612,95 @@ def step6_final_preview():
     )
 
 
+def _publish_configs():
+    """세션에 저장된 플랫폼별 발행 설정"""
+    naver_config = None
+    google_config = None
+
+    if session.get('naver_client_id'):
+        naver_config = {
+            'client_id': session['naver_client_id'],
+            'client_secret': session['naver_client_secret'],
+            'blog_id': session['naver_blog_id'],
+            'access_token': session.get('naver_access_token')
+        }
+
+    if session.get('google_api_key') and session.get('google_blog_id'):
+        google_config = {
+            'api_key': session['google_api_key'],
+            'blog_id': session['google_blog_id'],
+            'access_token': session.get('google_access_token')
+        }
+
+    return naver_config, google_config
+
+
+def _publish_image_path():
+    """발행할 이미지 경로 (웹용 축소본, 생성 중이면 잠시 기다리고 없으면 원본)"""
+    if not session.get('uploaded_image'):
+        return None
+    return image_store.path(session['uploaded_image'], 'web', timeout=PUBLISH_IMAGE_WAIT)
+
+
+def _publish_all_platforms():
+    """작성된 모든 플랫폼 콘텐츠를 동시에 발행하고 게시물 URL 목록을 세션에 기록"""
+    naver_config, google_config = _publish_configs()
+
+    image = None
+    image_path = _publish_image_path()
+    if image_path:
+        # 본문에 이미지 링크를 넣는 플랫폼(Blogger)용 공개 URL도 함께 전달
+        image = SharedImage(image_path, url_for(
+            'image_file', image_id=session['uploaded_image'], variant='web', _external=True
+        ))
+
+    selected = request.form.getlist('platforms')
+    state = create_initial_state(
+        session.get('business_type', ''), WorkflowTopic(**session['selected_topic'])
+    )
+    state['content_versions'] = [
+        ContentVersion(**c) for c in session.get('contents', [])
+        if not selected or c['platform'] in selected
+    ]
+    result = publish_state(state, {'naver': naver_config, 'google': google_config}, image)
+    # 워크플로우 상태와 같은 형식 (게시물 URL 목록)
+    session['published_urls'] = state['published_urls']
+
+    return render_template(
+        'publish_result.html',
+        platform='all',
+        result={
+            'success': bool(result.urls) and not result.errors,
+            'urls': result.urls,
+            'errors': result.errors
+        }
+    )
+
+
 @app.route('/publish', methods=['POST'])
 def publish():
-    """최종 퍼블리싱"""
+    """
+    최종 퍼블리싱
+    mode=all이면 작성된 모든 플랫폼 콘텐츠를 동시에 발행합니다 (platforms로 대상 제한 가능).
+    """
     if 'selected_content' not in session:
         flash('먼저 콘텐츠를 생성해주세요.', 'error')
         return redirect(url_for('step1_business_type'))
 
     try:
-        # 퍼블리싱 설정
-        naver_config = None
-        google_config = None
-
-        if session.get('naver_client_id'):
-            naver_config = {
-                'client_id': session['naver_client_id'],
-                'client_secret': session['naver_client_secret'],
-                'blog_id': session['naver_blog_id']
-            }
-
-        if session.get('google_api_key') and session.get('google_blog_id'):
-            google_config = {
-                'api_key': session['google_api_key'],
-                'blog_id': session['google_blog_id'],
-                'access_token': session.get('google_access_token')
-            }
+        if request.form.get('mode') == 'all':
+            return _publish_all_platforms()
+
+        from agents.publisher_agent import PublisherAgent
 
+        # 퍼블리싱 설정
+        naver_config, google_config = _publish_configs()
         publisher = PublisherAgent(
             naver_config=naver_config,
             google_config=google_config
         )
 
-        # 이미지 경로
-        image_path = None
-        if session.get('uploaded_image'):
-            image_path = os.path.join(
-                app.config['UPLOAD_FOLDER'],
-                session['uploaded_image']
-            )
+        image_path = _publish_image_path()
 
         # 퍼블리싱 실행
         platform = session['selected_platform']
@@ -0,0 +1,545 @@
+"""
+오프라인 성능 벤치마크
+FakeChatModel로 네트워크 없이 에이전트와 워크플로우를 실행하여
+동시 실행 수별 처리량, p50/p95 지연 시간, 메모리, 클라이언트 생성 비용,
+워크플로우 상태 직렬화/체크포인트 비용, 작성 주제 색인 조회 시간을 측정합니다.
+
+사용법:
+    python benchmark.py                                   # 기본 설정으로 측정
+    python benchmark.py -c 1,4,16 -n 50 --latency 0.2     # 동시 실행 수/횟수/지연 지정
+    python benchmark.py --compare benchmarks/baseline.json  # 기준 결과와 비교
+    python benchmark.py --startup-only --import-budget main=1500  # 시작 시간만 측정/검사
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from agent_planner import PlannerAgent
+from agent_writer import PLATFORM_TONES, WriterAgent
+import rate_limit
+from checkpoint import CheckpointStore
+from fake_llm import FakeChatModel, default_response
+from llm_pool import LLMClientPool, _create_chat_model, load_provider
+from multi_model_agent import MultiModelAgent
+from topic_index import TopicIndex
+from workflow_runner import run_workflow
+from workflow_state import (
+    ContentVersion, ReviewResult, TopicSuggestion, WorkflowState, create_initial_state,
+    state_from_dict, state_to_dict, text_hash
+)
+
+BUSINESS_TYPES = ["세무사", "카페", "변호사", "치과", "필라테스", "부동산", "미용실", "학원"]
+
+# 시작 시간을 측정할 진입점 모듈 (CLI, 예제, 웹)
+STARTUP_MODULES = ["main", "example", "app"]
+# 시작 시 import되면 안 되는 프로바이더 SDK (처음 사용할 때 llm_pool이 불러옴)
+PROVIDER_SDKS = ("langchain_google_genai", "langchain_anthropic", "langchain_openai")
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """정렬된 값 목록의 백분위수 (최근접 순위 방식)"""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+def _make_scenarios(fake: FakeChatModel) -> Dict[str, Callable[[int], Any]]:
+    """벤치마크 시나리오: {이름: i번째 실행 함수}"""
+
+    def planner(i: int) -> Any:
+        agent = PlannerAgent(llm=fake, provider="fake")
+        return agent.suggest_topics(
+            create_initial_state(BUSINESS_TYPES[i % len(BUSINESS_TYPES)])
+        )
+
+    def writer(i: int) -> Any:
+        business_type = BUSINESS_TYPES[i % len(BUSINESS_TYPES)]
+        topic = TopicSuggestion(
+            keyword=f"{business_type} 키워드", title=f"{business_type} 실전 팁",
+            reason="벤치마크"
+        )
+        agent = WriterAgent(llm=fake, provider="fake", concurrent=True)
+        return agent.write_content(create_initial_state(business_type, topic))
+
+    def multi_model(i: int) -> Any:
+        agent = MultiModelAgent("gemini", llm=fake)
+        return agent.invoke("당신은 블로그 작가입니다.", f"{i}번째 요청")
+
+    def workflow(i: int) -> Any:
+        return run_workflow(
+            create_initial_state(BUSINESS_TYPES[i % len(BUSINESS_TYPES)]),
+            configurable={"planner_llm": fake, "writer_llm": fake}
+        )
+
+    def advanced(i: int) -> Any:
+        return run_workflow(
+            create_initial_state(BUSINESS_TYPES[i % len(BUSINESS_TYPES)]),
+            variant="advanced",
+            configurable={"planner_llm": fake, "writer_llm": fake, "reviewer_llm": fake}
+        )
+
+    return {
+        "planner": planner,
+        "writer": writer,
+        "multi_model": multi_model,
+        "workflow": workflow,
+        "advanced": advanced,
+    }
+
+
+def measure(fn: Callable[[int], Any], concurrency: int, runs: int) -> Dict[str, Any]:
+    """fn을 concurrency개 스레드로 runs번 실행하여 지연 시간/처리량 측정"""
+    latencies: List[float] = []
+    errors = 0
+
+    def timed(i: int) -> Optional[float]:
+        started = time.perf_counter()
+        try:
+            fn(i)
+        except Exception:
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for latency in executor.map(timed, range(runs)):
+            if latency is None:
+                errors += 1
+            else:
+                latencies.append(latency)
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "runs": runs,
+        "errors": errors,
+        "wall_seconds": round(wall, 4),
+        "throughput_per_second": round(len(latencies) / wall, 3) if wall else 0.0,
+        "latency_mean_ms": round(1000 * sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "latency_p50_ms": round(1000 * _percentile(latencies, 50), 3),
+        "latency_p95_ms": round(1000 * _percentile(latencies, 95), 3),
+    }
+
+
+def measure_memory(fn: Callable[[int], Any], concurrency: int) -> float:
+    """동시 실행 concurrency개 동안의 최대 메모리 증가량(KB, tracemalloc 기준)"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda i: _ignore_errors(fn, i), range(concurrency)))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round((peak - baseline) / 1024, 1)
+
+
+def _ignore_errors(fn: Callable[[int], Any], i: int) -> Any:
+    try:
+        return fn(i)
+    except Exception:
+        return None
+
+
+def measure_client_construction(iterations: int = 200) -> Dict[str, float]:
+    """
+    채팅 모델 클라이언트 생성 비용 (네트워크 호출 없음)
+    - cold: 매번 새 클라이언트 생성 (풀 도입 전 방식)
+    - pooled: 프로세스 전역 풀에서 재사용
+    """
+    results: Dict[str, float] = {}
+
+    for provider, model in [("gemini", "gemini-1.5-pro"),
+                            ("claude", "claude-3-5-sonnet-20241022"),
+                            ("gpt", "gpt-4o")]:
+        load_provider(provider)  # SDK import 시간은 제외 (startup에서 따로 측정)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            _create_chat_model(provider, model, "benchmark-key", 0.7)
+        cold = (time.perf_counter() - started) / iterations
+
+        pool = LLMClientPool()
+        pool.get(provider, model, "benchmark-key", 0.7)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            pool.get(provider, model, "benchmark-key", 0.7)
+        pooled = (time.perf_counter() - started) / iterations
+
+        results[f"{provider}_cold_us"] = round(cold * 1e6, 2)
+        results[f"{provider}_pooled_us"] = round(pooled * 1e6, 2)
+
+    return results
+
+
+def _import_profile(module: str) -> Dict[str, Any]:
+    """새 프로세스에서 python -X importtime으로 module을 import한 결과"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else f"exit {completed.returncode}"}
+
+    # "import time: self [us] | cumulative | imported package" 형식
+    cumulative: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|", 2)
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+
+    return {
+        "ms": round(cumulative.get(module, 0) / 1000, 1),
+        "modules": len(cumulative),
+        "provider_sdks": [sdk for sdk in PROVIDER_SDKS if sdk in cumulative],
+    }
+
+
+def measure_import_time(
+    modules: Optional[List[str]] = None, repeat: int = 3
+) -> Dict[str, Dict[str, Any]]:
+    """
+    진입점 모듈의 import 시간 (python -X importtime, repeat번 중 최솟값)
+    provider_sdks에는 시작 시 함께 import된 프로바이더 SDK가 기록됩니다.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for module in modules or STARTUP_MODULES:
+        profiles = [_import_profile(module) for _ in range(repeat)]
+        succeeded = [p for p in profiles if "error" not in p]
+        results[module] = min(succeeded, key=lambda p: p["ms"]) if succeeded else profiles[0]
+    return results
+
+
+def check_import_budget(
+    startup: Dict[str, Dict[str, Any]], budgets: Dict[str, float]
+) -> List[str]:
+    """
+    import 시간 예산 검사
+
+    Args:
+        startup: measure_import_time 결과
+        budgets: {모듈: 최대 import 시간(ms)}
+
+    Returns:
+        예산을 넘었거나 프로바이더 SDK를 시작 시 불러온 모듈의 설명 목록 (통과하면 빈 목록)
+    """
+    violations = []
+    for module, budget in budgets.items():
+        profile = startup.get(module)
+        if profile is None or "error" in profile:
+            continue
+        if profile["ms"] > budget:
+            violations.append(f"{module}: {profile['ms']}ms > {budget}ms")
+        if profile["provider_sdks"]:
+            violations.append(f"{module}: 시작 시 {', '.join(profile['provider_sdks'])} import")
+    return violations
+
+
+def _sample_state(index: int) -> WorkflowState:
+    """작성과 검수를 마친 워크플로우 상태 (플랫폼별로 다른 본문)"""
+    business_type = BUSINESS_TYPES[index % len(BUSINESS_TYPES)]
+    topics = [
+        TopicSuggestion(keyword=f"{business_type} 키워드 {i}", title=f"{business_type} 실전 팁 {i}",
+                        reason="벤치마크")
+        for i in range(5)
+    ]
+    state = create_initial_state(business_type, topics[0])
+    state["topic_suggestions"] = topics
+
+    body = default_response([])
+    versions = [
+        ContentVersion(platform=platform, content=f"[{platform} {index}]\n{body}", tone=tone)
+        for platform, tone in PLATFORM_TONES.items()
+    ]
+    state["content_versions"] = versions
+    state["review_results"] = {
+        v.platform: ReviewResult(platform=v.platform, passed=True, score=90, feedback="",
+                                 content_hash=text_hash(v.content))
+        for v in versions
+    }
+    state["review_passed"] = True
+    return state
+
+
+def measure_state_serialization(iterations: int = 200) -> Dict[str, float]:
+    """
+    워크플로우 상태 하나의 메모리/직렬화 비용 (LLM 호출 없음)
+    - state_kb: 실행 중인 워크플로우 하나가 들고 있는 상태 크기 (tracemalloc 기준)
+    - to_json_us / from_json_us: 상태 ↔ JSON 변환 시간
+    - checkpoint_save_us / checkpoint_load_us: 체크포인트 저장/복원 시간 (메모리 SQLite)
+    - checkpoint_kb_per_run: 노드 6개(작성 → 검수 루프 포함)를 저장했을 때 실행 하나의 저장 크기
+    """
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        states = [_sample_state(i) for i in range(iterations)]
+        state_kb = (tracemalloc.get_traced_memory()[0] - baseline) / 1024 / iterations
+    finally:
+        tracemalloc.stop()
+
+    started = time.perf_counter()
+    payloads = [json.dumps(state_to_dict(state), ensure_ascii=False) for state in states]
+    to_json = (time.perf_counter() - started) / iterations
+
+    started = time.perf_counter()
+    for payload in payloads:
+        state_from_dict(json.loads(payload))
+    from_json = (time.perf_counter() - started) / iterations
+
+    store = CheckpointStore(":memory:")
+    nodes = ["planner", "topic_selection", "writer", "reviewer", "writer", "reviewer"]
+    started = time.perf_counter()
+    for i, state in enumerate(states):
+        for node in nodes:
+            store.save(f"bench:{i}", node, state)
+    save = (time.perf_counter() - started) / (iterations * len(nodes))
+
+    started = time.perf_counter()
+    for i in range(iterations):
+        store.load(f"bench:{i}")
+    load = (time.perf_counter() - started) / iterations
+
+    stored = store._conn.execute(
+        """SELECT (SELECT SUM(LENGTH(CAST(state AS BLOB))) FROM checkpoints)
+        + (SELECT SUM(LENGTH(CAST(content AS BLOB))) FROM texts)"""
+    ).fetchone()[0]
+
+    return {
+        "state_kb": round(state_kb, 2),
+        "state_json_kb": round(sum(len(p.encode("utf-8")) for p in payloads) / iterations / 1024, 2),
+        "to_json_us": round(to_json * 1e6, 2),
+        "from_json_us": round(from_json * 1e6, 2),
+        "checkpoint_save_us": round(save * 1e6, 2),
+        "checkpoint_load_us": round(load * 1e6, 2),
+        "checkpoint_kb_per_run": round(stored / iterations / 1024, 2),
+    }
+
+
+def measure_topic_index(entries: int = 10_000, queries: int = 500) -> Dict[str, float]:
+    """
+    작성 주제 색인의 등록/조회 비용 (업종 하나에 entries개 주제, 메모리 SQLite)
+    조회는 LSH 버킷이 겹치는 후보만 비교하므로 entries가 늘어도 거의 일정합니다.
+    """
+    rng = random.Random(0)
+    syllables = [chr(code) for code in range(0xAC00, 0xD7A4, 7)]
+    words = ["".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(1500)]
+
+    def topic() -> TopicSuggestion:
+        keyword = " ".join(rng.sample(words, 2))
+        return TopicSuggestion(
+            keyword=keyword, title=f"{keyword} {' '.join(rng.sample(words, 3))}", reason=""
+        )
+
+    index = TopicIndex(":memory:")
+    topics = [topic() for _ in range(entries)]
+    started = time.perf_counter()
+    for i in range(0, entries, 1000):
+        index.add_many("세무사", topics[i:i + 1000])
+    add = (time.perf_counter() - started) / entries
+
+    samples = topics[:queries // 2] + [topic() for _ in range(queries - queries // 2)]
+    timings = []
+    for candidate in samples:
+        started = time.perf_counter()
+        index.max_similarity("세무사", candidate)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+
+    return {
+        "entries": entries,
+        "add_us": round(add * 1e6, 2),
+        "lookup_p50_us": round(_percentile(timings, 50) * 1e6, 2),
+        "lookup_p95_us": round(_percentile(timings, 95) * 1e6, 2),
+    }
+
+
+def run_benchmarks(
+    concurrency_levels: List[int],
+    runs: int,
+    scenarios: Optional[List[str]] = None,
+    **fake_options: Any
+) -> Dict[str, Any]:
+    """
+    모든 시나리오를 동시 실행 수별로 측정합니다.
+
+    Args:
+        concurrency_levels: 측정할 동시 실행 수 목록
+        runs: 동시 실행 수별 실행 횟수
+        scenarios: 실행할 시나리오 이름 (기본값: 전체)
+        **fake_options: FakeChatModel 옵션 (latency, tokens_per_second, failure_rate, seed)
+    """
+    fake = FakeChatModel(**fake_options)
+    available = _make_scenarios(fake)
+    selected = scenarios or list(available)
+
+    results: Dict[str, Any] = {}
+    for name in selected:
+        if name not in available:
+            raise ValueError(f"알 수 없는 시나리오: {name}")
+
+        fn = available[name]
+        fn(0)  # 워밍업 (그래프 컴파일, 지연 import 등)
+
+        results[name] = []
+        for concurrency in concurrency_levels:
+            row = measure(fn, concurrency, runs)
+            row["peak_memory_kb"] = measure_memory(fn, concurrency)
+            # 실행 중인 워크플로우(호출) 하나당 메모리
+            row["memory_per_run_kb"] = round(row["peak_memory_kb"] / concurrency, 1)
+            results[name].append(row)
+            print(f"  {name:<12} c={concurrency:<3} "
+                  f"{row['throughput_per_second']:>9}/s  "
+                  f"p50 {row['latency_p50_ms']:>9}ms  p95 {row['latency_p95_ms']:>9}ms  "
+                  f"mem {row['peak_memory_kb']:>8}KB ({row['memory_per_run_kb']}KB/run)  "
+                  f"errors {row['errors']}")
+
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "runs": runs,
+            "concurrency_levels": concurrency_levels,
+            "fake_llm": fake_options,
+        },
+        "results": results,
+        "client_construction": measure_client_construction(),
+        "state_serialization": measure_state_serialization(),
+        "topic_index": measure_topic_index(),
+        "startup": measure_import_time(),
+        "rate_limits": rate_limit.metrics(),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """기준 결과 대비 처리량/p95 변화 출력"""
+    print("\n📊 기준 결과와 비교 (처리량 비율, p95 비율)")
+    for name, rows in current["results"].items():
+        base_rows = {r["concurrency"]: r for r in baseline.get("results", {}).get(name, [])}
+        for row in rows:
+            base = base_rows.get(row["concurrency"])
+            if not base or not base["throughput_per_second"] or not base["latency_p95_ms"]:
+                continue
+            throughput = row["throughput_per_second"] / base["throughput_per_second"]
+            p95 = row["latency_p95_ms"] / base["latency_p95_ms"]
+            print(f"  {name:<12} c={row['concurrency']:<3} "
+                  f"처리량 x{throughput:.2f}  p95 x{p95:.2f}")
+
+    base_startup = baseline.get("startup", {})
+    for module, profile in current.get("startup", {}).items():
+        base = base_startup.get(module)
+        if not base or not base.get("ms") or "ms" not in profile:
+            continue
+        print(f"  import {module:<10} {base['ms']}ms → {profile['ms']}ms "
+              f"(x{profile['ms'] / base['ms']:.2f})")
+
+
+def _print_startup(startup: Dict[str, Dict[str, Any]]) -> None:
+    print("\n🚀 진입점 import 시간 (python -X importtime)")
+    for module, profile in startup.items():
+        if "error" in profile:
+            print(f"  {module:<10} 실패: {profile['error']}")
+            continue
+        sdks = ", ".join(profile["provider_sdks"]) or "없음"
+        print(f"  {module:<10} {profile['ms']:>8}ms  모듈 {profile['modules']:>5}개  "
+              f"프로바이더 SDK: {sdks}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 성능 벤치마크 (FakeChatModel)")
+    parser.add_argument("-c", "--concurrency", default="1,4,8",
+                        help="동시 실행 수 목록 (기본값: 1,4,8)")
+    parser.add_argument("-n", "--runs", type=int, default=20,
+                        help="동시 실행 수별 실행 횟수 (기본값: 20)")
+    parser.add_argument("-s", "--scenario", action="append",
+                        help="실행할 시나리오 (planner, writer, multi_model, workflow, advanced)")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="가짜 모델의 첫 토큰 지연(초) (기본값: 0.05)")
+    parser.add_argument("--token-rate", type=float, default=0.0,
+                        help="가짜 모델의 초당 토큰 수 (0이면 즉시, 기본값: 0)")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="가짜 모델의 실패 확률 (기본값: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="실패 주입 난수 시드")
+    parser.add_argument("-o", "--output", default="benchmarks/baseline.json",
+                        help="결과 JSON 경로 (기본값: benchmarks/baseline.json)")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="비교할 기준 결과 JSON")
+    parser.add_argument("--startup-only", action="store_true",
+                        help="진입점 모듈의 import 시간만 측정")
+    parser.add_argument("--import-budget", action="append", default=[], metavar="MODULE=MS",
+                        help="import 시간 예산 (넘거나 프로바이더 SDK를 시작 시 불러오면 종료 코드 1)")
+    args = parser.parse_args()
+
+    budgets = {}
+    for item in args.import_budget:
+        module, _, ms = item.partition("=")
+        budgets[module] = float(ms)
+
+    if args.startup_only:
+        startup = measure_import_time(list(dict.fromkeys(STARTUP_MODULES + list(budgets))))
+        _print_startup(startup)
+        violations = check_import_budget(startup, budgets)
+        for violation in violations:
+            print(f"❌ {violation}")
+        sys.exit(1 if violations else 0)
+
+    # 응답 캐시가 켜져 있으면 LLM 호출이 생략되어 측정이 왜곡됨
+    os.environ.pop("LLM_CACHE", None)
+
+    print("🏁 오프라인 벤치마크 시작")
+    report = run_benchmarks(
+        [int(c) for c in args.concurrency.split(",")],
+        args.runs,
+        scenarios=args.scenario,
+        latency=args.latency,
+        tokens_per_second=args.token_rate,
+        failure_rate=args.failure_rate,
+        seed=args.seed
+    )
+
+    print("\n🔧 클라이언트 생성 비용 (μs)")
+    for key, value in report["client_construction"].items():
+        print(f"  {key:<20} {value}")
+
+    _print_startup(report["startup"])
+
+    print("\n📦 워크플로우 상태 크기/직렬화 비용")
+    for key, value in report["state_serialization"].items():
+        print(f"  {key:<22} {value}")
+
+    print("\n🗂️ 작성 주제 색인")
+    for key, value in report["topic_index"].items():
+        print(f"  {key:<22} {value}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {args.output}")
+
+    violations = check_import_budget(report["startup"], budgets)
+    for violation in violations:
+        print(f"❌ {violation}")
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+워크플로우 체크포인트
+노드가 끝날 때마다 상태를 thread_id별로 저장하고, 작성 중인 플랫폼별 결과도
+개별 저장하여 실패 후 재실행 시 실패한 작업만 다시 계산하도록 합니다.
+글 본문은 texts 테이블에 본문 해시로 한 번만 저장하고, 상태에는 해시만 남깁니다.
+"""
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from langchain_core.runnables import RunnableConfig
+from workflow_state import (
+    ContentVersion, WorkflowState, state_from_dict, state_to_dict,
+    version_from_dict, version_to_dict
+)
+
+
+class CheckpointStore:
+    """SQLite 파일 기반 체크포인트 저장소 (path=":memory:"면 메모리에만 저장)"""
+
+    def __init__(self, path: str = "checkpoints.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                thread_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                node TEXT NOT NULL,
+                state TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (thread_id, seq)
+            );
+            CREATE TABLE IF NOT EXISTS partial_contents (
+                thread_id TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                topic_title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (thread_id, platform)
+            );
+            CREATE TABLE IF NOT EXISTS texts (
+                thread_id TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                content TEXT NOT NULL,
+                PRIMARY KEY (thread_id, hash)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _save_texts(self, thread_id: str, texts: Dict[str, str]) -> None:
+        """본문 저장 (이미 저장된 해시는 건너뜀, 호출한 쪽에서 잠금)"""
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO texts VALUES (?, ?, ?)",
+            [(thread_id, ref, content) for ref, content in texts.items()]
+        )
+
+    def _load_texts(self, thread_id: str, refs: Iterable[str]) -> Dict[str, str]:
+        """본문 해시 목록의 본문 조회 (호출한 쪽에서 잠금)"""
+        refs = list(set(refs))
+        if not refs:
+            return {}
+        rows = self._conn.execute(
+            f"""SELECT hash, content FROM texts
+            WHERE thread_id = ? AND hash IN ({", ".join("?" * len(refs))})""",
+            (thread_id, *refs)
+        ).fetchall()
+        return dict(rows)
+
+    def save(self, thread_id: str, node: str, state: WorkflowState) -> None:
+        """노드 실행 직후 상태 저장 (본문은 처음 나온 것만 저장)"""
+        texts: Dict[str, str] = {}
+        payload = json.dumps(state_to_dict(state, texts), ensure_ascii=False)
+        with self._lock:
+            self._save_texts(thread_id, texts)
+            self._conn.execute(
+                """INSERT INTO checkpoints
+                SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ?, ?
+                FROM checkpoints WHERE thread_id = ?""",
+                (thread_id, node, payload, time.time(), thread_id)
+            )
+            self._conn.commit()
+
+    def load(self, thread_id: str) -> Optional[WorkflowState]:
+        """마지막으로 저장된 상태 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                """SELECT state FROM checkpoints WHERE thread_id = ?
+                ORDER BY seq DESC LIMIT 1""",
+                (thread_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            data = json.loads(row[0])
+            texts = self._load_texts(thread_id, (
+                c["content_ref"] for c in data.get("content_versions") or []
+                if "content_ref" in c
+            ))
+        return state_from_dict(data, texts)
+
+    def completed_nodes(self, thread_id: str) -> List[str]:
+        """완료된 노드 이름 목록 (실행 순서)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT node FROM checkpoints WHERE thread_id = ? ORDER BY seq",
+                (thread_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def save_partial(self, thread_id: str, topic_title: str,
+                     version: ContentVersion) -> None:
+        """작성이 끝난 플랫폼 콘텐츠 하나를 저장 (writer 노드 실행 중)"""
+        texts: Dict[str, str] = {}
+        payload = json.dumps(version_to_dict(version, texts), ensure_ascii=False)
+        with self._lock:
+            self._save_texts(thread_id, texts)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO partial_contents VALUES (?, ?, ?, ?, ?)",
+                (thread_id, version.platform, topic_title, payload, time.time())
+            )
+            self._conn.commit()
+
+    def load_partial(self, thread_id: str, topic_title: str) -> List[ContentVersion]:
+        """같은 주제로 저장된 플랫폼별 콘텐츠 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT content FROM partial_contents
+                WHERE thread_id = ? AND topic_title = ?""",
+                (thread_id, topic_title)
+            ).fetchall()
+            versions = [json.loads(row[0]) for row in rows]
+            texts = self._load_texts(
+                thread_id, (v["content_ref"] for v in versions if "content_ref" in v)
+            )
+        return [version_from_dict(v, texts) for v in versions]
+
+    def delete(self, thread_id: str) -> None:
+        """thread_id의 모든 체크포인트 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            self._conn.execute(
+                "DELETE FROM partial_contents WHERE thread_id = ?", (thread_id,)
+            )
+            self._conn.execute("DELETE FROM texts WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+
+
+_default_store: Optional[CheckpointStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_checkpoint_store() -> CheckpointStore:
+    """
+    기본 체크포인트 저장소
+    - CHECKPOINT_PATH: SQLite 파일 경로 (기본값: checkpoints.sqlite3)
+    """
+    global _default_store
+
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = CheckpointStore(
+                os.getenv("CHECKPOINT_PATH", "checkpoints.sqlite3")
+            )
+        return _default_store
+
+
+def get_checkpoint_context(config: Optional[RunnableConfig]):
+    """노드 config에서 (저장소, thread_id) 조회 (체크포인트 미사용 시 (None, None))"""
+    configurable = (config or {}).get("configurable", {})
+    store = configurable.get("checkpoint_store")
+    thread_id = configurable.get("thread_id")
+    if store is None or not thread_id:
+        return None, None
+    return store, thread_id
+
+
+def checkpointed(name: str, fn: Callable) -> Callable:
+    """
+    노드 함수를 감싸 실행 직후 상태를 체크포인트에 저장합니다.
+    실행 설정에 checkpoint_store와 thread_id가 없으면 아무것도 저장하지 않습니다.
+    """
+    accepts_config = "config" in inspect.signature(fn).parameters
+
+    # functools.wraps를 쓰면 LangGraph가 원래 함수의 시그니처를 보고
+    # config를 넘기지 않으므로 이름만 복사
+    def wrapper(state: WorkflowState, config: RunnableConfig) -> Any:
+        result = fn(state, config=config) if accepts_config else fn(state)
+
+        store, thread_id = get_checkpoint_context(config)
+        if store is not None:
+            store.save(thread_id, name, {**state, **(result or {})})
+
+        return result
+
+    wrapper.__name__ = getattr(fn, "__name__", name)
+    return wrapper
@@ -22,8 +22,11 @@ def example_workflow_simulation():
         "topic_suggestions": None,
         "selected_topic": None,
         "content_versions": None,
+        "content_errors": None,
         "review_passed": None,
         "review_feedback": None,
+        "review_results": None,
+        "review_usage": None,
         "image_prompt": None,
         "image_url": None,
         "published_urls": None,
@@ -0,0 +1,169 @@
+"""
+오프라인 벤치마크/테스트용 가짜 채팅 모델
+네트워크 없이 지연 시간, 토큰 생성 속도, 실패를 재현할 수 있는 결정적 모델입니다.
+PlannerAgent/WriterAgent(llm=...), MultiModelAgent(llm=...),
+워크플로우 실행 설정(configurable의 planner_llm/writer_llm)에 그대로 넣어 사용합니다.
+"""
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Iterator, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+
+class FakeLLMError(RuntimeError):
+    """주입된 실패 (status_code로 429/529 등 재현)"""
+
+    def __init__(self, message: str, status_code: int = 429):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def default_response(messages: List[BaseMessage]) -> str:
+    """프롬프트 종류에 맞는 기본 응답 (기획/검수: JSON, 그 외: 본문 텍스트)"""
+    system = str(messages[0].content) if messages else ""
+    prompt = str(messages[-1].content) if messages else ""
+
+    def suggestions(business_type: str) -> List[dict]:
+        return [
+            {
+                "keyword": f"{business_type} 키워드 {i}",
+                "title": f"{business_type}가 알려주는 실전 팁 {i}",
+                "reason": "벤치마크용 고정 응답"
+            }
+            for i in range(1, 6)
+        ]
+
+    if '"results"' in system:
+        # 배치 기획: "- 업종" 줄마다 결과 하나
+        business_types = [
+            line[2:].strip() for line in prompt.splitlines() if line.startswith("- ")
+        ]
+        return json.dumps({
+            "results": [
+                {"business_type": b, "suggestions": suggestions(b)} for b in business_types
+            ]
+        }, ensure_ascii=False)
+
+    if '"score"' in system:
+        # 검수: 항상 통과
+        return json.dumps({"score": 90, "feedback": ""}, ensure_ascii=False)
+
+    if '"suggestions"' in system:
+        business_type = prompt.split("\n", 1)[0].replace("업종:", "").strip()
+        return json.dumps({"suggestions": suggestions(business_type)}, ensure_ascii=False)
+
+    # 블로그 본문 길이(1,200~1,800자)에 맞춘 고정 텍스트
+    return ("안녕하세요! 오늘은 실무에서 바로 쓸 수 있는 정보를 정리했습니다. " * 40).strip()
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    결정적 가짜 채팅 모델
+
+    Attributes:
+        model: 모델 이름 (캐시 키 등에 사용)
+        latency: 첫 토큰까지의 지연 시간(초)
+        tokens_per_second: 토큰 생성 속도 (0이면 즉시 생성)
+        failure_rate: 호출이 실패할 확률 (0~1)
+        failure_status: 실패 시 status_code (429: rate limit, 529: overloaded)
+        seed: 실패 주입용 난수 시드 (같은 시드면 같은 순서로 실패)
+        response_fn: 메시지 목록을 받아 응답 텍스트를 만드는 함수
+    """
+
+    model: str = "fake-model"
+    temperature: float = 0.7
+    latency: float = 0.0
+    tokens_per_second: float = 0.0
+    failure_rate: float = 0.0
+    failure_status: int = 429
+    seed: int = 0
+    response_fn: Callable[[List[BaseMessage]], str] = default_response
+
+    _rng: random.Random = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr()
+    _calls: int = PrivateAttr(default=0)
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    @property
+    def calls(self) -> int:
+        """지금까지의 호출 횟수"""
+        return self._calls
+
+    def _start_call(self) -> None:
+        """호출 횟수 기록, 실패 주입, 첫 토큰 지연"""
+        with self._lock:
+            self._calls += 1
+            should_fail = self._rng.random() < self.failure_rate
+
+        if self.latency:
+            time.sleep(self.latency)
+        if should_fail:
+            raise FakeLLMError(
+                f"주입된 실패 (status {self.failure_status})", self.failure_status
+            )
+
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        """공백 단위 토큰 (공백 포함)"""
+        tokens = text.split(" ")
+        return [token + " " for token in tokens[:-1]] + [tokens[-1]]
+
+    def _usage(self, messages: List[BaseMessage], output_tokens: int) -> dict:
+        input_tokens = sum(len(str(m.content).split()) for m in messages)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        self._start_call()
+        text = self.response_fn(messages)
+        tokens = self._tokenize(text)
+
+        if self.tokens_per_second:
+            time.sleep(len(tokens) / self.tokens_per_second)
+
+        message = AIMessage(
+            content=text, usage_metadata=self._usage(messages, len(tokens))
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        self._start_call()
+        tokens = self._tokenize(self.response_fn(messages))
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0
+
+        for token in tokens:
+            if delay:
+                time.sleep(delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+        yield ChatGenerationChunk(message=AIMessageChunk(
+            content="", usage_metadata=self._usage(messages, len(tokens))
+        ))
@@ -0,0 +1,221 @@
+"""
+업로드 이미지 저장소
+업로드 파일을 내용 해시로 저장하여 같은 이미지는 한 번만 저장하고(이름 충돌 없음),
+미리보기/발행용 WebP 축소본과 썸네일을 백그라운드 워커에서 생성합니다.
+
+파일 구성 (root 디렉터리):
+    {image_id}.{jpg|png|gif|webp}   원본
+    {image_id}.web.webp             웹용 축소본 (긴 변 최대 1600px)
+    {image_id}.thumb.webp           썸네일 (긴 변 최대 320px)
+"""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Dict, Optional, Tuple
+from PIL import Image, ImageOps
+
+# 변형 이름: (긴 변 최대 픽셀, WebP 품질)
+DEFAULT_VARIANTS: Dict[str, Tuple[int, int]] = {
+    "web": (1600, 82),
+    "thumb": (320, 75),
+}
+
+# Pillow가 인식한 형식 → 저장 확장자 (파일 이름의 확장자는 신뢰하지 않음)
+FORMAT_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+
+IMAGE_ID_LENGTH = 16
+CHUNK_SIZE = 64 * 1024
+
+_IMAGE_ID = re.compile(rf"^[0-9a-f]{{{IMAGE_ID_LENGTH}}}$")
+
+
+class ImageStore:
+    """내용 해시 기반 업로드 이미지 저장소"""
+
+    def __init__(
+        self,
+        root: str,
+        variants: Optional[Dict[str, Tuple[int, int]]] = None,
+        max_workers: int = 2
+    ):
+        """
+        Args:
+            root: 이미지를 저장할 디렉터리
+            variants: {변형 이름: (긴 변 최대 픽셀, WebP 품질)} (기본값: web, thumb)
+            max_workers: 변형 이미지를 생성할 백그라운드 워커 수
+        """
+        self.root = root
+        self.variants = dict(variants or DEFAULT_VARIANTS)
+        os.makedirs(root, exist_ok=True)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="image-worker"
+        )
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def save(self, stream: BinaryIO) -> str:
+        """
+        업로드 스트림을 저장하고 이미지 ID를 반환합니다.
+        같은 내용의 이미지가 이미 있으면 다시 쓰지 않습니다.
+        변형 이미지 생성은 schedule()로 따로 요청합니다.
+
+        Raises:
+            ValueError: 지원하지 않거나 손상된 이미지인 경우
+        """
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            extension = self._detect_extension(temp_path)
+            image_id = digest.hexdigest()[:IMAGE_ID_LENGTH]
+            path = os.path.join(self.root, f"{image_id}.{extension}")
+
+            if os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return image_id
+
+    @staticmethod
+    def _detect_extension(path: str) -> str:
+        try:
+            with Image.open(path) as image:
+                image_format = image.format
+                image.verify()
+        except Exception:
+            raise ValueError("이미지 파일을 읽을 수 없습니다.")
+
+        extension = FORMAT_EXTENSIONS.get(image_format)
+        if extension is None:
+            raise ValueError(f"지원하지 않는 이미지 형식: {image_format}")
+        return extension
+
+    def original_filename(self, image_id: str) -> Optional[str]:
+        """원본 파일 이름 (없거나 잘못된 ID면 None)"""
+        if not _IMAGE_ID.match(image_id):
+            return None
+        for extension in FORMAT_EXTENSIONS.values():
+            filename = f"{image_id}.{extension}"
+            if os.path.exists(os.path.join(self.root, filename)):
+                return filename
+        return None
+
+    def variant_filename(self, image_id: str, variant: str) -> str:
+        if variant not in self.variants:
+            raise ValueError(f"알 수 없는 이미지 변형: {variant}")
+        return f"{image_id}.{variant}.webp"
+
+    def schedule(self, image_id: str) -> Optional[Future]:
+        """
+        변형 이미지 생성을 백그라운드 워커에 요청합니다.
+        이미 생성 중이면 같은 작업을, 모두 생성되어 있으면 None을 반환합니다.
+        """
+        with self._lock:
+            future = self._pending.get(image_id)
+            if future is not None:
+                return future
+
+            if all(
+                os.path.exists(os.path.join(self.root, self.variant_filename(image_id, v)))
+                for v in self.variants
+            ):
+                return None
+
+            future = self._executor.submit(self._generate_variants, image_id)
+            self._pending[image_id] = future
+
+        future.add_done_callback(lambda _: self._forget(image_id))
+        return future
+
+    def _forget(self, image_id: str) -> None:
+        with self._lock:
+            self._pending.pop(image_id, None)
+
+    def _generate_variants(self, image_id: str) -> None:
+        """원본을 한 번 읽어 모든 변형 생성 (EXIF 회전 반영, 메타데이터 제거)"""
+        original = self.original_filename(image_id)
+        if original is None:
+            raise ValueError(f"원본 이미지가 없습니다: {image_id}")
+
+        with Image.open(os.path.join(self.root, original)) as source:
+            image = ImageOps.exif_transpose(source)
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+        # 큰 변형부터 만들고, 작은 변형은 직전 결과를 다시 줄여서 생성
+        for variant, (max_side, quality) in sorted(
+            self.variants.items(), key=lambda item: -item[1][0]
+        ):
+            path = os.path.join(self.root, self.variant_filename(image_id, variant))
+            if os.path.exists(path):
+                continue
+
+            image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+            fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".variant-")
+            with os.fdopen(fd, "wb") as f:
+                image.save(f, "WEBP", quality=quality, method=4)
+            os.replace(temp_path, path)
+
+    def filename(self, image_id: str, variant: Optional[str] = None) -> Optional[str]:
+        """
+        제공할 파일 이름 (변형이 아직 없으면 원본, 원본도 없으면 None)
+
+        Args:
+            image_id: 이미지 ID
+            variant: 변형 이름 (None이면 원본)
+        """
+        if variant is not None and _IMAGE_ID.match(image_id):
+            filename = self.variant_filename(image_id, variant)
+            if os.path.exists(os.path.join(self.root, filename)):
+                return filename
+        return self.original_filename(image_id)
+
+    def path(self, image_id: str, variant: Optional[str] = None,
+             timeout: Optional[float] = None) -> Optional[str]:
+        """
+        파일 경로를 반환합니다 (발행 등 파일이 필요한 곳에서 사용).
+        변형을 생성 중이면 timeout초까지 기다리고, 그래도 없으면 원본 경로를 반환합니다.
+        """
+        if variant is not None and timeout:
+            with self._lock:
+                future = self._pending.get(image_id)
+            if future is not None:
+                try:
+                    future.result(timeout=timeout)
+                except Exception:
+                    pass
+
+        filename = self.filename(image_id, variant)
+        return os.path.join(self.root, filename) if filename else None
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+def create_image_store_from_env(root: str) -> ImageStore:
+    """
+    환경 변수로 이미지 저장소를 생성합니다.
+
+    - IMAGE_WORKERS: 변형 이미지 생성 워커 수 (기본값: 2)
+    - IMAGE_MAX_SIZE: 웹용 축소본의 긴 변 최대 픽셀 (기본값: 1600)
+    - IMAGE_QUALITY: 웹용 축소본 WebP 품질 (기본값: 82)
+    """
+    variants = dict(DEFAULT_VARIANTS)
+    variants["web"] = (
+        int(os.getenv("IMAGE_MAX_SIZE", DEFAULT_VARIANTS["web"][0])),
+        int(os.getenv("IMAGE_QUALITY", DEFAULT_VARIANTS["web"][1])),
+    )
+    return ImageStore(root, variants, max_workers=int(os.getenv("IMAGE_WORKERS", 2)))
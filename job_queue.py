@@ -0,0 +1,214 @@
+"""
+백그라운드 작업 큐
+오래 걸리는 LLM 단계를 웹 요청 스레드 밖의 로컬 워커 풀에서 실행하고,
+작업 ID로 상태와 결과를 조회할 수 있게 합니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+FINISHED_STATUSES = (JOB_DONE, JOB_FAILED)
+
+
+class MemoryJobStore:
+    """프로세스 메모리 기반 작업 저장소"""
+
+    def __init__(self, max_jobs: int = 10_000):
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+            if len(self._jobs) > self.max_jobs:
+                # 가장 오래된 완료 작업부터 제거
+                finished = sorted(
+                    (j for j in self._jobs.values() if j["status"] in FINISHED_STATUSES),
+                    key=lambda j: j["created_at"]
+                )
+                for old in finished[:len(self._jobs) - self.max_jobs]:
+                    del self._jobs[old["id"]]
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+
+class SQLiteJobStore:
+    """SQLite 파일 기반 작업 저장소 (여러 프로세스에서 상태 조회 가능)"""
+
+    def __init__(self, path: str = "jobs.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def save(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?)",
+                (job["id"], json.dumps(job, ensure_ascii=False), job["created_at"])
+            )
+            self._conn.commit()
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+class JobQueue:
+    """로컬 워커 풀에서 작업을 실행하는 큐"""
+
+    def __init__(self, max_workers: int = 4, store=None):
+        """
+        Args:
+            max_workers: 동시에 실행할 최대 작업 수
+            store: 작업 저장소 (기본값: MemoryJobStore)
+        """
+        self.store = store if store is not None else MemoryJobStore()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job-worker"
+        )
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args, **kwargs) -> str:
+        """
+        작업을 큐에 넣고 즉시 작업 ID를 반환합니다.
+
+        Args:
+            kind: 작업 종류 (예: "step2")
+            fn: 실행할 함수 (반환값은 JSON 직렬화 가능해야 함)
+
+        Returns:
+            작업 ID
+        """
+        job = self._new_job(kind)
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job["id"]
+
+    def start(self, kind: str) -> str:
+        """
+        큐 밖(예: 스트리밍 응답)에서 실행되는 작업을 실행 중 상태로 등록합니다.
+        결과는 complete() 또는 fail()로 기록합니다.
+
+        Returns:
+            작업 ID
+        """
+        job = self._new_job(kind)
+        job["status"] = JOB_RUNNING
+        job["started_at"] = job["created_at"]
+        self.store.save(job)
+        return job["id"]
+
+    def complete(self, job_id: str, result: Any) -> None:
+        """작업을 완료 상태로 기록"""
+        self._finish(job_id, JOB_DONE, result=result)
+
+    def fail(self, job_id: str, error: str) -> None:
+        """작업을 실패 상태로 기록"""
+        self._finish(job_id, JOB_FAILED, error=error)
+
+    def _new_job(self, kind: str) -> Dict[str, Any]:
+        job = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": JOB_QUEUED,
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        self.store.save(job)
+        return job
+
+    def _finish(self, job_id: str, status: str, result: Any = None,
+                error: Optional[str] = None) -> None:
+        job = self.store.load(job_id)
+        if job is None:
+            return
+        job["status"] = status
+        job["result"] = result
+        job["error"] = error
+        job["finished_at"] = time.time()
+        self.store.save(job)
+
+    def _run(self, job: Dict[str, Any], fn, args, kwargs) -> None:
+        """워커 스레드에서 작업 실행"""
+        job["status"] = JOB_RUNNING
+        job["started_at"] = time.time()
+        self.store.save(job)
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.fail(job["id"], str(e))
+            return
+
+        self.complete(job["id"], result)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 조회 (없으면 None)"""
+        return self.store.load(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None,
+             poll_interval: float = 0.2) -> Optional[Dict[str, Any]]:
+        """작업이 끝날 때까지 대기 후 상태 반환 (시간 초과 시 마지막 상태)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in FINISHED_STATUSES:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+def create_job_queue_from_env() -> JobQueue:
+    """
+    환경 변수로 작업 큐를 생성합니다.
+
+    - JOB_WORKERS: 워커 수 (기본값: 4)
+    - JOB_STORE: "memory" 또는 "sqlite" (기본값: memory)
+    - JOB_STORE_PATH: SQLite 파일 경로 (기본값: jobs.sqlite3)
+    """
+    store_name = os.getenv("JOB_STORE", "memory").strip().lower()
+    if store_name == "sqlite":
+        store = SQLiteJobStore(os.getenv("JOB_STORE_PATH", "jobs.sqlite3"))
+    elif store_name == "memory":
+        store = MemoryJobStore()
+    else:
+        raise ValueError(f"지원하지 않는 작업 저장소: {store_name}")
+
+    return JobQueue(max_workers=int(os.getenv("JOB_WORKERS", 4)), store=store)
@@ -0,0 +1,144 @@
+"""
+LLM 응답에서 JSON 추출
+코드 블록(```json), 앞뒤 설명 문장, 잘린 응답이 섞여 있어도 응답을 한 번만 훑어서
+첫 번째 JSON 객체/배열을 찾고, 실패하면 간단한 복구(끝 쉼표 제거, 닫히지 않은 괄호 닫기)를 시도합니다.
+"""
+import json
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+# extract_json 결과 구분값
+PARSED = "parsed"
+REPAIRED = "repaired"
+
+
+class _ScanResult(NamedTuple):
+    end: int                  # 최상위 값이 닫힌 다음 위치 (닫히지 않았으면 -1)
+    resume: int               # 다음 탐색을 시작할 위치
+    last_complete: int        # 마지막으로 완성된 하위 값의 끝 위치 (없으면 -1)
+    stack: List[str]          # 닫히지 않은 괄호들의 닫는 문자 (스캔이 끝난 시점)
+    last_depth: int           # last_complete 시점의 괄호 깊이 (stack[:last_depth]가 그때의 스택)
+
+
+def _scan(text: str, start: int) -> _ScanResult:
+    """start의 여는 괄호부터 문자열/이스케이프를 고려해 괄호 짝을 맞춰 나감"""
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    last_complete = -1
+    # 스택을 매번 복사하면 O(n·깊이)가 되므로 깊이만 기록 (그 아래 항목은 이후에도 바뀌지 않음)
+    last_depth = 0
+
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+        elif ch in ("}", "]"):
+            if stack[-1] != ch:
+                # 짝이 맞지 않는 괄호: JSON이 아니므로 이 다음부터 다시 탐색
+                return _ScanResult(-1, i + 1, last_complete, stack, last_depth)
+            stack.pop()
+            if not stack:
+                return _ScanResult(i + 1, i + 1, last_complete, stack, last_depth)
+            last_complete = i + 1
+            last_depth = len(stack)
+
+    return _ScanResult(-1, len(text), last_complete, stack, last_depth)
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """문자열 밖에 있는 `,}` / `,]` 형태의 끝 쉼표 제거 (한 번 훑기)"""
+    out: List[str] = []
+    in_string = False
+    escaped = False
+    last_comma: Optional[int] = None
+
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == ",":
+            last_comma = len(out)
+        elif ch in ("}", "]"):
+            if last_comma is not None:
+                out[last_comma] = ""
+            last_comma = None
+        elif ch == '"':
+            in_string = True
+            last_comma = None
+        elif not ch.isspace():
+            last_comma = None
+
+        out.append(ch)
+    return "".join(out)
+
+
+def _loads(text: str) -> Optional[Any]:
+    try:
+        return json.loads(text)
+    except (ValueError, RecursionError):
+        # 너무 깊게 중첩된 값은 json 모듈이 RecursionError를 내므로 파싱 실패로 처리
+        return None
+
+
+def extract_json(text: str) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    응답 텍스트에서 첫 번째로 파싱 가능한 JSON 객체/배열을 찾습니다.
+    응답 길이에 비례하는 시간 안에 끝납니다 (탐욕적 정규식처럼 되돌아가며 찾지 않음).
+
+    Args:
+        text: LLM 응답 텍스트
+
+    Returns:
+        (값, 방법) - 방법은 PARSED(그대로 파싱) 또는 REPAIRED(복구 후 파싱),
+        찾지 못하면 (None, None)
+    """
+    position = 0
+    next_open = {"{": -2, "[": -2}  # 여는 괄호별 다음 위치 (없으면 -1, 다시 찾지 않음)
+    while position < len(text):
+        for ch, index in next_open.items():
+            if index != -1 and index < position:
+                next_open[ch] = text.find(ch, position)
+        starts = [i for i in next_open.values() if i != -1]
+        if not starts:
+            break
+        start = min(starts)
+
+        scan = _scan(text, start)
+        if scan.end != -1:
+            candidate = text[start:scan.end]
+            value = _loads(candidate)
+            if value is not None:
+                return value, PARSED
+
+            value = _loads(_strip_trailing_commas(candidate))
+            if value is not None:
+                return value, REPAIRED
+        elif scan.resume == len(text) and scan.last_complete != -1:
+            # 응답이 중간에 잘림: 마지막으로 완성된 하위 값까지만 남기고 괄호를 닫아 복구
+            closers = scan.stack[:scan.last_depth]
+            candidate = text[start:scan.last_complete] + "".join(reversed(closers))
+            value = _loads(_strip_trailing_commas(candidate))
+            if value is not None:
+                return value, REPAIRED
+
+        # 이 구간은 JSON이 아님 (예: 설명 문장의 중괄호) → 구간 다음부터 다시 탐색
+        position = scan.resume
+
+    return None, None
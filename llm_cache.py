@@ -0,0 +1,265 @@
+"""
+LLM 응답 캐시
+프로바이더, 모델 이름, 온도, 생성 설정(최대 출력 토큰 수, JSON 응답 모드 등)과
+시스템/사용자 프롬프트 메시지의 해시를 키로 응답을 저장하여
+같은 요청이 반복될 때 LLM을 다시 호출하지 않도록 합니다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+
+
+# 응답 내용에 영향을 주는 채팅 모델 속성 (프로바이더마다 이름이 다름, 있는 것만 키에 포함)
+GENERATION_PARAMS = ("max_tokens", "max_output_tokens", "top_p", "top_k", "stop")
+
+
+class MemoryCacheBackend:
+    """프로세스 메모리 기반 LRU 캐시 백엔드"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """(값, 저장 시각) 반환, 없으면 None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: str, created_at: float) -> None:
+        with self._lock:
+            self._data[key] = (value, created_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class SQLiteCacheBackend:
+    """SQLite 파일 기반 영구 캐시 백엔드 (재시작 후에도 유지)"""
+
+    def __init__(self, path: str = "llm_cache.sqlite3", max_entries: int = 100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                    (time.time(), key)
+                )
+                self._conn.commit()
+            return row
+
+    def set(self, key: str, value: str, created_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)",
+                (key, value, created_at, time.time())
+            )
+            # 최대 개수를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+            # (매 쓰기마다 정리하지 않고 일정 횟수마다 한 번씩 수행)
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._conn.execute(
+                    """DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM llm_cache ORDER BY accessed_at DESC
+                        LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class ResponseCache:
+    """TTL/LRU 기반 LLM 응답 캐시"""
+
+    def __init__(self, backend=None, ttl: Optional[float] = 24 * 60 * 60):
+        """
+        Args:
+            backend: 캐시 백엔드 (기본값: MemoryCacheBackend)
+            ttl: 캐시 유효 시간(초), None이면 만료 없음
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        model: str, temperature: Optional[float], messages: List[BaseMessage],
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        모델 이름, 온도, 메시지 내용, 생성 설정으로 캐시 키 생성
+
+        Args:
+            params: 응답에 영향을 주는 그 밖의 설정 (프로바이더, JSON 응답 모드, 최대 출력 토큰 수 등)
+        """
+        payload = json.dumps(
+            {
+                "model": model,
+                "temperature": temperature,
+                "messages": [[m.type, m.content] for m in messages],
+                "params": params or {},
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            default=repr
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 반환 (없거나 만료되면 None)"""
+        entry = self.backend.get(key)
+
+        if entry is not None and self.ttl is not None:
+            if time.time() - entry[1] > self.ttl:
+                self.backend.delete(key)
+                entry = None
+
+        with self._stats_lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return entry[0] if entry is not None else None
+
+    def set(self, key: str, value: str) -> None:
+        self.backend.set(key, value, time.time())
+
+    def key_for(
+        self,
+        llm: BaseChatModel,
+        messages: List[BaseMessage],
+        provider: str = "",
+        json_mode: bool = False,
+        invoke_kwargs: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        채팅 모델 설정과 메시지로 캐시 키 생성
+        JSON 응답 모드와 자유 형식 응답, 최대 출력 토큰 수가 다른 요청은 서로 다른 키가 됩니다.
+
+        Args:
+            llm: 호출할 채팅 모델
+            messages: 시스템/사용자 메시지 목록
+            provider: 프로바이더 이름
+            json_mode: JSON 응답을 요청하는지 여부
+            invoke_kwargs: 호출 시 추가로 넘기는 인자 (json_mode_kwargs 등)
+        """
+        model = getattr(llm, "model", None) or getattr(llm, "model_name", "")
+        params: Dict[str, Any] = {
+            name: getattr(llm, name) for name in GENERATION_PARAMS
+            if getattr(llm, name, None) is not None
+        }
+        params.update(provider=provider, json_mode=json_mode, invoke_kwargs=invoke_kwargs or {})
+        return self.make_key(str(model), getattr(llm, "temperature", None), messages, params)
+
+    def stats(self) -> Dict[str, float]:
+        """적중/미적중 통계"""
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self.backend),
+            }
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """
+    환경 변수로 설정된 기본 캐시를 반환합니다 (설정되지 않았으면 None).
+
+    - LLM_CACHE: "memory" 또는 "sqlite"
+    - LLM_CACHE_PATH: SQLite 파일 경로 (기본값: llm_cache.sqlite3)
+    - LLM_CACHE_TTL: 유효 시간(초) (기본값: 86400)
+    """
+    global _default_cache
+
+    backend_name = os.getenv("LLM_CACHE", "").strip().lower()
+    if not backend_name:
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            if backend_name == "memory":
+                backend = MemoryCacheBackend()
+            elif backend_name == "sqlite":
+                backend = SQLiteCacheBackend(
+                    os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+                )
+            else:
+                raise ValueError(f"지원하지 않는 캐시 백엔드: {backend_name}")
+
+            _default_cache = ResponseCache(
+                backend, ttl=float(os.getenv("LLM_CACHE_TTL", 24 * 60 * 60))
+            )
+
+        return _default_cache
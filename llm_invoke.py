@@ -0,0 +1,192 @@
+"""
+에이전트 공통 LLM 호출 경로
+응답 캐시 조회, 프로바이더 속도 제한/동시 요청 수 조절, 호출 계측을 한곳에서 처리합니다.
+"""
+import functools
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, SystemMessage
+import rate_limit
+import telemetry
+from llm_cache import ResponseCache
+
+# 요청 전 토큰 수 추정값 (응답 후 usage_metadata의 실제 값으로 보정)
+CHARS_PER_TOKEN = 2
+DEFAULT_OUTPUT_TOKENS = 1024
+
+
+def chunk_text(chunk: Any) -> str:
+    """스트리밍 청크(또는 응답)에서 텍스트만 추출 (콘텐츠 블록 리스트 지원)"""
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, str):
+        return content
+
+    parts = []
+    for block in content or []:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(block.get("text", ""))
+    return "".join(parts)
+
+
+def estimate_tokens(llm: BaseChatModel, messages: List[BaseMessage]) -> int:
+    """입력 글자 수와 최대 출력 토큰 수로 요청의 토큰 사용량을 추정"""
+    input_chars = sum(len(chunk_text(message)) for message in messages)
+    max_tokens = getattr(llm, "max_tokens", None) or DEFAULT_OUTPUT_TOKENS
+    return input_chars // CHARS_PER_TOKEN + int(max_tokens)
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_system_message(text: str) -> SystemMessage:
+    return SystemMessage(content=[
+        {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+    ])
+
+
+def apply_prompt_cache(llm: BaseChatModel, messages: List[BaseMessage]) -> List[BaseMessage]:
+    """
+    프로바이더 측 프롬프트 캐시를 적용합니다.
+    - Anthropic: 시스템 메시지를 cache_control 블록으로 표시
+      (같은 시스템 프롬프트로 시작하는 요청은 캐시에서 읽어 입력 비용과 첫 토큰 지연이 줄어듦)
+    - OpenAI/Gemini: 앞부분이 같은 프롬프트를 자동으로 캐시하므로 그대로 전송
+      (고정된 시스템 프롬프트를 항상 맨 앞에 두는 것으로 충분)
+    캐시는 프로바이더별 최소 길이(Anthropic Sonnet 1,024토큰 등)를 넘는 프롬프트에만 적용됩니다.
+    """
+    if getattr(llm, "_llm_type", "") != "anthropic-chat":
+        return messages
+
+    return [
+        _cached_system_message(message.content)
+        if isinstance(message, SystemMessage) and isinstance(message.content, str)
+        else message
+        for message in messages
+    ]
+
+
+def json_mode_kwargs(llm: BaseChatModel) -> Dict[str, Any]:
+    """
+    프로바이더의 JSON 응답 모드 호출 인자
+    - Gemini: response_mime_type="application/json"
+    - OpenAI: response_format={"type": "json_object"}
+    - 그 외(Anthropic 등): 지원하지 않으므로 빈 값 (프롬프트 지시와 응답 파싱에 의존)
+    """
+    llm_type = getattr(llm, "_llm_type", "")
+    if llm_type == "chat-google-generative-ai":
+        return {"response_mime_type": "application/json"}
+    if llm_type == "openai-chat":
+        return {"response_format": {"type": "json_object"}}
+    return {}
+
+
+def _record_call(
+    provider: str,
+    llm: BaseChatModel,
+    started: float,
+    permit: Optional[rate_limit.Permit],
+    usage: Optional[telemetry.TokenUsage] = None,
+    error: Optional[BaseException] = None
+) -> None:
+    """호출 시간(속도 제한 대기 제외)과 토큰 사용량을 계측에 기록"""
+    waited = permit.waited if permit is not None else 0.0
+    telemetry.record_llm_call(
+        provider, telemetry.model_name(llm), time.monotonic() - started - waited,
+        queue_wait=waited, usage=usage, error=error
+    )
+
+
+def invoke_llm(
+    llm: BaseChatModel,
+    messages: List[BaseMessage],
+    provider: str,
+    cache: Optional[ResponseCache] = None,
+    refresh: bool = False,
+    json_mode: bool = False
+) -> str:
+    """
+    LLM을 호출하고 응답 텍스트를 반환합니다.
+
+    Args:
+        llm: 호출할 채팅 모델
+        messages: 시스템/사용자 메시지 목록
+        provider: 속도 제한에 사용할 프로바이더 이름 ("gemini", "claude", "gpt")
+        cache: 응답 캐시 (적중 시 LLM을 호출하지 않음)
+        refresh: True면 캐시를 조회하지 않고 새 응답으로 캐시를 갱신
+        json_mode: True면 지원하는 프로바이더에서 JSON 응답 모드로 호출
+
+    Returns:
+        응답 텍스트
+    """
+    kwargs = json_mode_kwargs(llm) if json_mode else {}
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.key_for(llm, messages, provider, json_mode, kwargs)
+        cached = None if refresh else cache.get(cache_key)
+        if cached is not None:
+            telemetry.record_llm_call(provider, telemetry.model_name(llm), 0.0, cached=True)
+            return cached
+
+    started = time.monotonic()
+    permit = None
+    try:
+        with rate_limit.call(provider, estimate_tokens(llm, messages)) as permit:
+            response = llm.invoke(apply_prompt_cache(llm, messages), **kwargs)
+            usage = telemetry.extract_usage(response)
+            permit.record_usage(usage.total if usage else None)
+    except Exception as e:
+        _record_call(provider, llm, started, permit, error=e)
+        raise
+
+    _record_call(provider, llm, started, permit, usage)
+    content = chunk_text(response)
+
+    if cache_key is not None:
+        cache.set(cache_key, content)
+    return content
+
+
+def stream_llm(
+    llm: BaseChatModel,
+    messages: List[BaseMessage],
+    provider: str,
+    cache: Optional[ResponseCache] = None
+) -> Iterator[str]:
+    """
+    LLM 응답을 텍스트 조각 단위로 스트리밍합니다.
+    캐시 적중 시 저장된 응답 전체를 한 번에 내보냅니다.
+    스트리밍이 끝날 때까지 프로바이더 동시 요청 수 한 자리를 차지합니다.
+    """
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.key_for(llm, messages, provider)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            telemetry.record_llm_call(provider, telemetry.model_name(llm), 0.0, cached=True)
+            yield cached
+            return
+
+    parts = []
+    usage: Optional[telemetry.TokenUsage] = None
+    started = time.monotonic()
+    permit = None
+    try:
+        with rate_limit.call(provider, estimate_tokens(llm, messages)) as permit:
+            for chunk in llm.stream(apply_prompt_cache(llm, messages)):
+                chunk_usage = telemetry.extract_usage(chunk)
+                if chunk_usage is not None:
+                    usage = chunk_usage if usage is None else usage.merge(chunk_usage)
+
+                text = chunk_text(chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+            permit.record_usage(usage.total if usage else None)
+    except Exception as e:
+        _record_call(provider, llm, started, permit, error=e)
+        raise
+
+    _record_call(provider, llm, started, permit, usage)
+
+    if cache_key is not None:
+        cache.set(cache_key, "".join(parts))
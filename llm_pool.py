@@ -0,0 +1,312 @@
+"""
+프로세스 전역 LLM 클라이언트 풀
+(프로바이더, 모델, 온도, API 키 해시)별로 채팅 모델 인스턴스를 재사용하여
+요청마다 HTTP 세션과 TLS 연결을 새로 맺지 않도록 합니다.
+
+프로바이더 SDK(langchain_google_genai 등)는 import에 수백 ms가 걸리므로
+해당 프로바이더를 처음 사용할 때 불러옵니다.
+"""
+import hashlib
+import importlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple, Type
+from langchain_core.language_models.chat_models import BaseChatModel
+
+
+class ProviderSpec(NamedTuple):
+    """채팅 모델 프로바이더 정의 (module은 처음 사용할 때 import)"""
+    module: str  # 채팅 모델 클래스가 있는 모듈 경로
+    class_name: str  # 채팅 모델 클래스 이름
+    api_key_param: str  # 생성자의 API 키 인자 이름
+    default_model: str  # 단계별 모델 이름을 지정하지 않았을 때 사용할 모델
+    label: str  # 화면/오류 메시지에 쓸 이름
+    api_key_config: str  # configurable/세션의 API 키 항목 이름
+    requires_api_key: bool = True  # False면 API 키 없이 사용 (로컬 서버 등)
+    base_url_param: Optional[str] = None  # 생성자의 엔드포인트 인자 이름 (없으면 base_url 미지원)
+    default_base_url: Optional[str] = None  # base_url을 지정하지 않았을 때 사용할 엔드포인트
+    env_prefix: Optional[str] = None  # {접두사}_BASE_URL, {접두사}_MODEL 환경 변수로 기본값 변경
+    defaults: Optional[Dict[str, Any]] = None  # 생성자 기본 인자 (단계별 params가 우선)
+    display_names: Optional[Dict[str, str]] = None  # {모델 이름: 표시 이름}
+
+
+# 기본 제공 프로바이더 (entry point나 register_provider로 추가 가능)
+PROVIDERS: Dict[str, ProviderSpec] = {
+    "gemini": ProviderSpec(
+        "langchain_google_genai", "ChatGoogleGenerativeAI", "google_api_key",
+        default_model="gemini-1.5-pro", label="Gemini", api_key_config="gemini_api_key",
+        display_names={"gemini-1.5-pro": "Gemini 1.5 Pro"}
+    ),
+    "claude": ProviderSpec(
+        "langchain_anthropic", "ChatAnthropic", "anthropic_api_key",
+        default_model="claude-3-5-sonnet-20241022", label="Claude",
+        api_key_config="claude_api_key", base_url_param="base_url",
+        defaults={"max_tokens": 4096},
+        display_names={"claude-3-5-sonnet-20241022": "Claude 3.5 Sonnet"}
+    ),
+    "gpt": ProviderSpec(
+        "langchain_openai", "ChatOpenAI", "openai_api_key",
+        default_model="gpt-4o", label="OpenAI", api_key_config="openai_api_key",
+        base_url_param="base_url", display_names={"gpt-4o": "GPT-4o"}
+    ),
+    # OpenAI 호환 로컬 서버 (llama.cpp server, vLLM, Ollama 등)
+    "local": ProviderSpec(
+        "langchain_openai", "ChatOpenAI", "openai_api_key",
+        default_model="local-model", label="로컬 모델", api_key_config="local_api_key",
+        requires_api_key=False, base_url_param="base_url",
+        default_base_url="http://localhost:8000/v1", env_prefix="LOCAL_LLM"
+    ),
+}
+
+# 외부 패키지가 프로바이더를 추가할 entry point 그룹
+# (pyproject.toml 예: [project.entry-points."blog_workflow.llm_providers"]
+#  my_provider = "my_package.providers:SPEC")
+ENTRY_POINT_GROUP = "blog_workflow.llm_providers"
+
+# 로컬 서버는 API 키를 확인하지 않지만 OpenAI 클라이언트는 키가 필요함
+_PLACEHOLDER_API_KEY = "not-needed"
+
+_loaded_backends: Dict[str, Type[BaseChatModel]] = {}
+_backend_lock = threading.Lock()
+_entry_points_loaded = False
+
+
+def register_provider(name: str, spec: ProviderSpec) -> None:
+    """
+    프로바이더를 등록합니다 (같은 이름이 있으면 교체).
+
+    Args:
+        name: 프로바이더 이름 (model_type, "{단계}_model" 값으로 사용)
+        spec: 프로바이더 정의
+    """
+    with _backend_lock:
+        PROVIDERS[name] = spec
+        _loaded_backends.pop(name, None)
+
+
+def _load_entry_points() -> None:
+    """entry point로 설치된 프로바이더 등록 (처음 한 번, 기본 제공 이름은 덮어쓰지 않음)"""
+    global _entry_points_loaded
+
+    with _backend_lock:
+        if _entry_points_loaded:
+            return
+        _entry_points_loaded = True
+        found = list(entry_points(group=ENTRY_POINT_GROUP))
+
+    for entry_point in found:
+        if entry_point.name in PROVIDERS:
+            continue
+        spec = entry_point.load()
+        register_provider(entry_point.name, spec() if callable(spec) else spec)
+
+
+def get_provider(name: str) -> ProviderSpec:
+    """
+    프로바이더 정의 조회 (등록되지 않은 이름이면 entry point를 찾아본 뒤 ValueError)
+    """
+    spec = PROVIDERS.get(name)
+    if spec is None:
+        _load_entry_points()
+        spec = PROVIDERS.get(name)
+    if spec is None:
+        raise ValueError(f"지원하지 않는 모델: {name}")
+    return spec
+
+
+def provider_names() -> List[str]:
+    """사용 가능한 프로바이더 이름 목록 (entry point 포함)"""
+    _load_entry_points()
+    return list(PROVIDERS)
+
+
+def default_model_name(provider: str) -> str:
+    """프로바이더의 기본 모델 이름 ({env_prefix}_MODEL 환경 변수가 있으면 그 값)"""
+    spec = get_provider(provider)
+    if spec.env_prefix:
+        return os.getenv(f"{spec.env_prefix}_MODEL", spec.default_model)
+    return spec.default_model
+
+
+def load_provider(provider: str) -> Type[BaseChatModel]:
+    """프로바이더의 채팅 모델 클래스 (처음 호출할 때 SDK를 import)"""
+    backend = _loaded_backends.get(provider)
+    if backend is not None:
+        return backend
+
+    spec = get_provider(provider)
+    with _backend_lock:
+        backend = _loaded_backends.get(provider)
+        if backend is None:
+            backend = getattr(importlib.import_module(spec.module), spec.class_name)
+            _loaded_backends[provider] = backend
+        return backend
+
+
+def _hash_api_key(api_key: Optional[str]) -> str:
+    """API 키 원문 대신 풀 키에 사용할 해시"""
+    if not api_key:
+        return ""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _create_chat_model(
+    provider: str,
+    model: str,
+    api_key: str,
+    temperature: float,
+    **kwargs: Any
+) -> BaseChatModel:
+    """
+    프로바이더에 맞는 채팅 모델 인스턴스 생성
+    kwargs가 프로바이더 기본 인자(defaults)보다 우선하며, base_url을 지정하지 않은
+    로컬 프로바이더는 {env_prefix}_BASE_URL 또는 기본 엔드포인트를 사용합니다.
+    """
+    spec = get_provider(provider)
+    backend = load_provider(provider)
+
+    options = dict(spec.defaults or {})
+    if spec.base_url_param and spec.default_base_url:
+        base_url = os.getenv(f"{spec.env_prefix}_BASE_URL") if spec.env_prefix else None
+        options[spec.base_url_param] = base_url or spec.default_base_url
+    options.update(kwargs)
+    options[spec.api_key_param] = api_key or (
+        None if spec.requires_api_key else _PLACEHOLDER_API_KEY
+    )
+
+    return backend(model=model, temperature=temperature, **options)
+
+
+class LLMClientPool:
+    """스레드 안전한 채팅 모델 클라이언트 레지스트리"""
+
+    def __init__(self, max_size: int = 32, idle_timeout: float = 600.0):
+        """
+        Args:
+            max_size: 풀에 보관할 최대 클라이언트 수 (초과 시 LRU 제거)
+            idle_timeout: 이 시간(초) 동안 사용되지 않은 클라이언트는 제거
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._clients: "OrderedDict[Hashable, Tuple[BaseChatModel, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        provider: str,
+        model: str,
+        api_key: str,
+        temperature: float,
+        factory: Optional[Callable[[], BaseChatModel]] = None,
+        **kwargs: Any
+    ) -> BaseChatModel:
+        """
+        풀에서 클라이언트를 가져오고, 없으면 생성하여 등록합니다.
+
+        Args:
+            provider: 프로바이더 이름 ("gemini", "claude", "gpt")
+            model: 모델 이름
+            api_key: API 키 (풀 키에는 해시만 사용)
+            temperature: 생성 온도
+            factory: 직접 생성 함수 (없으면 프로바이더 기본 생성자 사용)
+            **kwargs: 모델 생성자에 전달할 추가 인자 (풀 키에 포함)
+
+        Returns:
+            재사용 가능한 채팅 모델 인스턴스
+        """
+        key = (
+            provider,
+            model,
+            temperature,
+            _hash_api_key(api_key),
+            # 중첩 인자(default_headers, model_kwargs, extra_body 등)도 키로 쓸 수 있도록 직렬화
+            json.dumps(kwargs, sort_keys=True, default=repr),
+        )
+
+        with self._lock:
+            now = time.monotonic()
+            self._evict_idle(now)
+
+            entry = self._clients.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._clients[key] = (entry[0], now)
+                self._clients.move_to_end(key)
+                return entry[0]
+
+        # 클라이언트 생성(프로바이더 SDK import 포함)은 락 밖에서 수행하여
+        # 느린 생성이 다른 스레드의 풀 조회를 막지 않도록 함
+        if factory is None:
+            client = _create_chat_model(provider, model, api_key, temperature, **kwargs)
+        else:
+            client = factory()
+
+        with self._lock:
+            now = time.monotonic()
+            entry = self._clients.get(key)
+            if entry is not None:
+                # 다른 스레드가 먼저 등록했으면 그 클라이언트를 재사용
+                self.hits += 1
+                self._clients[key] = (entry[0], now)
+                self._clients.move_to_end(key)
+                return entry[0]
+
+            self.misses += 1
+            self._clients[key] = (client, now)
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+
+            return client
+
+    def _evict_idle(self, now: float) -> None:
+        """유휴 시간이 초과된 클라이언트 제거 (락 안에서 호출)"""
+        expired = [
+            key for key, (_, last_used) in self._clients.items()
+            if now - last_used > self.idle_timeout
+        ]
+        for key in expired:
+            del self._clients[key]
+
+    def clear(self) -> None:
+        """풀의 모든 클라이언트 제거"""
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """풀 사용 통계"""
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+
+_default_pool = LLMClientPool()
+
+
+def get_client_pool() -> LLMClientPool:
+    """프로세스 기본 클라이언트 풀 반환"""
+    return _default_pool
+
+
+def get_chat_model(
+    provider: str,
+    model: str,
+    api_key: str,
+    temperature: float,
+    **kwargs: Any
+) -> BaseChatModel:
+    """기본 풀에서 채팅 모델을 가져옵니다."""
+    return _default_pool.get(provider, model, api_key, temperature, **kwargs)
@@ -0,0 +1,325 @@
+"""
+프로바이더 간 자동 전환(failover)과 헤지 요청
+여러 프로바이더의 채팅 모델을 우선순위대로 묶어, 오류나 시간 초과 시 다음 프로바이더로 넘어가고
+첫 프로바이더가 평소(p95)보다 느리면 다음 프로바이더에도 요청을 보내 먼저 온 응답을 사용합니다.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+import telemetry
+from llm_cache import ResponseCache
+from llm_invoke import invoke_llm, stream_llm
+
+# 헤지 기준 p95를 계산하기 위한 최소 표본 수와 표본 창 크기
+MIN_HEDGE_SAMPLES = 10
+LATENCY_WINDOW = 200
+
+# 연속 실패가 이 횟수 이상이면 일정 시간 동안 우선순위를 맨 뒤로 내림
+FAILURE_THRESHOLD = 3
+FAILURE_COOLDOWN = 30.0
+
+# 라우팅 호출을 실행하는 공용 스레드 풀
+# (시간 초과로 포기한 호출은 중단할 수 없어 끝날 때까지 스레드와 속도 제한 자리를 차지하므로,
+#  시간 제한은 풀에서 대기한 시간을 빼고 실제 호출을 시작한 시점부터 계산)
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-router")
+# 아직 시작하지 않은 호출이 있을 때 시작 여부를 다시 확인하는 간격(초)
+_START_POLL_INTERVAL = 0.05
+
+Route = Tuple[str, BaseChatModel]
+
+
+class ProviderStats:
+    """프로바이더 하나의 최근 지연 시간과 성공/실패 통계"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.consecutive_failures = 0
+        self.last_failure_at = 0.0
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self.successes += 1
+            self.consecutive_failures = 0
+
+    def record_failure(self, timeout: bool = False) -> None:
+        with self._lock:
+            self.failures += 1
+            if timeout:
+                self.timeouts += 1
+            self.consecutive_failures += 1
+            self.last_failure_at = time.monotonic()
+
+    def p95(self) -> Optional[float]:
+        """최근 성공 응답의 p95 지연 시간(초) (표본이 부족하면 None)"""
+        with self._lock:
+            if len(self._latencies) < MIN_HEDGE_SAMPLES:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def is_unhealthy(self) -> bool:
+        """최근 연속 실패로 우선순위를 내려야 하는지 여부"""
+        return (
+            self.consecutive_failures >= FAILURE_THRESHOLD
+            and time.monotonic() - self.last_failure_at < FAILURE_COOLDOWN
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            successes, failures = self.successes, self.failures
+            timeouts, consecutive = self.timeouts, self.consecutive_failures
+
+        total = successes + failures
+        p95 = self.p95()
+        return {
+            "successes": successes,
+            "failures": failures,
+            "timeouts": timeouts,
+            "error_rate": round(failures / total, 4) if total else 0.0,
+            "consecutive_failures": consecutive,
+            "latency_p50_ms": round(1000 * latencies[len(latencies) // 2], 1) if latencies else None,
+            "latency_p95_ms": round(1000 * p95, 1) if p95 is not None else None,
+            "unhealthy": self.is_unhealthy(),
+        }
+
+
+_stats: Dict[str, ProviderStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_provider_stats(provider: str) -> ProviderStats:
+    """프로바이더 통계 조회 (프로세스 전체에서 공유, 없으면 생성)"""
+    with _stats_lock:
+        if provider not in _stats:
+            _stats[provider] = ProviderStats()
+        return _stats[provider]
+
+
+def provider_stats() -> Dict[str, Dict[str, Any]]:
+    """프로바이더별 지연 시간/오류 통계"""
+    with _stats_lock:
+        stats = dict(_stats)
+    return {provider: s.snapshot() for provider, s in stats.items()}
+
+
+class _Attempt:
+    """
+    라우터가 보낸 호출 하나의 상태
+    실제 시작 시각을 기록하고, 시간 초과로 포기한 호출이 나중에 끝나도 통계에 다시 기록하지 않도록
+    포기와 완료 중 먼저 일어난 쪽만 통계를 기록합니다.
+    """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.started: Optional[float] = None
+        self._finished = False
+        self._abandoned = False
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """작업 스레드에서 호출 시작 (이미 포기한 호출이면 False)"""
+        with self._lock:
+            if self._abandoned:
+                return False
+            self.started = time.monotonic()
+            return True
+
+    def finish(self) -> bool:
+        """호출 완료 (포기하지 않은 호출이면 True, 결과를 통계에 기록)"""
+        with self._lock:
+            self._finished = True
+            return not self._abandoned
+
+    def abandon(self) -> bool:
+        """호출 포기 (아직 끝나지 않았으면 True, 시간 초과를 통계에 기록)"""
+        with self._lock:
+            if self._finished:
+                return False
+            self._abandoned = True
+            return True
+
+
+class RoutingError(RuntimeError):
+    """모든 프로바이더 호출이 실패함"""
+
+    def __init__(self, errors: Dict[str, str]):
+        details = ", ".join(f"{provider}: {error}" for provider, error in errors.items())
+        super().__init__(f"모든 프로바이더 호출 실패 ({details})")
+        self.errors = errors
+
+
+class LLMRouter:
+    """우선순위가 있는 프로바이더 목록으로 호출을 라우팅"""
+
+    def __init__(
+        self,
+        routes: List[Route],
+        hedge: bool = False,
+        timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            routes: [(프로바이더 이름, 채팅 모델), ...] 우선순위 순서
+            hedge: True면 첫 요청이 해당 프로바이더의 p95보다 느릴 때 다음 프로바이더에도 요청
+            timeout: 프로바이더별 호출 시간 제한(초), 넘으면 다음 프로바이더로 전환
+        """
+        if not routes:
+            raise ValueError("라우팅할 프로바이더가 없습니다.")
+
+        self.routes = list(routes)
+        self.hedge = hedge
+        self.timeout = timeout
+
+    @property
+    def providers(self) -> List[str]:
+        return [provider for provider, _ in self.routes]
+
+    def ordered_routes(self) -> List[Route]:
+        """설정 순서를 유지하되, 최근 연속 실패한 프로바이더는 뒤로 보냄"""
+        healthy = [r for r in self.routes if not get_provider_stats(r[0]).is_unhealthy()]
+        unhealthy = [r for r in self.routes if get_provider_stats(r[0]).is_unhealthy()]
+        return healthy + unhealthy
+
+    @staticmethod
+    def _call(attempt: _Attempt, llm: BaseChatModel, messages: List[BaseMessage],
+              cache: Optional[ResponseCache], refresh: bool, json_mode: bool = False) -> str:
+        if not attempt.start():
+            raise CancelledError()
+
+        stats = get_provider_stats(attempt.provider)
+        try:
+            content = invoke_llm(
+                llm, messages, attempt.provider, cache, refresh=refresh, json_mode=json_mode
+            )
+        except Exception:
+            if attempt.finish():
+                stats.record_failure()
+            raise
+        if attempt.finish():
+            stats.record_success(time.monotonic() - attempt.started)
+        return content
+
+    def invoke(self, messages: List[BaseMessage],
+               cache: Optional[ResponseCache] = None, refresh: bool = False,
+               json_mode: bool = False) -> str:
+        """
+        우선순위대로 호출하여 처음 성공한 응답 텍스트를 반환합니다.
+        refresh면 응답 캐시를 조회하지 않고 새 응답으로 갱신하고,
+        json_mode면 지원하는 프로바이더에서 JSON 응답 모드로 호출합니다.
+
+        Raises:
+            RoutingError: 모든 프로바이더가 실패하거나 시간 초과된 경우
+        """
+        routes = self.ordered_routes()
+        errors: Dict[str, str] = {}
+        pending: Dict[Future, _Attempt] = {}
+        next_index = 0
+        hedged = False
+
+        def launch() -> None:
+            nonlocal next_index
+            provider, llm = routes[next_index]
+            next_index += 1
+            attempt = _Attempt(provider)
+            future = _executor.submit(
+                telemetry.bind(self._call), attempt, llm, messages, cache, refresh, json_mode
+            )
+            pending[future] = attempt
+
+        launch()
+        try:
+            while pending:
+                now = time.monotonic()
+                wait_for = None
+                started = [a.started for a in pending.values() if a.started is not None]
+                if self.timeout is not None and started:
+                    wait_for = min(started) + self.timeout - now
+                if len(started) < len(pending):
+                    # 풀에서 대기 중인 호출은 시작한 뒤부터 시간 제한/헤지 대기 시간을 계산
+                    wait_for = _START_POLL_INTERVAL if wait_for is None else min(
+                        wait_for, _START_POLL_INTERVAL
+                    )
+
+                # 헤지 대기 시간: 첫 요청이 해당 프로바이더의 p95를 넘기면 다음 프로바이더에도 요청
+                hedge_at = None
+                if self.hedge and not hedged and next_index < len(routes) and len(pending) == 1:
+                    attempt = next(iter(pending.values()))
+                    p95 = get_provider_stats(attempt.provider).p95()
+                    if p95 is not None and attempt.started is not None:
+                        hedge_at = attempt.started + p95 - now
+                        wait_for = hedge_at if wait_for is None else min(wait_for, hedge_at)
+
+                done, _ = wait(
+                    list(pending), timeout=max(0.0, wait_for) if wait_for is not None else None,
+                    return_when=FIRST_COMPLETED
+                )
+
+                for future in done:
+                    attempt = pending.pop(future)
+                    try:
+                        return future.result()
+                    except Exception as e:
+                        errors[attempt.provider] = str(e)
+
+                now = time.monotonic()
+                if self.timeout is not None:
+                    for future, attempt in list(pending.items()):
+                        if attempt.started is None or now - attempt.started < self.timeout:
+                            continue
+                        # 방금 끝난 호출은 다음 반복에서 결과를 처리
+                        if attempt.abandon():
+                            del pending[future]
+                            get_provider_stats(attempt.provider).record_failure(timeout=True)
+                            errors[attempt.provider] = f"{self.timeout}초 시간 초과"
+
+                if hedge_at is not None and pending and not done and next_index < len(routes):
+                    hedged = True
+                    launch()
+                elif not pending and next_index < len(routes):
+                    launch()
+        finally:
+            # 응답을 받았거나 실패한 뒤 아직 시작하지 않은 호출은 취소
+            # (이미 시작한 헤지 요청은 끝까지 실행되어 지연 시간 통계에 반영)
+            for future in pending:
+                future.cancel()
+
+        raise RoutingError(errors)
+
+    def stream(self, messages: List[BaseMessage],
+               cache: Optional[ResponseCache] = None) -> Iterator[str]:
+        """
+        우선순위대로 스트리밍합니다.
+        첫 텍스트 조각이 나오기 전에 실패하면 다음 프로바이더로 전환하고,
+        이미 일부를 내보낸 뒤의 실패는 그대로 전달합니다 (헤지 요청은 하지 않음).
+        """
+        errors: Dict[str, str] = {}
+
+        for provider, llm in self.ordered_routes():
+            stats = get_provider_stats(provider)
+            started = time.monotonic()
+            yielded = False
+            try:
+                for text in stream_llm(llm, messages, provider, cache):
+                    yielded = True
+                    yield text
+            except Exception as e:
+                stats.record_failure()
+                if yielded:
+                    raise
+                errors[provider] = str(e)
+                continue
+
+            stats.record_success(time.monotonic() - started)
+            return
+
+        raise RoutingError(errors)
@@ -1,11 +1,30 @@
 """
 멀티 에이전트 워크플로우 메인 실행 스크립트
 Agent 1 (Gemini 기획) → Agent 2 (Claude 작성) 데모
+
+사용법:
+    python main.py                                   # 대화형 모드
+    python main.py --batch inputs.csv -o out.jsonl   # 배치 모드
 """
+import argparse
+import csv
+import json
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
-from workflow_graph import create_workflow
-from workflow_state import WorkflowState
+from agent_planner import DEFAULT_BATCH_TOKEN_BUDGET, PlannerAgent
+from checkpoint import get_default_checkpoint_store
+from llm_cache import get_default_cache
+import rate_limit
+import telemetry
+import workflow_runner
+from workflow_state import WorkflowState, TopicSuggestion, create_initial_state
+
+REQUIRED_KEYS = ["GOOGLE_API_KEY", "ANTHROPIC_API_KEY"]
 
 
 def print_separator():
@@ -39,6 +58,19 @@ def display_content(state: WorkflowState):
         print_separator()
 
 
+def check_api_keys() -> bool:
+    """필수 API 키가 설정되어 있는지 확인 (없으면 안내 메시지 출력)"""
+    missing_keys = [key for key in REQUIRED_KEYS if not os.getenv(key)]
+
+    if missing_keys:
+        print(f"❌ 다음 API 키가 설정되지 않았습니다: {', '.join(missing_keys)}")
+        print("📝 .env 파일을 생성하고 API 키를 설정해주세요.")
+        print("   예시: .env.example 파일을 참고하세요.")
+        return False
+
+    return True
+
+
 def run_workflow(business_type: str):
     """
     워크플로우를 실행합니다.
@@ -51,13 +83,7 @@ def run_workflow(business_type: str):
     load_dotenv()
 
     # API 키 확인
-    required_keys = ["GOOGLE_API_KEY", "ANTHROPIC_API_KEY"]
-    missing_keys = [key for key in required_keys if not os.getenv(key)]
-
-    if missing_keys:
-        print(f"❌ 다음 API 키가 설정되지 않았습니다: {', '.join(missing_keys)}")
-        print("📝 .env 파일을 생성하고 API 키를 설정해주세요.")
-        print("   예시: .env.example 파일을 참고하세요.")
+    if not check_api_keys():
         return
 
     print("🚀 멀티 에이전트 워크플로우 시작")
@@ -65,28 +91,13 @@ def run_workflow(business_type: str):
     print_separator()
 
     # 초기 상태 설정
-    initial_state: WorkflowState = {
-        "business_type": business_type,
-        "topic_suggestions": None,
-        "selected_topic": None,
-        "content_versions": None,
-        "review_passed": None,
-        "review_feedback": None,
-        "image_prompt": None,
-        "image_url": None,
-        "published_urls": None,
-        "retry_count": 0,
-        "current_step": "planning"
-    }
-
-    # 워크플로우 생성 및 컴파일
-    workflow = create_workflow()
-    app = workflow.compile()
+    initial_state = create_initial_state(business_type)
 
     try:
         # Step 1: Agent 1 (Gemini) - 주제 기획
+        # (컴파일된 그래프는 프로세스 안에서 재사용됨)
         print("🤖 Agent 1 (Gemini) - 주제 기획 중...")
-        result = app.invoke(initial_state)
+        result = workflow_runner.run_workflow(initial_state)
 
         # 결과 출력
         display_topics(result)
@@ -110,6 +121,301 @@ def run_workflow(business_type: str):
         traceback.print_exc()
 
 
+def load_batch_inputs(input_path: str) -> List[Dict[str, Any]]:
+    """
+    배치 입력 파일을 읽습니다.
+
+    - CSV: business_type 열 필수, keyword/title/reason 열이 있으면 주제를 미리 지정
+    - JSONL: {"business_type": ..., "selected_topic": {"keyword", "title", "reason"}}
+
+    각 입력에는 id 필드가 있으면 그대로, 없으면 업종과 주제 제목으로 key를 만듭니다.
+    만든 key가 앞 입력과 겹치면 "#2", "#3"처럼 순번을 붙여 입력마다 출력 기록과
+    체크포인트(batch:<key>)를 따로 씁니다 (입력 순서가 같으면 다시 실행해도 같은 key).
+    """
+    rows: List[Dict[str, Any]] = []
+
+    with open(input_path, encoding="utf-8-sig") as f:
+        if input_path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    rows.append(json.loads(line))
+        else:
+            for row in csv.DictReader(f):
+                item: Dict[str, Any] = {"business_type": row.get("business_type", "")}
+                if row.get("id"):
+                    item["id"] = row["id"]
+                if row.get("title"):
+                    item["selected_topic"] = {
+                        "keyword": row.get("keyword", ""),
+                        "title": row["title"],
+                        "reason": row.get("reason", "")
+                    }
+                rows.append(item)
+
+    inputs = []
+    generated: Dict[str, int] = {}
+    for row in rows:
+        business_type = (row.get("business_type") or "").strip()
+        if not business_type:
+            continue
+
+        topic = row.get("selected_topic")
+        key = row.get("id") or business_type
+        if topic and not row.get("id"):
+            key = f"{business_type}::{topic.get('title', '')}"
+        if not row.get("id"):
+            generated[key] = generated.get(key, 0) + 1
+            if generated[key] > 1:
+                key = f"{key}#{generated[key]}"
+
+        inputs.append({
+            "key": str(key),
+            "business_type": business_type,
+            "selected_topic": TopicSuggestion(**topic) if topic else None
+        })
+
+    return inputs
+
+
+def load_batch_records(output_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    출력 파일의 입력 key별 마지막 레코드를 읽습니다.
+    이어서 실행한 입력(partial/error → 다시 실행)은 뒤에 쓴 레코드가 앞 레코드를 대체하며,
+    순서는 key가 처음 기록된 위치를 따릅니다.
+    """
+    records: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(output_path):
+        return records
+
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # 중단 시 잘린 마지막 줄
+            records[record["key"]] = record
+
+    return records
+
+
+def load_completed_keys(output_path: str) -> set:
+    """출력 파일에서 이미 성공한 입력 key 목록을 읽습니다 (이어서 실행용)"""
+    return {
+        key for key, record in load_batch_records(output_path).items()
+        if record.get("status") == "ok"
+    }
+
+
+def compact_batch_output(output_path: str) -> None:
+    """출력 파일을 입력 key마다 마지막 레코드 하나만 남도록 다시 씁니다 (원자적 교체)"""
+    records = load_batch_records(output_path)
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".batch-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for record in records.values():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def plan_batch_topics(
+    items: List[Dict[str, Any]], token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET
+) -> Dict[str, List[TopicSuggestion]]:
+    """
+    주제가 지정되지 않은 입력들의 주제를 업종 여러 개씩 묶어 미리 기획합니다.
+    체크포인트가 있는 입력은 이어서 실행되므로 제외합니다.
+    같은 업종의 입력이 여러 개면 입력 수만큼 겹치지 않는 주제를 더 받아 나눠 주므로,
+    입력마다 다른 주제로 글을 씁니다.
+
+    Returns:
+        {입력 key: 추천 주제 리스트} (기획하지 못한 입력은 빠지며 실행 중 기획 단계에서 처리)
+    """
+    store = get_default_checkpoint_store()
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for item in items:
+        if item["selected_topic"] is None and store.load(f"batch:{item['key']}") is None:
+            groups.setdefault(item["business_type"], []).append(item)
+    if not groups:
+        return {}
+
+    planner = PlannerAgent(cache=get_default_cache())
+    planned = planner.suggest_topics_batch(list(groups), token_budget=token_budget)
+
+    by_key: Dict[str, List[TopicSuggestion]] = {}
+    for business_type, group in groups.items():
+        topics = planned.get(business_type) or []
+        if topics and len(group) > 1:
+            topics = planner.extend_topics(business_type, topics, len(group))
+        # 입력마다 겹치지 않는 몫 (i, i+n, i+2n번째 주제)
+        for i, item in enumerate(group):
+            share = topics[i::len(group)]
+            if share:
+                by_key[item["key"]] = share
+    return by_key
+
+
+def _run_batch_item(
+    item: Dict[str, Any], topics: Optional[List[TopicSuggestion]] = None
+) -> Dict[str, Any]:
+    """배치 입력 하나를 실행하고 출력 레코드를 반환 (topics: 미리 기획한 추천 주제)"""
+    started = time.monotonic()
+    record: Dict[str, Any] = {
+        "key": item["key"],
+        "business_type": item["business_type"],
+    }
+
+    # 입력 하나(글 한 편)에 든 토큰/비용을 결과에 함께 기록
+    with telemetry.span("batch_item", kind="workflow", key=item["key"]) as usage:
+        try:
+            # 입력별 체크포인트로 실패한 입력은 다음 실행에서 실패한 단계부터 이어서 실행
+            state = create_initial_state(item["business_type"], item["selected_topic"])
+            if topics and not item["selected_topic"]:
+                state["topic_suggestions"] = topics
+            result = workflow_runner.run_workflow(state, thread_id=f"batch:{item['key']}")
+            record.update({
+                # 일부 플랫폼만 실패하면 partial로 기록하여 다음 실행에서 다시 시도
+                "status": "partial" if result.get("content_errors") else "ok",
+                "selected_topic": result["selected_topic"].model_dump(),
+                "topic_suggestions": [
+                    t.model_dump() for t in result.get("topic_suggestions") or []
+                ],
+                "content_versions": [
+                    c.model_dump() for c in result.get("content_versions") or []
+                ],
+                "content_errors": result.get("content_errors"),
+            })
+        except Exception as e:
+            record.update({"status": "error", "error": str(e)})
+
+    totals = usage.totals()
+    record["usage"] = {
+        "llm_calls": totals["calls"],
+        "prompt_tokens": totals["prompt_tokens"],
+        "completion_tokens": totals["completion_tokens"],
+        "cost_usd": round(totals["cost_usd"], 6),
+    }
+    record["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    return record
+
+
+def batch_mode(
+    input_path: str,
+    output_path: str,
+    concurrency: int = 4,
+    rate_limits: Optional[Dict[str, float]] = None,
+    token_limits: Optional[Dict[str, float]] = None,
+    plan_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET
+):
+    """
+    여러 업종을 한 번에 실행하고 결과를 JSONL 파일에 하나씩 기록합니다.
+    출력 파일에 이미 성공(status=ok)으로 기록된 입력은 건너뛰므로,
+    중단된 배치는 같은 명령으로 이어서 실행할 수 있습니다.
+    다시 실행한 입력은 실행이 끝나면 새 레코드가 이전 레코드를 대체합니다 (key마다 한 줄).
+    실패하거나 일부 플랫폼만 작성된 입력은 체크포인트(CHECKPOINT_PATH)에서
+    이어서 실행되어, 이미 끝난 기획/작성 결과를 다시 계산하지 않습니다.
+
+    Args:
+        input_path: 입력 CSV/JSONL 파일 경로
+        output_path: 결과 JSONL 파일 경로 (이어쓰기)
+        concurrency: 동시에 실행할 워크플로우 수
+        rate_limits: 프로바이더별 분당 요청 수 (예: {"gemini": 60, "claude": 50})
+        token_limits: 프로바이더별 분당 토큰 수 (예: {"claude": 80000})
+        plan_token_budget: 주제 배치 기획 요청 하나의 예상 토큰 수 상한 (0이면 입력별로 기획)
+    """
+    load_dotenv()
+
+    if not check_api_keys():
+        return
+
+    # 환경 변수 설정 후 명령줄 인자로 지정한 값만 덮어씀
+    # (지정하지 않은 분당 요청/토큰 수와 최대 동시 요청 수는 환경 변수 설정 유지)
+    rate_limit.configure_rate_limits_from_env()
+    rate_limits = rate_limits or {}
+    token_limits = token_limits or {}
+    for provider in set(rate_limits) | set(token_limits):
+        current = rate_limit.get_limiter(provider)
+        rate_limit.configure_rate_limit(
+            provider,
+            requests_per_minute=rate_limits.get(provider, current.requests_per_minute),
+            tokens_per_minute=token_limits.get(provider, current.tokens_per_minute),
+            max_concurrency=current.concurrency.max_limit
+        )
+
+    inputs = load_batch_inputs(input_path)
+    completed = load_completed_keys(output_path)
+    pending = [item for item in inputs if item["key"] not in completed]
+
+    print(f"🚀 배치 실행: 전체 {len(inputs)}건, 완료 {len(inputs) - len(pending)}건, "
+          f"실행 {len(pending)}건 (동시 실행 {concurrency})")
+
+    if not pending:
+        return
+
+    # 업종 여러 개를 한 요청으로 묶어 주제를 미리 기획 (실패하면 입력별 기획 단계에서 처리)
+    planned: Dict[str, List[TopicSuggestion]] = {}
+    if plan_token_budget > 0:
+        try:
+            planned = plan_batch_topics(pending, plan_token_budget)
+            if planned:
+                print(f"🗂️ 주제 배치 기획: 입력 {len(planned)}건")
+        except Exception as e:
+            print(f"⚠️ 주제 배치 기획 실패, 입력별로 기획합니다: {e}")
+
+    write_lock = threading.Lock()
+    succeeded = 0
+
+    try:
+        with open(output_path, "a", encoding="utf-8") as out, \
+                ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(_run_batch_item, item, planned.get(item["key"]))
+                for item in pending
+            ]
+
+            for done, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                with write_lock:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+
+                if record["status"] == "ok":
+                    succeeded += 1
+                    print(f"✅ [{done}/{len(pending)}] {record['key']} "
+                          f"({record['elapsed_seconds']}초)")
+                elif record["status"] == "partial":
+                    failed = ", ".join(record["content_errors"])
+                    print(f"⚠️ [{done}/{len(pending)}] {record['key']}: "
+                          f"일부 플랫폼 실패 ({failed})")
+                else:
+                    print(f"❌ [{done}/{len(pending)}] {record['key']}: {record['error']}")
+    finally:
+        # 이어서 실행한 입력의 이전 레코드(partial/error)를 정리하여 key마다 한 줄만 남김
+        compact_batch_output(output_path)
+
+    print(f"\n🏁 배치 완료: 성공 {succeeded}건, 실패 {len(pending) - succeeded}건")
+
+    for provider, stats in rate_limit.metrics().items():
+        print(f"   {provider}: 요청 {stats['requests_total']}건, "
+              f"과부하 {stats['overloads_total']}건, 토큰 {stats['tokens_total']}, "
+              f"대기 {stats['wait_seconds_total']}초, "
+              f"동시 요청 한도 {stats['concurrency_limit']}/{stats['concurrency_max']}")
+
+
+def _parse_rate_limits(values: List[str], option: str = "--rpm") -> Dict[str, float]:
+    """--rpm gemini=60 / --tpm claude=80000 형식의 인자를 파싱"""
+    limits = {}
+    for value in values:
+        provider, _, limit = value.partition("=")
+        if not limit:
+            raise argparse.ArgumentTypeError(f"잘못된 {option} 형식: {value} (예: gemini=60)")
+        limits[provider.strip()] = float(limit)
+    return limits
+
+
 def interactive_mode():
     """대화형 모드로 실행"""
     print("🎨 멀티 에이전트 블로그 자동화 시스템")
@@ -125,8 +431,36 @@ def interactive_mode():
 
 
 if __name__ == "__main__":
-    # 대화형 모드 실행
-    interactive_mode()
+    parser = argparse.ArgumentParser(description="멀티 에이전트 블로그 자동화")
+    parser.add_argument("--batch", metavar="INPUT", help="배치 입력 파일 (CSV 또는 JSONL)")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl",
+                        help="배치 결과 JSONL 파일 (기본값: batch_results.jsonl)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4,
+                        help="동시에 실행할 워크플로우 수 (기본값: 4)")
+    parser.add_argument("--rpm", action="append", default=[], metavar="PROVIDER=N",
+                        help="프로바이더별 분당 요청 수 제한 (예: --rpm gemini=60 --rpm claude=50)")
+    parser.add_argument("--tpm", action="append", default=[], metavar="PROVIDER=N",
+                        help="프로바이더별 분당 토큰 수 제한 (예: --tpm claude=80000)")
+    parser.add_argument("--plan-batch-tokens", type=int, default=DEFAULT_BATCH_TOKEN_BUDGET,
+                        help="주제 배치 기획 요청 하나의 예상 토큰 수 상한 "
+                             f"(0이면 입력별로 기획, 기본값: {DEFAULT_BATCH_TOKEN_BUDGET})")
+    args = parser.parse_args()
+
+    load_dotenv()
+    telemetry.configure_logging_from_env()
+
+    if args.batch:
+        batch_mode(
+            args.batch,
+            args.output,
+            concurrency=args.concurrency,
+            rate_limits=_parse_rate_limits(args.rpm),
+            token_limits=_parse_rate_limits(args.tpm, "--tpm"),
+            plan_token_budget=args.plan_batch_tokens
+        )
+    else:
+        # 대화형 모드 실행
+        interactive_mode()
 
     # 또는 직접 실행:
     # run_workflow("세무사")
@@ -1,16 +1,20 @@
 """
 멀티 모델 지원 에이전트
-사용자가 선택한 AI 모델(Gemini/Claude/GPT)로 동적으로 작업을 수행합니다.
+사용자가 선택한 AI 모델(Gemini/Claude/GPT/로컬 OpenAI 호환 서버)로 동적으로 작업을 수행합니다.
 """
-from typing import Literal, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import ChatOpenAI
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.language_models.chat_models import BaseChatModel
+from llm_invoke import chunk_text, invoke_llm, stream_llm  # noqa: F401 (chunk_text 재노출)
+from llm_pool import default_model_name, get_chat_model, get_provider
+from llm_router import LLMRouter
 
 
-ModelType = Literal["gemini", "claude", "gpt"]
+# 프로바이더 이름 (llm_pool.PROVIDERS에 등록된 이름, entry point로 추가 가능)
+ModelType = str
+
+# 대체 모델: 모델 종류 또는 (프로바이더 이름, 채팅 모델)
+Fallback = Union[ModelType, Tuple[str, BaseChatModel]]
 
 
 class MultiModelAgent:
@@ -22,61 +26,90 @@ class MultiModelAgent:
         gemini_api_key: Optional[str] = None,
         claude_api_key: Optional[str] = None,
         openai_api_key: Optional[str] = None,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        llm: Optional[BaseChatModel] = None,
+        fallback_models: Optional[Sequence[Fallback]] = None,
+        hedge: bool = False,
+        timeout: Optional[float] = None,
+        model_name: Optional[str] = None,
+        base_url: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        api_keys: Optional[Dict[str, str]] = None
     ):
         """
         Args:
-            model_type: 사용할 모델 ("gemini", "claude", "gpt")
+            model_type: 사용할 프로바이더 ("gemini", "claude", "gpt", "local" 또는 등록한 이름)
             gemini_api_key: Google Gemini API 키
             claude_api_key: Anthropic Claude API 키
             openai_api_key: OpenAI GPT API 키
             temperature: 생성 온도
+        default_provider: "{step}_llm"만 지정했을 때 사용할 프로바이더 (에이전트의 기본 프로바이더)
+            llm: 직접 지정할 채팅 모델 (테스트/벤치마크용, 지정하면 API 키 무시)
+            fallback_models: 실패/시간 초과 시 순서대로 전환할 대체 모델
+                (API 키가 없는 모델은 건너뜀)
+            hedge: True면 첫 모델이 평소(p95)보다 느릴 때 대체 모델에도 요청하여 먼저 온 응답 사용
+            timeout: 모델별 호출 시간 제한(초)
+            model_name: 모델 이름 (기본값: 프로바이더 기본 모델)
+            base_url: 엔드포인트 URL (예: "http://localhost:8000/v1", 기본값: 프로바이더 기본값)
+            params: 채팅 모델 생성자에 넘길 추가 인자 (예: {"max_tokens": 2048})
+            api_keys: 그 밖의 프로바이더 API 키 {프로바이더의 api_key_config: 키}
         """
         self.model_type = model_type
         self.temperature = temperature
-        self.llm = self._create_llm(
-            model_type, gemini_api_key, claude_api_key, openai_api_key
-        )
+        self.api_keys = dict(api_keys or {})
+        for key, value in (("gemini_api_key", gemini_api_key),
+                           ("claude_api_key", claude_api_key),
+                           ("openai_api_key", openai_api_key)):
+            if value:
+                self.api_keys[key] = value
+        self.model_name = model_name
+        if llm is not None:
+            self.llm = llm
+        else:
+            self.llm = self._create_llm(model_type, model_name, base_url, params)
+
+        # 대체 모델이 있으면 라우터로 호출 (없으면 단일 모델 호출)
+        routes: List[Tuple[str, BaseChatModel]] = [(model_type, self.llm)]
+        for fallback in fallback_models or []:
+            if isinstance(fallback, tuple):
+                routes.append(fallback)
+                continue
+            if fallback == model_type:
+                continue
+            try:
+                routes.append((fallback, self._create_llm(fallback)))
+            except ValueError:
+                continue
+
+        self.router = LLMRouter(routes, hedge=hedge, timeout=timeout) if len(routes) > 1 else None
 
     def _create_llm(
         self,
         model_type: ModelType,
-        gemini_api_key: Optional[str],
-        claude_api_key: Optional[str],
-        openai_api_key: Optional[str]
+        model_name: Optional[str] = None,
+        base_url: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None
     ) -> BaseChatModel:
-        """선택된 모델에 따라 LLM 인스턴스 생성"""
-
-        if model_type == "gemini":
-            if not gemini_api_key:
-                raise ValueError("Gemini API 키가 필요합니다.")
-            return ChatGoogleGenerativeAI(
-                model="gemini-1.5-pro",
-                google_api_key=gemini_api_key,
-                temperature=self.temperature
-            )
-
-        elif model_type == "claude":
-            if not claude_api_key:
-                raise ValueError("Claude API 키가 필요합니다.")
-            return ChatAnthropic(
-                model="claude-3-5-sonnet-20241022",
-                anthropic_api_key=claude_api_key,
-                temperature=self.temperature,
-                max_tokens=4096
-            )
-
-        elif model_type == "gpt":
-            if not openai_api_key:
-                raise ValueError("OpenAI API 키가 필요합니다.")
-            return ChatOpenAI(
-                model="gpt-4o",
-                openai_api_key=openai_api_key,
-                temperature=self.temperature
-            )
+        """선택된 프로바이더의 LLM 인스턴스 생성 (프로세스 전역 풀에서 재사용)"""
+        spec = get_provider(model_type)
 
-        else:
-            raise ValueError(f"지원하지 않는 모델: {model_type}")
+        api_key = self.api_keys.get(spec.api_key_config)
+        if spec.requires_api_key and not api_key:
+            raise ValueError(f"{spec.label} API 키가 필요합니다.")
+
+        kwargs = dict(params or {})
+        if base_url:
+            if not spec.base_url_param:
+                raise ValueError(f"{spec.label}는 base_url을 지원하지 않습니다.")
+            kwargs[spec.base_url_param] = base_url
+
+        return get_chat_model(
+            model_type,
+            model=model_name or default_model_name(model_type),
+            api_key=api_key,
+            temperature=self.temperature,
+            **kwargs
+        )
 
     def invoke(self, system_prompt: str, user_prompt: str) -> str:
         """
@@ -94,14 +127,115 @@ class MultiModelAgent:
             HumanMessage(content=user_prompt)
         ]
 
-        response = self.llm.invoke(messages)
-        return response.content
+        if self.router is not None:
+            return self.router.invoke(messages)
+        return invoke_llm(self.llm, messages, self.model_type)
+
+    def stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """
+        프롬프트를 실행하고 응답을 토큰 단위로 스트리밍합니다.
+
+        Args:
+            system_prompt: 시스템 프롬프트
+            user_prompt: 사용자 프롬프트
+
+        Yields:
+            생성되는 텍스트 조각
+        """
+        messages = [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt)
+        ]
+
+        if self.router is not None:
+            yield from self.router.stream(messages)
+        else:
+            yield from stream_llm(self.llm, messages, self.model_type)
 
     def get_model_name(self) -> str:
-        """현재 사용 중인 모델 이름 반환"""
-        model_names = {
-            "gemini": "Gemini 1.5 Pro",
-            "claude": "Claude 3.5 Sonnet",
-            "gpt": "GPT-4o"
+        """현재 사용 중인 모델 이름 반환 (표시 이름이 등록된 모델은 표시 이름)"""
+        spec = get_provider(self.model_type)
+        model = self.model_name or default_model_name(self.model_type)
+        return (spec.display_names or {}).get(model, model)
+
+
+def _fallbacks_from_config(configurable: Dict[str, Any], step: str) -> List[Fallback]:
+    """configurable의 "{step}_fallback_models" 또는 "fallback_models" (목록 또는 쉼표 구분 문자열)"""
+    fallbacks = configurable.get(f"{step}_fallback_models", configurable.get("fallback_models"))
+    if not fallbacks:
+        return []
+    if isinstance(fallbacks, str):
+        return [name.strip() for name in fallbacks.split(",") if name.strip()]
+    return list(fallbacks)
+
+
+def llm_from_config(
+    config: Optional[Dict[str, Any]], step: str, temperature: float = 0.7,
+    default_provider: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    LangGraph 실행 설정(configurable)에서 단계별 모델을 찾아 에이전트 인자로 변환합니다.
+
+    configurable 예:
+        {"planner_model": "gemini", "writer_model": "claude",
+         "gemini_api_key": "...", "claude_api_key": "...", "openai_api_key": "...",
+         "fallback_models": ["gpt", "gemini"], "hedge_requests": True, "llm_timeout": 60}
+
+    단계별로 모델 이름, 엔드포인트, 생성자 인자를 바꿀 수 있습니다:
+        {"planner_model": "local", "planner_model_name": "qwen2.5-7b-instruct",
+         "planner_base_url": "http://localhost:8000/v1", "planner_params": {"max_tokens": 2048}}
+
+    "{step}_llm"에 채팅 모델 인스턴스를 직접 넣으면 그대로 사용합니다
+    (예: 벤치마크의 FakeChatModel). 이때 프로바이더 이름(속도 제한/계측/라우팅에 사용)은
+    "{step}_model", "{step}_provider", default_provider 순서로 정합니다.
+    fallback_models(또는 "{step}_fallback_models")가 있으면 실패 시 대체 모델로 전환하는
+    라우터를 함께 반환합니다.
+
+    Args:
+        config: 노드에 전달된 RunnableConfig
+        step: 단계 이름 ("planner", "writer", ...)
+        temperature: 생성 온도
+
+    Returns:
+        {"llm": ..., "provider": ..., "router": ...}
+        (단계 모델이 지정되지 않았으면 빈 dict, 대체 모델이 없으면 router 생략)
+
+    Raises:
+        ValueError: "{step}_llm"만 지정했는데 프로바이더를 정할 수 없는 경우
+    """
+    configurable = (config or {}).get("configurable", {})
+    model_type = configurable.get(f"{step}_model")
+
+    llm = configurable.get(f"{step}_llm")
+    if llm is None and not model_type:
+        return {}
+
+    if not model_type:
+        model_type = configurable.get(f"{step}_provider") or default_provider
+        if not model_type:
+            raise ValueError(f"{step}_llm을 지정할 때는 {step}_provider도 지정해야 합니다.")
+    get_provider(model_type)  # 등록되지 않은 프로바이더면 ValueError
+
+    agent = MultiModelAgent(
+        model_type=model_type,
+        gemini_api_key=configurable.get("gemini_api_key"),
+        claude_api_key=configurable.get("claude_api_key"),
+        openai_api_key=configurable.get("openai_api_key"),
+        temperature=temperature,
+        llm=llm,
+        fallback_models=_fallbacks_from_config(configurable, step),
+        hedge=bool(configurable.get("hedge_requests")),
+        timeout=configurable.get("llm_timeout"),
+        model_name=configurable.get(f"{step}_model_name"),
+        base_url=configurable.get(f"{step}_base_url"),
+        params=configurable.get(f"{step}_params"),
+        api_keys={
+            key: value for key, value in configurable.items()
+            if key.endswith("_api_key") and value
         }
-        return model_names[self.model_type]
+    )
+
+    settings: Dict[str, Any] = {"llm": agent.llm, "provider": agent.model_type}
+    if agent.router is not None:
+        settings["router"] = agent.router
+    return settings
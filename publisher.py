@@ -0,0 +1,402 @@
+"""
+멀티 플랫폼 동시 발행
+플랫폼별 콘텐츠(ContentVersion)를 각 블로그 API에 동시에 발행하고 게시물 URL을 모읍니다.
+
+- 프로세스 전역 HTTP 세션(연결 풀)을 재사용하여 발행마다 TLS 연결을 새로 맺지 않음
+- 공유 이미지는 한 번만 읽어 모든 플랫폼 요청과 재시도에 재사용
+- 일시적 오류는 지수 백오프로 재시도하되, 이미 게시되었을 수 있는 실패(응답 유실, 5xx)는
+  같은 제목의 게시물을 먼저 확인하여 중복 게시하지 않음
+"""
+import hashlib
+import html
+import mimetypes
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Type
+import requests
+from requests.adapters import HTTPAdapter
+from workflow_state import ContentVersion, WorkflowState
+
+DEFAULT_TIMEOUT = 30.0
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 10.0
+
+# 서버가 요청을 처리하지 않았음이 확실한 상태 코드 (바로 재시도 가능)
+RETRY_STATUSES = (429, 503)
+# 처리 여부를 알 수 없는 상태 코드 (기존 게시물 확인 후 재시도)
+AMBIGUOUS_STATUSES = (500, 502, 504)
+
+# 발행에 성공한 요청 기록 (같은 요청을 다시 보내면 기존 URL 반환)
+MAX_PUBLISHED_RECORDS = 1_000
+
+
+class PublishError(RuntimeError):
+    """게시 요청 실패"""
+
+    def __init__(self, message: str, retryable: bool = False, ambiguous: bool = False,
+                 retry_after: Optional[float] = None):
+        """
+        Args:
+            message: 오류 메시지
+            retryable: 다시 시도할 수 있는 오류인지
+            ambiguous: 서버에서 이미 게시되었을 수 있는지 (응답 유실, 5xx)
+            retry_after: 서버가 알려준 재시도 대기 시간(초)
+        """
+        super().__init__(message)
+        self.retryable = retryable
+        self.ambiguous = ambiguous
+        self.retry_after = retry_after
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """발행용 프로세스 전역 HTTP 세션 (호스트별 연결 풀 유지)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+class SharedImage:
+    """여러 플랫폼에 함께 첨부할 이미지 (파일은 처음 사용할 때 한 번만 읽음)"""
+
+    def __init__(self, path: Optional[str] = None, public_url: Optional[str] = None):
+        """
+        Args:
+            path: 이미지 파일 경로 (파일 첨부가 필요한 플랫폼용)
+            public_url: 외부에서 접근 가능한 이미지 URL (본문에 링크로 넣는 플랫폼용)
+        """
+        self.path = path
+        self.public_url = public_url
+        self._data: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    @property
+    def data(self) -> Optional[bytes]:
+        if self.path is None:
+            return None
+        with self._lock:
+            if self._data is None:
+                with open(self.path, "rb") as f:
+                    self._data = f.read()
+            return self._data
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path or "image")
+
+    @property
+    def content_type(self) -> str:
+        return mimetypes.guess_type(self.filename)[0] or "application/octet-stream"
+
+
+def to_html(content: str, image_url: Optional[str] = None) -> str:
+    """본문 텍스트를 문단 단위 HTML로 변환 (이미지 URL이 있으면 맨 앞에 삽입)"""
+    paragraphs = [p.strip() for p in content.split("\n\n") if p.strip()]
+    body = "\n".join(
+        f"<p>{html.escape(p).replace(chr(10), '<br>')}</p>" for p in paragraphs
+    )
+    if image_url:
+        body = f'<p><img src="{html.escape(image_url, quote=True)}" alt=""></p>\n' + body
+    return body
+
+
+def _request(session: requests.Session, method: str, url: str, **kwargs: Any) -> Dict[str, Any]:
+    """HTTP 요청 후 JSON 응답 반환 (실패는 재시도 가능 여부를 담은 PublishError로 변환)"""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    try:
+        response = session.request(method, url, **kwargs)
+    except requests.exceptions.ConnectTimeout as e:
+        raise PublishError(f"연결 시간 초과: {e}", retryable=True)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        # 요청을 보낸 뒤 응답을 받지 못함: 이미 게시되었을 수 있음
+        raise PublishError(f"응답 없음: {e}", retryable=True, ambiguous=True)
+
+    if response.status_code >= 400:
+        retry_after = response.headers.get("Retry-After")
+        raise PublishError(
+            f"HTTP {response.status_code}: {response.text[:200]}",
+            retryable=response.status_code in RETRY_STATUSES + AMBIGUOUS_STATUSES,
+            ambiguous=response.status_code in AMBIGUOUS_STATUSES,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+        )
+
+    try:
+        return response.json()
+    except ValueError:
+        raise PublishError(f"잘못된 응답 형식: {response.text[:200]}")
+
+
+class BlogClient:
+    """블로그 플랫폼 게시 클라이언트"""
+
+    platform = ""
+    default_base_url = ""
+    base_url_env = ""
+    # find_post로 이미 게시된 글을 확인할 수 있는지 (없으면 응답 유실 시 재시도하지 않음)
+    can_find_posts = False
+
+    def __init__(self, config: Dict[str, Any], base_url: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
+        """
+        Args:
+            config: 플랫폼 인증/블로그 설정
+            base_url: API 주소 (기본값: {base_url_env} 환경 변수 또는 실제 API 주소)
+            session: HTTP 세션 (기본값: 프로세스 전역 세션)
+        """
+        self.config = config
+        self.base_url = (
+            base_url or os.getenv(self.base_url_env) or self.default_base_url
+        ).rstrip("/")
+        self.session = session or get_http_session()
+
+    def create_post(self, title: str, content: str, image: Optional[SharedImage],
+                    idempotency_key: str) -> str:
+        """게시물을 만들고 URL 반환"""
+        raise NotImplementedError
+
+    def find_post(self, title: str) -> Optional[str]:
+        """같은 제목의 게시물 URL (없으면 None)"""
+        return None
+
+
+class NaverBlogClient(BlogClient):
+    """네이버 블로그 글쓰기 API (이미지는 글과 함께 multipart로 첨부)"""
+
+    platform = "naver"
+    default_base_url = "https://openapi.naver.com"
+    base_url_env = "NAVER_BLOG_API_URL"
+
+    def create_post(self, title: str, content: str, image: Optional[SharedImage],
+                    idempotency_key: str) -> str:
+        if not self.config.get("access_token"):
+            raise PublishError("네이버 블로그 발행에는 access_token이 필요합니다.")
+
+        headers = {
+            "Authorization": f"Bearer {self.config['access_token']}",
+            "X-Naver-Client-Id": self.config.get("client_id", ""),
+            "X-Naver-Client-Secret": self.config.get("client_secret", ""),
+            "Idempotency-Key": idempotency_key,
+        }
+        files = None
+        if image is not None and image.data is not None:
+            files = {"image": (image.filename, image.data, image.content_type)}
+
+        data = _request(
+            self.session, "POST", f"{self.base_url}/blog/writePost.json",
+            headers=headers, data={"title": title, "contents": to_html(content)}, files=files
+        )
+        result = data.get("message", {}).get("result", {})
+        if result.get("postUrl"):
+            return result["postUrl"]
+        log_no = result.get("logNo") or result.get("postId")
+        if not log_no:
+            raise PublishError(f"게시물 번호가 없는 응답: {data}")
+        return f"https://blog.naver.com/{self.config.get('blog_id', '')}/{log_no}"
+
+
+class BloggerClient(BlogClient):
+    """구글 Blogger API v3 (이미지는 공개 URL을 본문에 삽입)"""
+
+    platform = "google"
+    default_base_url = "https://www.googleapis.com/blogger/v3"
+    base_url_env = "BLOGGER_API_URL"
+    can_find_posts = True
+
+    def _auth(self) -> Dict[str, Any]:
+        if not self.config.get("access_token"):
+            raise PublishError("Blogger 발행에는 OAuth access_token이 필요합니다.")
+        headers = {"Authorization": f"Bearer {self.config['access_token']}"}
+        params = {"key": self.config["api_key"]} if self.config.get("api_key") else {}
+        return {"headers": headers, "params": params}
+
+    def create_post(self, title: str, content: str, image: Optional[SharedImage],
+                    idempotency_key: str) -> str:
+        auth = self._auth()
+        auth["headers"]["Idempotency-Key"] = idempotency_key
+        image_url = image.public_url if image is not None else None
+
+        data = _request(
+            self.session, "POST", f"{self.base_url}/blogs/{self.config['blog_id']}/posts/",
+            json={"kind": "blogger#post", "title": title, "content": to_html(content, image_url)},
+            **auth
+        )
+        if not data.get("url"):
+            raise PublishError(f"게시물 URL이 없는 응답: {data}")
+        return data["url"]
+
+    def find_post(self, title: str) -> Optional[str]:
+        auth = self._auth()
+        auth["params"].update({"q": title, "fetchBodies": "false"})
+        data = _request(
+            self.session, "GET",
+            f"{self.base_url}/blogs/{self.config['blog_id']}/posts/search", **auth
+        )
+        for item in data.get("items", []):
+            if item.get("title") == title:
+                return item.get("url")
+        return None
+
+
+# 플랫폼별 게시 클라이언트 (tistory는 공식 Open API가 종료되어 지원하지 않음)
+PUBLISHERS: Dict[str, Type[BlogClient]] = {
+    "naver": NaverBlogClient,
+    "google": BloggerClient,
+}
+
+
+_published: "OrderedDict[str, str]" = OrderedDict()
+_published_lock = threading.Lock()
+
+
+def idempotency_key(platform: str, config: Dict[str, Any], title: str, content: str) -> str:
+    """같은 블로그에 같은 글을 다시 보내는지 판별하는 키"""
+    source = "\x00".join([platform, str(config.get("blog_id", "")), title, content])
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]
+
+
+def _backoff(attempt: int, error: PublishError) -> float:
+    if error.retry_after is not None:
+        return min(error.retry_after, MAX_BACKOFF_SECONDS)
+    delay = BACKOFF_SECONDS * (2 ** attempt)
+    return min(delay + random.uniform(0, delay / 2), MAX_BACKOFF_SECONDS)
+
+
+def publish_with_retry(
+    client: BlogClient,
+    title: str,
+    content: str,
+    image: Optional[SharedImage] = None,
+    max_retries: int = MAX_RETRIES
+) -> str:
+    """
+    게시물을 발행하고 URL을 반환합니다 (같은 요청을 다시 보내도 한 번만 게시).
+
+    - 429/503, 연결 실패: 지수 백오프 후 재시도
+    - 응답 유실, 500/502/504: 같은 제목의 게시물이 있으면 그 URL을 반환하고,
+      확인할 수 없는 플랫폼이면 중복 게시를 막기 위해 재시도하지 않음
+
+    Raises:
+        PublishError: 재시도 후에도 실패한 경우
+    """
+    key = idempotency_key(client.platform, client.config, title, content)
+    with _published_lock:
+        if key in _published:
+            return _published[key]
+
+    last_error: Optional[PublishError] = None
+    for attempt in range(max_retries + 1):
+        if last_error is not None and last_error.ambiguous:
+            existing = client.find_post(title)
+            if existing:
+                url = existing
+                break
+
+        try:
+            url = client.create_post(title, content, image, key)
+            break
+        except PublishError as e:
+            last_error = e
+            can_retry = e.retryable and (not e.ambiguous or client.can_find_posts)
+            if not can_retry or attempt == max_retries:
+                raise
+            time.sleep(_backoff(attempt, e))
+
+    with _published_lock:
+        _published[key] = url
+        while len(_published) > MAX_PUBLISHED_RECORDS:
+            _published.popitem(last=False)
+    return url
+
+
+class PublishResult(NamedTuple):
+    """발행 결과"""
+    urls: Dict[str, str]    # {플랫폼: 게시물 URL}
+    errors: Dict[str, str]  # {플랫폼: 오류 메시지}
+
+
+def publish_all(
+    versions: List[ContentVersion],
+    title: str,
+    configs: Dict[str, Dict[str, Any]],
+    image: Optional[SharedImage] = None,
+    max_retries: int = MAX_RETRIES
+) -> PublishResult:
+    """
+    플랫폼별 콘텐츠를 각 플랫폼에 동시에 발행합니다.
+
+    Args:
+        versions: 발행할 플랫폼별 콘텐츠
+        title: 게시물 제목
+        configs: {플랫폼: 인증/블로그 설정} (설정이 없는 플랫폼은 오류로 기록)
+        image: 모든 플랫폼에 함께 첨부할 이미지
+        max_retries: 플랫폼별 최대 재시도 횟수
+
+    Returns:
+        PublishResult (성공한 플랫폼의 URL과 실패한 플랫폼의 오류)
+    """
+    urls: Dict[str, str] = {}
+    errors: Dict[str, str] = {}
+    clients: Dict[str, BlogClient] = {}
+
+    for version in versions:
+        client_class = PUBLISHERS.get(version.platform)
+        if client_class is None:
+            errors[version.platform] = "지원하지 않는 플랫폼입니다."
+        elif not configs.get(version.platform):
+            errors[version.platform] = "발행 설정이 없습니다."
+        else:
+            clients[version.platform] = client_class(configs[version.platform])
+
+    targets = [v for v in versions if v.platform in clients]
+    if not targets:
+        return PublishResult(urls, errors)
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        futures = {
+            v.platform: executor.submit(
+                publish_with_retry, clients[v.platform], title, v.content, image, max_retries
+            )
+            for v in targets
+        }
+        for platform, future in futures.items():
+            try:
+                urls[platform] = future.result()
+            except Exception as e:
+                errors[platform] = str(e)
+
+    return PublishResult(urls, errors)
+
+
+def publish_state(
+    state: WorkflowState,
+    configs: Dict[str, Dict[str, Any]],
+    image: Optional[SharedImage] = None
+) -> PublishResult:
+    """
+    워크플로우 상태의 콘텐츠를 모두 발행하고 published_urls에 게시물 URL을 기록합니다.
+    검수에서 불합격(review_passed=False)한 상태는 발행하지 않습니다.
+    """
+    if state.get("review_passed") is False:
+        raise ValueError("검수를 통과하지 못한 콘텐츠는 발행할 수 없습니다.")
+
+    topic = state.get("selected_topic")
+    if topic is None or not state.get("content_versions"):
+        raise ValueError("발행할 콘텐츠가 없습니다.")
+
+    result = publish_all(state["content_versions"], topic.title, configs, image)
+    state["published_urls"] = list(result.urls.values())
+    return result
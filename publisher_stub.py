@@ -0,0 +1,229 @@
+"""
+로컬 발행 스텁 서버
+네이버 블로그 글쓰기 API와 Blogger API v3의 게시 엔드포인트를 흉내 내어
+실제 계정 없이 publisher 모듈의 동시 발행, 재시도, 중복 게시 방지를 확인합니다.
+
+사용법:
+    python publisher_stub.py --port 8765
+    NAVER_BLOG_API_URL=http://127.0.0.1:8765 BLOGGER_API_URL=http://127.0.0.1:8765 python app.py
+
+코드에서:
+    server = start_stub_server()
+    client = BloggerClient(config, base_url=server.base_url)
+    server.fail_next(2, status=503)     # 다음 요청 2개를 503으로 실패
+    server.lose_responses(1)            # 다음 게시 1건은 저장한 뒤 500 응답 (응답 유실 재현)
+"""
+import argparse
+import email.parser
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class StubPublisherServer(ThreadingHTTPServer):
+    """게시물을 메모리에 저장하는 스텁 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = ("127.0.0.1", 0), latency: float = 0.0):
+        """
+        Args:
+            address: (호스트, 포트) (포트 0이면 빈 포트 자동 선택)
+            latency: 요청마다 추가할 응답 지연(초)
+        """
+        super().__init__(address, _StubHandler)
+        self.latency = latency
+        self.posts: List[Dict[str, Any]] = []
+        self.requests_total = 0
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._failures: List[int] = []
+        self._lost_responses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, count: int = 1, status: int = 503) -> None:
+        """다음 요청 count개를 status로 실패 (게시물은 저장하지 않음)"""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def lose_responses(self, count: int = 1) -> None:
+        """다음 게시 count건은 저장한 뒤 500으로 응답 (클라이언트는 결과를 모름)"""
+        with self._lock:
+            self._lost_responses += count
+
+    def _next_failure(self) -> Optional[int]:
+        with self._lock:
+            self.requests_total += 1
+            return self._failures.pop(0) if self._failures else None
+
+    def create_post(self, platform: str, blog_id: str, title: str, content: str,
+                    key: Optional[str], image: Optional[bytes]) -> Tuple[Dict[str, Any], bool]:
+        """
+        게시물 저장 (같은 Idempotency-Key면 기존 게시물 반환)
+
+        Returns:
+            (게시물, 응답을 유실시킬지 여부)
+        """
+        with self._lock:
+            if key and key in self._by_key:
+                return self._by_key[key], False
+
+            post_id = next(self._ids)
+            post = {
+                "id": str(post_id),
+                "platform": platform,
+                "blog_id": blog_id,
+                "title": title,
+                "content": content,
+                "image_size": len(image) if image else 0,
+                "url": f"{self.base_url}/{platform}/{blog_id}/{post_id}",
+            }
+            self.posts.append(post)
+            if key:
+                self._by_key[key] = post
+
+            lost = self._lost_responses > 0
+            if lost:
+                self._lost_responses -= 1
+            return post, lost
+
+    def search(self, blog_id: str, query: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                p for p in self.posts
+                if p["platform"] == "google" and p["blog_id"] == blog_id and query in p["title"]
+            ]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: StubPublisherServer
+    protocol_version = "HTTP/1.1"  # 연결 유지 (클라이언트 연결 풀 재사용 확인용)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _begin(self) -> bool:
+        """지연/실패 주입 처리 (실패를 응답했으면 False)"""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        status = self.server._next_failure()
+        if status is not None:
+            self._send(status, {"error": f"주입된 실패 ({status})"})
+            return False
+        return True
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if not self._begin():
+            return
+
+        # /blogs/{blog_id}/posts/search?q=
+        if len(parts) == 4 and parts[0] == "blogs" and parts[2:] == ["posts", "search"]:
+            query = parse_qs(url.query).get("q", [""])[0]
+            items = [
+                {"id": p["id"], "title": p["title"], "url": p["url"]}
+                for p in self.server.search(parts[1], query)
+            ]
+            self._send(200, {"kind": "blogger#postList", "items": items})
+            return
+
+        self._send(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        body = self._read_body()
+        if not self._begin():
+            return
+
+        key = self.headers.get("Idempotency-Key")
+
+        if url.path == "/blog/writePost.json":
+            fields = self._parse_form(body)
+            post, lost = self.server.create_post(
+                "naver", "stub", fields.get("title", b"").decode("utf-8"),
+                fields.get("contents", b"").decode("utf-8"), key, fields.get("image")
+            )
+            if lost:
+                self._send(500, {"error": "응답 유실 재현"})
+                return
+            self._send(200, {"message": {"result": {"logNo": post["id"], "postUrl": post["url"]}}})
+            return
+
+        # /blogs/{blog_id}/posts/
+        if len(parts) == 3 and parts[0] == "blogs" and parts[2] == "posts":
+            data = json.loads(body or b"{}")
+            post, lost = self.server.create_post(
+                "google", parts[1], data.get("title", ""), data.get("content", ""), key, None
+            )
+            if lost:
+                self._send(500, {"error": "응답 유실 재현"})
+                return
+            self._send(200, {"kind": "blogger#post", "id": post["id"], "url": post["url"]})
+            return
+
+        self._send(404, {"error": "not found"})
+
+    def _parse_form(self, body: bytes) -> Dict[str, bytes]:
+        """multipart/form-data 또는 urlencoded 본문을 {필드: 값}으로 변환"""
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            message = email.parser.BytesParser().parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + body
+            )
+            return {
+                part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+                for part in message.get_payload()
+            }
+        return {
+            name: values[0].encode("utf-8")
+            for name, values in parse_qs(body.decode("utf-8")).items()
+        }
+
+
+def start_stub_server(port: int = 0, latency: float = 0.0) -> StubPublisherServer:
+    """스텁 서버를 백그라운드 스레드에서 시작 (server.shutdown()으로 종료)"""
+    server = StubPublisherServer(("127.0.0.1", port), latency=latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 발행 스텁 서버")
+    parser.add_argument("--port", type=int, default=8765, help="포트 (기본값: 8765)")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    args = parser.parse_args()
+
+    server = StubPublisherServer(("127.0.0.1", args.port), latency=args.latency)
+    print(f"🧪 발행 스텁 서버: {server.base_url}")
+    print(f"   NAVER_BLOG_API_URL={server.base_url} BLOGGER_API_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""
+프로바이더별 요청 속도 제한
+여러 작업이 동시에 LLM을 호출할 때 프로바이더별 분당 요청 수/토큰 수를 넘지 않도록
+토큰 버킷 방식으로 호출을 지연시키고, 동시 요청 수를 AIMD 방식으로 조절합니다.
+(429/과부하 응답 시 절반으로 줄이고, 정상 응답이 이어지면 1씩 늘리며, 그 밖의 오류는 유지)
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+DEFAULT_INITIAL_CONCURRENCY = 4
+DEFAULT_MAX_CONCURRENCY = 16
+OVERLOAD_MARKERS = ("429", "rate limit", "rate_limit", "overloaded", "resource_exhausted",
+                    "too many requests", "quota")
+
+
+class TokenBucket:
+    """스레드 안전한 토큰 버킷"""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: 분당 충전되는 토큰 수
+            burst: 버킷 최대 용량 (기본값: 분당 토큰 수의 1/6, 최소 1)
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute는 0보다 커야 합니다.")
+
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, rate_per_minute / 6)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+        self._updated_at = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        토큰을 사용할 수 있을 때까지 대기한 뒤 차감합니다.
+
+        Returns:
+            대기한 시간(초)
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                wait = (amount - self._tokens) / self.rate_per_second
+
+            time.sleep(wait)
+            waited += wait
+
+    def adjust(self, amount: float) -> None:
+        """
+        잔량을 보정합니다 (예상 사용량과 실제 사용량의 차이 반영).
+        양수면 차감, 음수면 환급하며 잔량이 음수가 되면 이후 요청이 그만큼 대기합니다.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class AdaptiveConcurrency:
+    """AIMD 방식으로 동시 요청 수 한도를 조절하는 세마포어"""
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0
+    ):
+        """
+        Args:
+            initial: 시작 동시 요청 수 한도
+            min_limit: 최소 한도
+            max_limit: 최대 한도
+            decrease_factor: 과부하 시 한도에 곱할 값
+            cooldown: 연속 과부하 응답에 한도를 한 번만 줄이기 위한 최소 간격(초)
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> float:
+        """한도 안에 자리가 날 때까지 대기 (대기한 시간(초) 반환)"""
+        started = time.monotonic()
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+        return time.monotonic() - started
+
+    def release(self, overloaded: bool = False, succeeded: bool = True) -> None:
+        """
+        요청 완료 처리
+        - 정상: 한도 1/limit 증가 (한도만큼 성공하면 1 증가)
+        - 과부하: 한도를 decrease_factor배로 감소
+        - 그 밖의 오류 (인증, 잘못된 요청, 응답 파싱 등): 한도 유지
+        """
+        with self._condition:
+            self._in_flight -= 1
+            now = time.monotonic()
+
+            if overloaded:
+                if now - self._last_decrease >= self.cooldown:
+                    self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                    self._last_decrease = now
+            elif succeeded:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+            self._condition.notify_all()
+
+    def set_max(self, max_limit: int) -> None:
+        with self._condition:
+            self.max_limit = max(self.min_limit, max_limit)
+            self._limit = min(self._limit, self.max_limit)
+            self._condition.notify_all()
+
+
+class ProviderLimiter:
+    """프로바이더 하나의 요청 수/토큰 수/동시 요청 수 제한"""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrency(
+            initial=min(DEFAULT_INITIAL_CONCURRENCY, max_concurrency),
+            max_limit=max_concurrency
+        )
+
+        self._stats_lock = threading.Lock()
+        self.requests_total = 0
+        self.overloads_total = 0
+        self.tokens_total = 0
+        self.wait_seconds_total = 0.0
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """요청 전 대기 (요청 수 → 토큰 수 → 동시 요청 수 순서)"""
+        waited = 0.0
+        if self.requests is not None:
+            waited += self.requests.acquire()
+        if self.tokens is not None and estimated_tokens:
+            waited += self.tokens.acquire(estimated_tokens)
+        waited += self.concurrency.acquire()
+
+        with self._stats_lock:
+            self.requests_total += 1
+            self.wait_seconds_total += waited
+        return waited
+
+    def release(self, overloaded: bool = False, estimated_tokens: int = 0,
+                used_tokens: Optional[int] = None, succeeded: bool = True) -> None:
+        """요청 완료 후 동시 요청 수 한도와 토큰 사용량 반영 (succeeded: 예외 없이 끝났는지)"""
+        self.concurrency.release(overloaded, succeeded)
+
+        if used_tokens is not None:
+            if self.tokens is not None:
+                self.tokens.adjust(used_tokens - estimated_tokens)
+            with self._stats_lock:
+                self.tokens_total += used_tokens
+
+        if overloaded:
+            with self._stats_lock:
+                self.overloads_total += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "concurrency_limit": self.concurrency.limit,
+                "concurrency_max": self.concurrency.max_limit,
+                "in_flight": self.concurrency.in_flight,
+                "requests_total": self.requests_total,
+                "overloads_total": self.overloads_total,
+                "tokens_total": self.tokens_total,
+                "wait_seconds_total": round(self.wait_seconds_total, 3),
+            }
+
+
+class Permit:
+    """call()이 돌려주는 요청 핸들 (대기 시간 조회, 실제 토큰 사용량 기록용)"""
+
+    def __init__(self, estimated_tokens: int, waited: float = 0.0):
+        self.estimated_tokens = estimated_tokens
+        self.waited = waited
+        self.used_tokens: Optional[int] = None
+
+    def record_usage(self, total_tokens: Optional[int]) -> None:
+        if total_tokens is not None:
+            self.used_tokens = int(total_tokens)
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """프로바이더 제한기 조회 (없으면 기본값으로 생성: 속도 제한 없음, 동시 요청 수만 조절)"""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = ProviderLimiter()
+            _limiters[provider] = limiter
+        return limiter
+
+
+def configure_rate_limit(
+    provider: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    max_concurrency: Optional[int] = None
+) -> None:
+    """
+    프로바이더의 요청 제한을 설정합니다 (기존 설정과 통계는 초기화).
+
+    Args:
+        provider: 프로바이더 이름 ("gemini", "claude", "gpt")
+        requests_per_minute: 분당 최대 요청 수 (None이면 제한 없음)
+        tokens_per_minute: 분당 최대 토큰 수 (None이면 제한 없음)
+        max_concurrency: 최대 동시 요청 수 (AIMD로 이 값 안에서 조절)
+    """
+    with _limiters_lock:
+        _limiters[provider] = ProviderLimiter(
+            requests_per_minute,
+            tokens_per_minute,
+            max_concurrency or DEFAULT_MAX_CONCURRENCY
+        )
+
+
+def set_max_concurrency(provider: str, max_concurrency: int) -> None:
+    """다른 설정은 유지하고 프로바이더의 최대 동시 요청 수만 변경"""
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency는 1 이상이어야 합니다.")
+    get_limiter(provider).concurrency.set_max(max_concurrency)
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """429(rate limit)/529(overloaded)/503 등 속도를 줄여야 하는 오류인지 판단"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status in (429, 503, 529):
+        return True
+
+    message = str(error).lower()
+    return any(marker in message for marker in OVERLOAD_MARKERS)
+
+
+@contextmanager
+def call(provider: str, estimated_tokens: int = 0) -> Iterator[Permit]:
+    """
+    LLM 호출을 프로바이더 제한 안에서 실행합니다.
+
+    사용 예:
+        with rate_limit.call("claude", estimated_tokens=2000) as permit:
+            response = llm.invoke(messages)
+            permit.record_usage(response.usage_metadata["total_tokens"])
+
+    과부하 오류가 발생하면 동시 요청 수 한도를 줄이고 예외를 그대로 전달합니다.
+    한도는 예외 없이 끝난 호출에서만 늘어나며, 그 밖의 오류는 한도를 바꾸지 않습니다.
+    """
+    limiter = get_limiter(provider)
+    waited = limiter.acquire(estimated_tokens)
+    permit = Permit(estimated_tokens, waited)
+    overloaded = False
+    succeeded = False
+
+    try:
+        yield permit
+        succeeded = True
+    except BaseException as e:
+        overloaded = is_overload_error(e)
+        raise
+    finally:
+        limiter.release(overloaded, estimated_tokens, permit.used_tokens, succeeded)
+
+
+def metrics() -> Dict[str, Dict[str, Any]]:
+    """프로바이더별 현재 제한값과 누적 통계"""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.metrics() for provider, limiter in limiters.items()}
+
+
+def configure_rate_limits_from_env() -> None:
+    """
+    환경 변수로 프로바이더별 제한을 설정합니다 (설정된 프로바이더만 변경).
+
+    - {PROVIDER}_RPM: 분당 최대 요청 수 (예: GEMINI_RPM=60)
+    - {PROVIDER}_TPM: 분당 최대 토큰 수 (예: CLAUDE_TPM=80000)
+    - {PROVIDER}_MAX_CONCURRENCY: 최대 동시 요청 수 (예: GPT_MAX_CONCURRENCY=8)
+
+    PROVIDER는 llm_pool에 등록된 프로바이더 이름의 대문자입니다 (local, entry point 프로바이더 포함).
+    """
+    from llm_pool import provider_names
+
+    for provider in provider_names():
+        prefix = provider.upper()
+        rpm = os.getenv(f"{prefix}_RPM")
+        tpm = os.getenv(f"{prefix}_TPM")
+        max_concurrency = os.getenv(f"{prefix}_MAX_CONCURRENCY")
+
+        if rpm or tpm or max_concurrency:
+            configure_rate_limit(
+                provider,
+                requests_per_minute=float(rpm) if rpm else None,
+                tokens_per_minute=float(tpm) if tpm else None,
+                max_concurrency=int(max_concurrency) if max_concurrency else None
+            )
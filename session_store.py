@@ -0,0 +1,234 @@
+"""
+서버 측 세션 저장소
+워크플로우 상태(주제 목록, 플랫폼별 글, 검수 결과 등)를 서버에 압축 저장하고
+쿠키에는 서명된 세션 ID만 담아 4KB 쿠키 한도를 넘지 않도록 합니다.
+"""
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import warnings
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+from flask.sessions import SessionInterface, SessionMixin, session_json_serializer
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+
+class MemorySessionBackend:
+    """프로세스 메모리 기반 LRU 세션 백엔드 (단일 프로세스용)"""
+
+    def __init__(self, max_sessions: int = 10_000):
+        self.max_sessions = max_sessions
+        self._data: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, sid: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                return None
+            if entry[1] < time.time():
+                del self._data[sid]
+                return None
+            self._data.move_to_end(sid)
+            return entry[0]
+
+    def save(self, sid: str, payload: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._data[sid] = (payload, expires_at)
+            self._data.move_to_end(sid)
+            while len(self._data) > self.max_sessions:
+                self._data.popitem(last=False)
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._data.pop(sid, None)
+
+
+class SQLiteSessionBackend:
+    """SQLite 파일 기반 세션 백엔드 (여러 워커 프로세스가 공유 가능)"""
+
+    def __init__(self, path: str = "sessions.sqlite3", purge_every: int = 100):
+        self.path = path
+        self.purge_every = purge_every
+        self._lock = threading.Lock()
+        self._saves = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS sessions (
+                sid TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)"
+        )
+        self._conn.commit()
+
+    def load(self, sid: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM sessions WHERE sid = ? AND expires_at >= ?",
+                (sid, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def save(self, sid: str, payload: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                (sid, payload, expires_at)
+            )
+            # 만료된 세션은 일정 횟수의 저장마다 한 번씩 정리
+            self._saves += 1
+            if self._saves % self.purge_every == 0:
+                self._conn.execute(
+                    "DELETE FROM sessions WHERE expires_at < ?", (time.time(),)
+                )
+            self._conn.commit()
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+            self._conn.commit()
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """서버에 저장되는 세션 (값이 바뀌면 modified 표시)"""
+
+    def __init__(self, initial=None, sid: str = "", new: bool = False):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """쿠키에는 서명된 세션 ID만 저장하는 Flask 세션 인터페이스"""
+
+    serializer = session_json_serializer
+
+    def __init__(self, backend, ttl: float = 24 * 60 * 60, compress_level: int = 6):
+        """
+        Args:
+            backend: 세션 백엔드 (MemorySessionBackend 또는 SQLiteSessionBackend)
+            ttl: 세션 유효 시간(초), 마지막 저장 이후 기준
+            compress_level: zlib 압축 레벨 (0~9)
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.compress_level = compress_level
+
+    def _get_signer(self, app) -> Optional[Signer]:
+        if not app.secret_key:
+            return None
+        return Signer(app.secret_key, salt="server-side-session")
+
+    def open_session(self, app, request):
+        signer = self._get_signer(app)
+        if signer is None:
+            return None
+
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = signer.unsign(cookie).decode("utf-8")
+            except BadSignature:
+                sid = None
+
+            if sid:
+                payload = self.backend.load(sid)
+                if payload is not None:
+                    data = self.serializer.loads(zlib.decompress(payload).decode("utf-8"))
+                    return ServerSideSession(data, sid=sid)
+
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        # 비어 있는 세션은 저장하지 않고, 기존 세션이 비워졌으면 삭제
+        if not session:
+            if session.modified:
+                self.backend.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified or session.new:
+            payload = zlib.compress(
+                self.serializer.dumps(dict(session)).encode("utf-8"),
+                self.compress_level
+            )
+            self.backend.save(session.sid, payload, time.time() + self.ttl)
+
+        if session.new or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name,
+                self._get_signer(app).sign(session.sid).decode("utf-8"),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app)
+            )
+
+
+def _backend_name_from_env() -> str:
+    return os.getenv("SESSION_BACKEND", "sqlite").strip().lower()
+
+
+def get_secret_key_from_env() -> bytes:
+    """
+    세션 ID 서명 키 (FLASK_SECRET_KEY)
+    sqlite 백엔드를 여러 워커 프로세스가 공유하려면 모든 워커가 같은 키로 서명해야 하므로,
+    키가 없으면 경고 후 프로세스별 임시 키를 사용합니다 (다른 워커가 발급한 세션은 새 세션이 됨).
+    """
+    key = os.getenv("FLASK_SECRET_KEY", "").strip()
+    if key:
+        return key.encode("utf-8")
+
+    if _backend_name_from_env() == "sqlite":
+        warnings.warn(
+            "FLASK_SECRET_KEY가 설정되지 않아 프로세스마다 다른 임시 키로 세션 ID를 서명합니다. "
+            "여러 워커가 세션을 공유하거나 재시작 후에도 세션을 유지하려면 FLASK_SECRET_KEY를 설정하세요.",
+            RuntimeWarning,
+            stacklevel=2
+        )
+    return os.urandom(24)
+
+
+def create_session_interface_from_env() -> ServerSideSessionInterface:
+    """
+    환경 변수로 세션 인터페이스를 생성합니다.
+
+    - SESSION_BACKEND: "sqlite" 또는 "memory" (기본값: sqlite)
+    - SESSION_STORE_PATH: SQLite 파일 경로 (기본값: sessions.sqlite3)
+    - SESSION_TTL: 세션 유효 시간(초) (기본값: 86400)
+    """
+    backend_name = _backend_name_from_env()
+    if backend_name == "sqlite":
+        backend = SQLiteSessionBackend(os.getenv("SESSION_STORE_PATH", "sessions.sqlite3"))
+    elif backend_name == "memory":
+        backend = MemorySessionBackend()
+    else:
+        raise ValueError(f"지원하지 않는 세션 백엔드: {backend_name}")
+
+    return ServerSideSessionInterface(
+        backend, ttl=float(os.getenv("SESSION_TTL", 24 * 60 * 60))
+    )
@@ -0,0 +1,472 @@
+"""
+워크플로우 계측
+그래프 노드와 LLM 호출마다 실행 시간, 속도 제한 대기 시간, 프롬프트/응답 토큰 수,
+재시도(실패한 호출) 수, 예상 비용을 기록하여 JSON 로그와 Prometheus 형식 지표로 내보냅니다.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import rate_limit
+
+logger = logging.getLogger("telemetry")
+
+# 모델별 토큰 단가 (USD / 1M 토큰, (입력, 출력)) - 모델 이름에 포함된 가장 긴 키로 찾음
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-5-haiku": (0.80, 4.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+# 프롬프트 캐시에서 읽은 입력 토큰의 단가 비율 (모델 이름에 포함된 키로 찾음)
+CACHE_READ_PRICE_RATIOS: Dict[str, float] = {
+    "claude": 0.10,
+    "gpt": 0.50,
+    "gemini": 0.25,
+}
+
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# 0~1 점수용 버킷
+SCORE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+METRIC_HELP = {
+    "workflow_node_runs_total": ("counter", "노드 실행 횟수"),
+    "workflow_node_duration_seconds": ("histogram", "노드 실행 시간(초)"),
+    "llm_requests_total": ("counter", "LLM 호출 횟수 (status: ok, error, cached)"),
+    "llm_request_duration_seconds": ("histogram", "LLM 호출 시간(초, 대기 시간 제외)"),
+    "llm_queue_wait_seconds_total": ("counter", "속도 제한으로 대기한 시간(초)"),
+    "llm_tokens_total": ("counter", "LLM 토큰 사용량 (type: prompt, completion, cache_read)"),
+    "llm_cost_usd_total": ("counter", "LLM 예상 비용(USD)"),
+    "llm_cache_savings_usd_total": ("counter", "프롬프트 캐시로 절감한 예상 비용(USD)"),
+    "llm_json_parse_total": ("counter", "JSON 응답 파싱 결과 (result: parsed, repaired, fallback)"),
+    "llm_concurrency_limit": ("gauge", "프로바이더별 현재 동시 요청 수 한도"),
+    "llm_in_flight": ("gauge", "프로바이더별 진행 중인 요청 수"),
+    "topic_index_checks_total": ("counter", "작성 주제 색인으로 확인한 추천 주제 수 (result: new, duplicate)"),
+    "topic_selection_score": ("histogram", "선택한 주제의 점수 (0~1)"),
+    "topic_selection_reordered_total": ("counter", "첫 번째 추천이 아닌 주제를 선택한 횟수"),
+}
+
+# 히스토그램별 버킷 (없으면 DURATION_BUCKETS)
+METRIC_BUCKETS: Dict[str, Tuple[float, ...]] = {
+    "topic_selection_score": SCORE_BUCKETS,
+}
+
+
+def set_model_price(model: str, input_per_million: float, output_per_million: float) -> None:
+    """모델 단가 등록/변경 (USD / 1M 토큰)"""
+    MODEL_PRICES[model] = (input_per_million, output_per_million)
+
+
+class TokenUsage(NamedTuple):
+    """LLM 호출 하나의 토큰 사용량 (prompt에는 cache_read가 포함됨)"""
+    prompt: int = 0
+    completion: int = 0
+    cache_read: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.prompt + self.completion
+
+    def merge(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(
+            self.prompt + other.prompt,
+            self.completion + other.completion,
+            self.cache_read + other.cache_read
+        )
+
+
+def _lookup(table: Dict[str, Any], model: str) -> Any:
+    """모델 이름에 포함된 가장 긴 키의 값 (없으면 None)"""
+    matches = [key for key in table if key in (model or "")]
+    return table[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(model: str, usage: TokenUsage) -> Tuple[float, float]:
+    """
+    토큰 사용량으로 예상 비용과 프롬프트 캐시 절감액(USD) 계산 (단가를 모르는 모델은 0)
+
+    Returns:
+        (예상 비용, 캐시 절감액)
+    """
+    prices = _lookup(MODEL_PRICES, model)
+    if prices is None:
+        return 0.0, 0.0
+
+    input_price, output_price = prices
+    ratio = _lookup(CACHE_READ_PRICE_RATIOS, model)
+    ratio = 1.0 if ratio is None else ratio
+
+    uncached = usage.prompt - usage.cache_read
+    cost = (
+        uncached * input_price
+        + usage.cache_read * input_price * ratio
+        + usage.completion * output_price
+    ) / 1_000_000
+    saved = usage.cache_read * input_price * (1 - ratio) / 1_000_000
+    return cost, saved
+
+
+def model_name(llm: Any) -> str:
+    """채팅 모델 인스턴스의 모델 이름"""
+    return str(getattr(llm, "model", None) or getattr(llm, "model_name", None) or "unknown")
+
+
+def extract_usage(message: Any) -> Optional[TokenUsage]:
+    """
+    응답(또는 스트리밍 청크)에서 토큰 사용량 추출
+    usage_metadata가 없으면 프로바이더별 response_metadata를 확인합니다.
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        details = usage.get("input_token_details") or {}
+        return TokenUsage(
+            int(usage.get("input_tokens", 0)),
+            int(usage.get("output_tokens", 0)),
+            int(details.get("cache_read") or 0)
+        )
+
+    metadata = getattr(message, "response_metadata", None) or {}
+    if metadata.get("token_usage"):  # OpenAI
+        token_usage = metadata["token_usage"]
+        details = token_usage.get("prompt_tokens_details") or {}
+        return TokenUsage(
+            int(token_usage.get("prompt_tokens", 0)),
+            int(token_usage.get("completion_tokens", 0)),
+            int(details.get("cached_tokens") or 0)
+        )
+    if metadata.get("usage"):  # Anthropic (input_tokens에는 캐시 토큰이 빠져 있음)
+        token_usage = metadata["usage"]
+        cache_read = int(token_usage.get("cache_read_input_tokens") or 0)
+        cache_creation = int(token_usage.get("cache_creation_input_tokens") or 0)
+        return TokenUsage(
+            int(token_usage.get("input_tokens", 0)) + cache_read + cache_creation,
+            int(token_usage.get("output_tokens", 0)),
+            cache_read
+        )
+    return None
+
+
+class MetricsRegistry:
+    """Prometheus 텍스트 형식으로 내보내는 스레드 안전한 카운터/히스토그램 저장소"""
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """히스토그램 관측값 추가 (버킷별 개수, 합계, 개수)"""
+        key = self._key(name, labels)
+        buckets = METRIC_BUCKETS.get(name, DURATION_BUCKETS)
+        with self._lock:
+            row = self._histograms.get(key)
+            if row is None:
+                row = [0.0] * (len(buckets) + 2)
+                self._histograms[key] = row
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _format_labels(labels: Tuple[Tuple[str, str], ...], **extra: str) -> str:
+        pairs = list(labels) + list(extra.items())
+        if not pairs:
+            return ""
+        escaped = (v.replace("\\", "\\\\").replace('"', '\\"') for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+    def render(self, gauges: Optional[Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]] = None) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(row) for key, row in self._histograms.items()}
+        counters.update(gauges or {})
+
+        lines: List[str] = []
+        for name, (kind, help_text) in METRIC_HELP.items():
+            counter_rows = sorted((k, v) for k, v in counters.items() if k[0] == name)
+            histogram_rows = sorted((k, v) for k, v in histograms.items() if k[0] == name)
+            if not counter_rows and not histogram_rows:
+                continue
+
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (_, labels), value in counter_rows:
+                lines.append(f"{name}{self._format_labels(labels)} {value:g}")
+            buckets = METRIC_BUCKETS.get(name, DURATION_BUCKETS)
+            for (_, labels), row in histogram_rows:
+                for bound, count in zip(buckets, row):
+                    lines.append(f"{name}_bucket{self._format_labels(labels, le=f'{bound:g}')} {count:g}")
+                lines.append(f"{name}_bucket{self._format_labels(labels, le='+Inf')} {row[-1]:g}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {row[-2]:.6f}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {row[-1]:g}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class Span:
+    """노드(또는 워크플로우 실행 전체) 하나의 누적 계측값"""
+
+    def __init__(self, name: str, kind: str = "node", parent: Optional["Span"] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.attributes = attributes or {}
+        self.started_at = time.time()
+        self.llm_calls = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cache_read_tokens = 0
+        self.cost_usd = 0.0
+        self.cache_savings_usd = 0.0
+        self.queue_wait_seconds = 0.0
+        self.llm_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, calls: int = 0, cache_hits: int = 0, retries: int = 0,
+            prompt_tokens: int = 0, completion_tokens: int = 0, cache_read_tokens: int = 0,
+            cost_usd: float = 0.0, cache_savings_usd: float = 0.0,
+            queue_wait_seconds: float = 0.0, llm_seconds: float = 0.0) -> None:
+        with self._lock:
+            self.llm_calls += calls
+            self.cache_hits += cache_hits
+            self.retries += retries
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cache_read_tokens += cache_read_tokens
+            self.cost_usd += cost_usd
+            self.cache_savings_usd += cache_savings_usd
+            self.queue_wait_seconds += queue_wait_seconds
+            self.llm_seconds += llm_seconds
+
+    def totals(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.llm_calls,
+                "cache_hits": self.cache_hits,
+                "retries": self.retries,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "cache_read_tokens": self.cache_read_tokens,
+                "cost_usd": self.cost_usd,
+                "cache_savings_usd": self.cache_savings_usd,
+                "queue_wait_seconds": self.queue_wait_seconds,
+                "llm_seconds": self.llm_seconds,
+            }
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "telemetry_span", default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_tokens() -> int:
+    """현재 계측 범위에서 지금까지 사용한 토큰 수 (프롬프트 + 응답, 범위 밖이면 0)"""
+    current = _current_span.get()
+    if current is None:
+        return 0
+    totals = current.totals()
+    return totals["prompt_tokens"] + totals["completion_tokens"]
+
+
+def bind(fn: Callable) -> Callable:
+    """
+    현재 계측 범위를 유지한 채 다른 스레드에서 실행할 함수로 감쌉니다.
+    (ThreadPoolExecutor는 contextvars를 전달하지 않으므로 submit할 때마다 호출)
+    """
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+def _log(event: Dict[str, Any]) -> None:
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(event, ensure_ascii=False, default=str))
+
+
+@contextmanager
+def span(name: str, kind: str = "node", **attributes: Any) -> Iterator[Span]:
+    """
+    계측 범위를 엽니다. 범위 안의 LLM 호출은 이 범위에 집계되고,
+    범위가 끝나면 상위 범위에 합산한 뒤 JSON 로그를 남깁니다.
+
+    Args:
+        name: 노드 이름 (kind가 "workflow"면 워크플로우 이름)
+        kind: "node" 또는 "workflow"
+        **attributes: 로그에 함께 남길 값 (thread_id, business_type 등)
+    """
+    current = Span(name, kind, parent=_current_span.get(), attributes=attributes)
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    status = "ok"
+
+    try:
+        yield current
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        _current_span.reset(token)
+        duration = time.perf_counter() - started
+        totals = current.totals()
+
+        if current.parent is not None:
+            current.parent.add(**totals)
+
+        if kind == "node":
+            registry.inc("workflow_node_runs_total", node=name, status=status)
+            registry.observe("workflow_node_duration_seconds", duration, node=name)
+
+        _log({
+            "event": kind,
+            "name": name,
+            "status": status,
+            "duration_seconds": round(duration, 4),
+            **{k: round(v, 6) if isinstance(v, float) else v for k, v in totals.items()},
+            **attributes,
+        })
+
+
+def record_llm_call(
+    provider: str,
+    model: str,
+    duration: float,
+    queue_wait: float = 0.0,
+    usage: Optional[TokenUsage] = None,
+    cached: bool = False,
+    error: Optional[BaseException] = None
+) -> None:
+    """
+    LLM 호출 하나를 현재 범위와 지표에 기록합니다.
+
+    Args:
+        provider: 프로바이더 이름
+        model: 모델 이름
+        duration: 호출 시간(초, 속도 제한 대기 제외)
+        queue_wait: 속도 제한으로 대기한 시간(초)
+        usage: 토큰 사용량 (프롬프트 캐시에서 읽은 토큰 포함)
+        cached: 응답 캐시 적중 여부
+        error: 호출 실패 시 예외 (실패한 호출은 재시도 수로 집계)
+    """
+    usage = usage or TokenUsage()
+    cost, saved = (0.0, 0.0) if cached else estimate_cost(model, usage)
+    status = "cached" if cached else ("error" if error is not None else "ok")
+
+    current = _current_span.get()
+    node = current.name if current is not None and current.kind == "node" else "none"
+
+    if current is not None:
+        current.add(
+            calls=1, cache_hits=int(cached), retries=int(error is not None),
+            prompt_tokens=usage.prompt, completion_tokens=usage.completion,
+            cache_read_tokens=usage.cache_read, cost_usd=cost, cache_savings_usd=saved,
+            queue_wait_seconds=queue_wait, llm_seconds=duration
+        )
+
+    labels = {"node": node, "provider": provider, "model": model}
+    registry.inc("llm_requests_total", status=status, **labels)
+    if cached:
+        return
+
+    registry.observe("llm_request_duration_seconds", duration, provider=provider, model=model)
+    if queue_wait:
+        registry.inc("llm_queue_wait_seconds_total", queue_wait, **labels)
+    if usage.prompt:
+        registry.inc("llm_tokens_total", usage.prompt, type="prompt", **labels)
+    if usage.completion:
+        registry.inc("llm_tokens_total", usage.completion, type="completion", **labels)
+    if usage.cache_read:
+        registry.inc("llm_tokens_total", usage.cache_read, type="cache_read", **labels)
+    if cost:
+        registry.inc("llm_cost_usd_total", cost, **labels)
+    if saved:
+        registry.inc("llm_cache_savings_usd_total", saved, **labels)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(json.dumps({
+            "event": "llm_call", "status": status, "duration_seconds": round(duration, 4),
+            "queue_wait_seconds": round(queue_wait, 4), "prompt_tokens": usage.prompt,
+            "completion_tokens": usage.completion, "cache_read_tokens": usage.cache_read,
+            "cost_usd": round(cost, 6), "cache_savings_usd": round(saved, 6),
+            "error": str(error) if error is not None else None, **labels,
+        }, ensure_ascii=False))
+
+
+def instrumented(name: str, fn: Callable) -> Callable:
+    """
+    그래프 노드 함수를 계측 범위로 감쌉니다.
+    실행 설정의 thread_id와 상태의 business_type을 로그에 함께 남깁니다.
+    """
+    accepts_config = "config" in inspect.signature(fn).parameters
+
+    # checkpointed와 같은 이유로 functools.wraps 대신 이름만 복사
+    def wrapper(state, config=None) -> Any:
+        configurable = (config or {}).get("configurable", {})
+        with span(name, thread_id=configurable.get("thread_id"),
+                  business_type=state.get("business_type")):
+            return fn(state, config=config) if accepts_config else fn(state)
+
+    wrapper.__name__ = getattr(fn, "__name__", name)
+    return wrapper
+
+
+def render_metrics() -> str:
+    """Prometheus 텍스트 형식 지표 (속도 제한 상태 포함)"""
+    gauges = {}
+    for provider, stats in rate_limit.metrics().items():
+        labels = (("provider", provider),)
+        gauges[("llm_concurrency_limit", labels)] = float(stats["concurrency_limit"])
+        gauges[("llm_in_flight", labels)] = float(stats["in_flight"])
+    return registry.render(gauges)
+
+
+def configure_logging_from_env() -> None:
+    """
+    환경 변수로 JSON 계측 로그 출력을 설정합니다.
+
+    - TELEMETRY_LOG: 로그 파일 경로 또는 "stderr" (없으면 출력하지 않음)
+    - TELEMETRY_LOG_LEVEL: "INFO"(노드/워크플로우 단위) 또는 "DEBUG"(LLM 호출 단위 포함)
+    """
+    target = os.getenv("TELEMETRY_LOG")
+    if not target or logger.handlers:
+        return
+
+    handler = logging.StreamHandler() if target == "stderr" else logging.FileHandler(
+        target, encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(os.getenv("TELEMETRY_LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
@@ -0,0 +1,72 @@
+"""배치 모드 이어서 실행 테스트"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def batch(tmp_path, monkeypatch):
+    """입력 파일과 가짜 _run_batch_item (key별로 정해 둔 상태를 순서대로 반환)"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, "check_api_keys", lambda: True)
+
+    input_path = tmp_path / "inputs.csv"
+    input_path.write_text("id,business_type\na,카페\nb,꽃집\n", encoding="utf-8")
+
+    statuses = {"a": ["ok"], "b": ["partial", "ok"]}
+    runs = []
+
+    def run_item(item, topics=None):
+        runs.append(item["key"])
+        status = statuses[item["key"]].pop(0)
+        record = {"key": item["key"], "business_type": item["business_type"], "status": status,
+                  "elapsed_seconds": 0.0}
+        if status == "partial":
+            record["content_errors"] = {"google": "overloaded"}
+        return record
+
+    monkeypatch.setattr(main, "_run_batch_item", run_item)
+    return str(input_path), str(tmp_path / "results.jsonl"), runs
+
+
+def test_resume_replaces_partial_record(batch):
+    input_path, output_path, runs = batch
+
+    main.batch_mode(input_path, output_path, plan_token_budget=0)
+    assert {r["key"]: r["status"] for r in _read(output_path)} == {"a": "ok", "b": "partial"}
+
+    main.batch_mode(input_path, output_path, plan_token_budget=0)
+    records = _read(output_path)
+    assert sorted(runs) == ["a", "b", "b"]
+    assert [r["key"] for r in records].count("b") == 1
+    assert {r["key"]: r["status"] for r in records} == {"a": "ok", "b": "ok"}
+    assert main.load_completed_keys(output_path) == {"a", "b"}
+
+
+def test_load_batch_records_keeps_last(tmp_path):
+    output_path = tmp_path / "results.jsonl"
+    output_path.write_text(
+        '{"key": "a", "status": "partial"}\n'
+        '{"key": "b", "status": "ok"}\n'
+        '{"key": "a", "status": "ok"}\n'
+        '{"key": "c", "sta',  # 중단 시 잘린 마지막 줄
+        encoding="utf-8"
+    )
+
+    records = main.load_batch_records(str(output_path))
+    assert list(records) == ["a", "b"]
+    assert records["a"]["status"] == "ok"
+
+    main.compact_batch_output(str(output_path))
+    assert _read(output_path) == [{"key": "a", "status": "ok"}, {"key": "b", "status": "ok"}]
@@ -0,0 +1,98 @@
+"""체크포인트 저장/재개 테스트"""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint import CheckpointStore  # noqa: E402
+from fake_llm import FakeChatModel, default_response  # noqa: E402
+from workflow_runner import run_workflow  # noqa: E402
+from workflow_state import ContentVersion, create_initial_state  # noqa: E402
+
+
+class Crash(BaseException):
+    """노드 실행 중 프로세스가 중단된 상황 재현 (플랫폼별 오류 처리에 잡히지 않음)"""
+
+
+def _platform(messages):
+    prompt = str(messages[-1].content)
+    return next(p for p in ("naver", "tistory", "google") if f"{p} 블로그" in prompt)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+
+
+def test_resume_skips_completed_nodes(store):
+    planner = FakeChatModel()
+    state = run_workflow(
+        create_initial_state("카페"), stop_after="planner", thread_id="t1",
+        checkpoint_store=store, configurable={"planner_llm": planner}
+    )
+    assert planner.calls == 1
+    assert store.completed_nodes("t1") == ["planner"]
+
+    resumed_planner, writer = FakeChatModel(), FakeChatModel()
+    resumed = run_workflow(
+        create_initial_state("카페"), thread_id="t1", checkpoint_store=store,
+        configurable={"planner_llm": resumed_planner, "writer_llm": writer}
+    )
+
+    assert resumed_planner.calls == 0
+    assert resumed["topic_suggestions"] == state["topic_suggestions"]
+    assert len(resumed["content_versions"]) == 3
+    assert store.completed_nodes("t1")[-1] == "writer"
+    # 마지막 체크포인트에서 본문까지 복원
+    assert store.load("t1")["content_versions"] == resumed["content_versions"]
+
+
+def test_resume_rewrites_only_unfinished_platforms(store):
+    def crash_on_google(messages):
+        if _platform(messages) != "google":
+            return default_response(messages)
+        # 다른 플랫폼이 partial_contents에 저장될 때까지 기다린 뒤 중단
+        deadline = time.monotonic() + 5
+        while len(store.load_partial("t2", title)) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        raise Crash()
+
+    run_workflow(
+        create_initial_state("카페"), stop_after="topic_selection", thread_id="t2",
+        checkpoint_store=store, configurable={"planner_llm": FakeChatModel()}
+    )
+    title = store.load("t2")["selected_topic"].title
+
+    with pytest.raises(Crash):
+        run_workflow(
+            create_initial_state("카페"), thread_id="t2", checkpoint_store=store,
+            configurable={"writer_llm": FakeChatModel(response_fn=crash_on_google)}
+        )
+    saved = {v.platform: v for v in store.load_partial("t2", title)}
+    assert set(saved) == {"naver", "tistory"}
+    assert "writer" not in store.completed_nodes("t2")
+
+    writer = FakeChatModel()
+    state = run_workflow(
+        create_initial_state("카페"), thread_id="t2", checkpoint_store=store,
+        configurable={"writer_llm": writer}
+    )
+    versions = {v.platform: v for v in state["content_versions"]}
+    assert writer.calls == 1
+    assert set(versions) == {"naver", "tistory", "google"}
+    assert versions["naver"] == saved["naver"]
+    assert versions["tistory"] == saved["tistory"]
+
+
+def test_texts_are_stored_once(store):
+    version = ContentVersion(platform="naver", content="본문" * 100, tone="friendly", input_hash="h")
+    store.save_partial("t3", "제목", version)
+    store.save_partial("t3", "제목", version)
+    assert store.load_partial("t3", "제목") == [version]
+    assert store._conn.execute("SELECT COUNT(*) FROM texts WHERE thread_id = 't3'").fetchone()[0] == 1
+
+    store.delete("t3")
+    assert store.load_partial("t3", "제목") == []
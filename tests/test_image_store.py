@@ -0,0 +1,66 @@
+"""업로드 이미지 저장소 테스트"""
+import io
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_store import ImageStore  # noqa: E402
+
+
+def _image_bytes(size=(2000, 1000), image_format="JPEG"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 120, 40)).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ImageStore(str(tmp_path))
+    yield store
+    store.shutdown()
+
+
+def test_same_bytes_are_stored_once(store):
+    data = _image_bytes()
+    first = store.save(io.BytesIO(data))
+    second = store.save(io.BytesIO(data))
+
+    assert first == second
+    assert sorted(os.listdir(store.root)) == [f"{first}.jpg"]
+    with open(os.path.join(store.root, f"{first}.jpg"), "rb") as f:
+        assert f.read() == data
+
+    assert store.save(io.BytesIO(_image_bytes(size=(10, 10)))) != first
+
+
+def test_variants_are_resized_webp(store):
+    image_id = store.save(io.BytesIO(_image_bytes()))
+    store.schedule(image_id).result(timeout=10)
+
+    for variant, expected in (("web", (1600, 800)), ("thumb", (320, 160))):
+        path = store.path(image_id, variant)
+        assert path.endswith(f"{image_id}.{variant}.webp")
+        with Image.open(path) as image:
+            assert image.format == "WEBP"
+            assert image.size == expected
+
+    # 모두 생성된 뒤에는 다시 생성하지 않음
+    assert store.schedule(image_id) is None
+
+
+def test_small_image_is_not_enlarged(store):
+    image_id = store.save(io.BytesIO(_image_bytes(size=(200, 100), image_format="PNG")))
+    store.schedule(image_id).result(timeout=10)
+
+    with Image.open(store.path(image_id, "web")) as image:
+        assert image.size == (200, 100)
+
+
+def test_rejects_non_image(store):
+    with pytest.raises(ValueError):
+        store.save(io.BytesIO(b"not an image"))
+    assert os.listdir(store.root) == []
@@ -0,0 +1,95 @@
+"""백그라운드 작업 큐와 /jobs 라우트 테스트"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_queue import JOB_DONE, JOB_FAILED, JobQueue, MemoryJobStore, SQLiteJobStore  # noqa: E402
+
+
+def _fail():
+    raise RuntimeError("LLM 호출 실패")
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request, tmp_path):
+    store = MemoryJobStore() if request.param == "memory" else SQLiteJobStore(
+        str(tmp_path / "jobs.sqlite3")
+    )
+    queue = JobQueue(max_workers=2, store=store)
+    yield queue
+    queue.shutdown()
+
+
+def test_job_runs_to_completion(queue):
+    job_id = queue.submit("step2", lambda x: {"topics": [x]}, "카페")
+    job = queue.wait(job_id, timeout=5, poll_interval=0.01)
+
+    assert job["status"] == JOB_DONE
+    assert job["result"] == {"topics": ["카페"]}
+    assert job["error"] is None
+    assert job["started_at"] is not None and job["finished_at"] is not None
+
+
+def test_job_error_is_recorded(queue):
+    job_id = queue.submit("step2", _fail)
+    job = queue.wait(job_id, timeout=5, poll_interval=0.01)
+
+    assert job["status"] == JOB_FAILED
+    assert job["error"] == "LLM 호출 실패"
+    assert job["result"] is None
+
+
+def test_unknown_job_is_none(queue):
+    assert queue.get("missing") is None
+
+
+@pytest.fixture(scope="module")
+def web(tmp_path_factory):
+    """app 모듈 (업로드 폴더/세션 파일은 임시 디렉터리에 생성)"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path_factory.mktemp("app"))
+        mp.setenv("FLASK_SECRET_KEY", "test")
+        mp.setenv("SESSION_BACKEND", "memory")
+        import app
+    app.app.config["TESTING"] = True
+    return app
+
+
+def _submit(web, client, fn):
+    job_id = web.job_queue.submit("step2", fn)
+    with client.session_transaction() as session:
+        session["job_ids"] = [job_id]
+    web.job_queue.wait(job_id, timeout=5, poll_interval=0.01)
+    return job_id
+
+
+def test_jobs_route_returns_result_and_updates_session(web):
+    client = web.app.test_client()
+    job_id = _submit(web, client, lambda: {"topics": [{"keyword": "라떼"}]})
+
+    data = client.get(f"/jobs/{job_id}").get_json()
+    assert data["status"] == JOB_DONE
+    assert data["result"] == {"topics": [{"keyword": "라떼"}]}
+    with client.session_transaction() as session:
+        assert session["topics"] == [{"keyword": "라떼"}]
+
+
+def test_jobs_route_reports_failure(web):
+    client = web.app.test_client()
+    job_id = _submit(web, client, _fail)
+
+    data = client.get(f"/jobs/{job_id}").get_json()
+    assert data["status"] == JOB_FAILED
+    assert data["error"] == "LLM 호출 실패"
+    assert "result" not in data
+
+    events = client.get(f"/jobs/{job_id}/events").get_data(as_text=True)
+    assert "event: status" in events and '"status": "failed"' in events
+
+
+def test_jobs_route_hides_other_sessions_jobs(web):
+    job_id = web.job_queue.submit("step2", dict)
+    assert web.app.test_client().get(f"/jobs/{job_id}").status_code == 404
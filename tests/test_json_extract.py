@@ -0,0 +1,26 @@
+"""json_extract 복구/성능 회귀 테스트"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_extract import REPAIRED, extract_json  # noqa: E402
+
+
+def test_truncated_response_is_closed():
+    value, method = extract_json('응답: {"suggestions": [{"keyword": "a"}, {"keyword": "b')
+    assert value == {"suggestions": [{"keyword": "a"}]}
+    assert method == REPAIRED
+
+
+def test_deep_nesting_falls_back_instead_of_raising():
+    assert extract_json("x " + "[" * 1500 + "]" * 1500) == (None, None)
+
+
+def test_scan_is_linear_in_nesting_depth():
+    """닫는 괄호마다 스택을 복사하지 않음 (깊이 16k도 빠르게 끝남)"""
+    n = 16_000
+    started = time.perf_counter()
+    extract_json("[" * n + "[0]," * n)
+    assert time.perf_counter() - started < 0.5
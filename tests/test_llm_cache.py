@@ -0,0 +1,64 @@
+"""LLM 응답 캐시 테스트"""
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_llm import FakeChatModel  # noqa: E402
+from llm_cache import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend  # noqa: E402
+from llm_invoke import invoke_llm  # noqa: E402
+
+MESSAGES = [SystemMessage(content="블로그 작가"), HumanMessage(content="카페 글")]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return ResponseCache(MemoryCacheBackend())
+    return ResponseCache(SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")))
+
+
+def test_hit_and_miss(cache):
+    llm = FakeChatModel()
+    first = invoke_llm(llm, MESSAGES, "cache-test", cache)
+    second = invoke_llm(llm, MESSAGES, "cache-test", cache)
+
+    assert first == second
+    assert llm.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_refresh_bypasses_and_updates_cache(cache):
+    llm = FakeChatModel()
+    invoke_llm(llm, MESSAGES, "cache-test", cache)
+    invoke_llm(llm, MESSAGES, "cache-test", cache, refresh=True)
+    invoke_llm(llm, MESSAGES, "cache-test", cache)
+    assert llm.calls == 2
+
+
+def test_json_mode_and_free_text_use_different_keys(cache):
+    llm = FakeChatModel()
+    invoke_llm(llm, MESSAGES, "cache-test", cache)
+    invoke_llm(llm, MESSAGES, "cache-test", cache, json_mode=True)
+    assert llm.calls == 2
+
+
+def test_generation_params_and_provider_are_part_of_key(cache):
+    short = SimpleNamespace(model="m", temperature=0.7, max_tokens=256)
+    long = SimpleNamespace(model="m", temperature=0.7, max_tokens=4096)
+    assert cache.key_for(short, MESSAGES) != cache.key_for(long, MESSAGES)
+    assert cache.key_for(short, MESSAGES, "gemini") != cache.key_for(short, MESSAGES, "gpt")
+    assert cache.key_for(short, MESSAGES, "gpt") == cache.key_for(short, MESSAGES, "gpt")
+
+
+def test_expired_entry_is_a_miss(cache):
+    cache.ttl = 60
+    cache.backend.set("key", "old", time.time() - 61)
+    assert cache.get("key") is None
+    cache.set("key", "new")
+    assert cache.get("key") == "new"
@@ -0,0 +1,97 @@
+"""llm_pool 클라이언트 풀 테스트"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_pool import LLMClientPool  # noqa: E402
+from multi_model_agent import MultiModelAgent  # noqa: E402
+
+
+def test_nested_params_are_pooled():
+    """중첩 인자(dict/list)가 있어도 풀 키를 만들고 같은 인자면 재사용"""
+    pool = LLMClientPool()
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    params = {"model_kwargs": {"top_p": 0.9}, "stop": ["\n\n"]}
+    first = pool.get("gpt", "gpt-4o", "key", 0.7, factory=factory, **params)
+    again = pool.get(
+        "gpt", "gpt-4o", "key", 0.7, factory=factory,
+        stop=["\n\n"], model_kwargs={"top_p": 0.9}
+    )
+    other = pool.get(
+        "gpt", "gpt-4o", "key", 0.7, factory=factory,
+        model_kwargs={"top_p": 0.5}, stop=["\n\n"]
+    )
+
+    assert first is again
+    assert other is not first
+    assert len(created) == 2
+
+
+def test_local_provider_accepts_nested_params():
+    """로컬 OpenAI 호환 서버에 default_headers/extra_body를 넘길 수 있음"""
+    agent = MultiModelAgent(
+        "local",
+        base_url="http://127.0.0.1:9/v1",
+        params={
+            "default_headers": {"X-Tenant": "blog"},
+            "extra_body": {"guided_json": {"type": "object"}},
+        },
+    )
+
+    assert agent.llm.default_headers == {"X-Tenant": "blog"}
+    assert agent.llm.extra_body == {"guided_json": {"type": "object"}}
+
+
+def test_slow_creation_does_not_block_other_lookups():
+    """생성 중인 클라이언트가 있어도 다른 키의 조회는 기다리지 않음"""
+    pool = LLMClientPool()
+    pool.get("gpt", "fast", "key", 0.7, factory=object)
+    creating = threading.Event()
+    release = threading.Event()
+
+    def slow_factory():
+        creating.set()
+        release.wait(5)
+        return object()
+
+    thread = threading.Thread(
+        target=lambda: pool.get("gpt", "slow", "key", 0.7, factory=slow_factory)
+    )
+    thread.start()
+    creating.wait(5)
+    started = time.monotonic()
+    pool.get("gpt", "fast", "key", 0.7, factory=object)
+    assert time.monotonic() - started < 0.5
+    release.set()
+    thread.join()
+
+
+def test_concurrent_misses_share_one_client():
+    pool = LLMClientPool()
+    barrier = threading.Barrier(4)
+    results = []
+
+    def factory():
+        barrier.wait(5)
+        return object()
+
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(pool.get("gpt", "m", "key", 0.7, factory=factory))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(client) for client in results}) == 1
+    assert len(pool) == 1
@@ -0,0 +1,51 @@
+"""llm_router 시간 제한/전환 테스트"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_router  # noqa: E402
+from fake_llm import FakeChatModel  # noqa: E402
+from llm_router import LLMRouter, get_provider_stats  # noqa: E402
+
+MESSAGES = [HumanMessage(content="안녕하세요")]
+
+
+def test_timeout_counts_from_start_not_from_queue(monkeypatch):
+    """풀에서 대기한 시간은 시간 제한에 포함하지 않음"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(llm_router, "_executor", executor)
+    busy = threading.Event()
+    executor.submit(lambda: (busy.set(), time.sleep(0.3)))
+    busy.wait()
+
+    router = LLMRouter([("router-queued", FakeChatModel(latency=0.05))], timeout=0.2)
+    assert router.invoke(MESSAGES)
+    assert get_provider_stats("router-queued").timeouts == 0
+    executor.shutdown()
+
+
+def test_timed_out_call_is_counted_once():
+    """시간 초과 후 실패로 끝난 호출은 실패를 다시 기록하지 않음"""
+    slow = FakeChatModel(latency=0.3, failure_rate=1.0, failure_status=500)
+    router = LLMRouter(
+        [("router-slow", slow), ("router-fast", FakeChatModel())], timeout=0.1
+    )
+    assert router.invoke(MESSAGES)
+    time.sleep(0.4)
+
+    stats = get_provider_stats("router-slow")
+    assert (stats.failures, stats.timeouts) == (1, 1)
+    assert get_provider_stats("router-fast").successes == 1
+
+
+def test_all_routes_fail():
+    router = LLMRouter([("router-broken", FakeChatModel(failure_rate=1.0))])
+    with pytest.raises(llm_router.RoutingError):
+        router.invoke(MESSAGES)
@@ -0,0 +1,42 @@
+"""llm_from_config 단계별 모델 설정 테스트"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_llm import FakeChatModel  # noqa: E402
+from multi_model_agent import llm_from_config  # noqa: E402
+
+
+def _config(**configurable):
+    return {"configurable": configurable}
+
+
+def test_no_step_model_returns_empty():
+    assert llm_from_config(_config(), "planner") == {}
+
+
+def test_llm_only_uses_default_provider():
+    llm = FakeChatModel()
+    settings = llm_from_config(_config(planner_llm=llm), "planner", default_provider="gemini")
+    assert settings == {"llm": llm, "provider": "gemini"}
+
+
+def test_step_provider_overrides_default():
+    settings = llm_from_config(
+        _config(writer_llm=FakeChatModel(), writer_provider="local"), "writer",
+        default_provider="claude"
+    )
+    assert settings["provider"] == "local"
+
+
+def test_llm_without_provider_raises_clear_error():
+    with pytest.raises(ValueError, match="summary_provider"):
+        llm_from_config(_config(summary_llm=FakeChatModel()), "summary")
+
+
+def test_unknown_provider_raises():
+    with pytest.raises(ValueError, match="지원하지 않는 모델"):
+        llm_from_config(_config(writer_llm=FakeChatModel(), writer_provider="writer"), "writer")
@@ -0,0 +1,91 @@
+"""publisher 동시 발행/재시도/중복 게시 방지 테스트 (publisher_stub 서버 사용)"""
+import os
+import sys
+import time
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import publisher  # noqa: E402
+from publisher import BloggerClient, publish_all, publish_state, publish_with_retry  # noqa: E402
+from publisher_stub import start_stub_server  # noqa: E402
+from workflow_state import ContentVersion, TopicSuggestion, create_initial_state  # noqa: E402
+
+CONFIGS = {
+    "naver": {"access_token": "token", "blog_id": "stub"},
+    "google": {"access_token": "token", "blog_id": "blog"},
+}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = start_stub_server()
+    monkeypatch.setenv("NAVER_BLOG_API_URL", server.base_url)
+    monkeypatch.setenv("BLOGGER_API_URL", server.base_url)
+    monkeypatch.setattr(publisher, "BACKOFF_SECONDS", 0.01)
+    yield server
+    server.shutdown()
+
+
+def _versions(text):
+    return [
+        ContentVersion(platform=platform, content=text, tone="", input_hash="")
+        for platform in ("naver", "google")
+    ]
+
+
+def test_publish_all_posts_concurrently(server):
+    server.latency = 0.3
+    title = f"동시 발행 {uuid.uuid4()}"
+    started = time.monotonic()
+    result = publish_all(_versions("본문"), title, CONFIGS)
+
+    assert result.errors == {}
+    assert set(result.urls) == {"naver", "google"}
+    assert len(server.posts) == 2
+    assert time.monotonic() - started < 0.55
+
+
+def test_transient_failure_is_retried(server):
+    server.fail_next(2, status=503)
+    client = BloggerClient(CONFIGS["google"])
+    url = publish_with_retry(client, f"재시도 {uuid.uuid4()}", "본문")
+
+    assert url == server.posts[0]["url"]
+    assert len(server.posts) == 1
+
+
+def test_same_post_is_not_published_twice(server):
+    client = BloggerClient(CONFIGS["google"])
+    title = f"중복 방지 {uuid.uuid4()}"
+    first = publish_with_retry(client, title, "본문")
+    second = publish_with_retry(client, title, "본문")
+
+    assert first == second
+    assert len(server.posts) == 1
+
+
+def test_lost_response_finds_existing_post(server):
+    """게시 후 응답이 유실되면 다시 게시하지 않고 기존 게시물 URL을 반환"""
+    server.lose_responses(1)
+    client = BloggerClient(CONFIGS["google"])
+    url = publish_with_retry(client, f"응답 유실 {uuid.uuid4()}", "본문")
+
+    assert url == server.posts[0]["url"]
+    assert len(server.posts) == 1
+
+
+def test_publish_state_records_url_list(server):
+    state = create_initial_state(
+        "카페", TopicSuggestion(keyword="라떼", title=f"상태 발행 {uuid.uuid4()}", reason="")
+    )
+    state["content_versions"] = _versions("본문")
+    result = publish_state(state, CONFIGS)
+
+    assert sorted(state["published_urls"]) == sorted(result.urls.values())
+
+    state["review_passed"] = False
+    with pytest.raises(ValueError):
+        publish_state(state, CONFIGS)
@@ -0,0 +1,41 @@
+"""rate_limit AIMD 동시 요청 수 조절 테스트"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rate_limit  # noqa: E402
+
+
+@pytest.fixture
+def limiter():
+    rate_limit.configure_rate_limit("test", max_concurrency=8)
+    return rate_limit.get_limiter("test")
+
+
+def test_success_increases_limit(limiter):
+    before = limiter.concurrency._limit
+    with rate_limit.call("test"):
+        pass
+    assert limiter.concurrency._limit > before
+
+
+def test_other_errors_keep_limit(limiter):
+    """인증/잘못된 요청/파싱 오류는 성공으로 세지 않고 한도를 유지"""
+    before = limiter.concurrency._limit
+    with pytest.raises(ValueError):
+        with rate_limit.call("test"):
+            raise ValueError("401 invalid api key")
+    assert limiter.concurrency._limit == before
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_overload_decreases_limit(limiter):
+    before = limiter.concurrency._limit
+    with pytest.raises(RuntimeError):
+        with rate_limit.call("test"):
+            raise RuntimeError("429 Too Many Requests")
+    assert limiter.concurrency._limit < before
+    assert limiter.metrics()["overloads_total"] == 1
@@ -0,0 +1,43 @@
+"""검수 → 재작성 루프 한도 테스트"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_reviewer import can_retry_review  # noqa: E402
+from workflow_state import ReviewResult  # noqa: E402
+
+
+def _rejected_state(**fields):
+    state = {
+        "review_passed": False,
+        "review_results": {
+            "blog": ReviewResult(platform="blog", passed=False, score=40, feedback="", content_hash="x")
+        },
+    }
+    state.update(fields)
+    return state
+
+
+def test_retry_allowed_within_bounds():
+    assert can_retry_review(_rejected_state(retry_count=1))
+
+
+def test_retry_count_limit_is_enforced():
+    """체크포인트에서 이어서 실행해도 재시도 횟수를 넘기면 다시 작성하지 않음"""
+    assert not can_retry_review(_rejected_state(retry_count=2))
+    assert can_retry_review(
+        _rejected_state(retry_count=2), {"configurable": {"max_review_retries": 3}}
+    )
+
+
+def test_review_budgets_are_enforced():
+    assert not can_retry_review(_rejected_state(review_usage={"tokens": 60_000, "seconds": 1.0}))
+    assert not can_retry_review(
+        _rejected_state(review_usage={"tokens": 10, "seconds": 5.0}),
+        {"configurable": {"review_time_budget": 5.0}}
+    )
+
+
+def test_passed_review_is_not_retried():
+    assert not can_retry_review(_rejected_state(review_passed=True))
@@ -0,0 +1,83 @@
+"""서버 측 세션 저장소 테스트"""
+import os
+import sys
+import time
+
+import pytest
+from flask import Flask, session
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_store import (  # noqa: E402
+    MemorySessionBackend, SQLiteSessionBackend, ServerSideSessionInterface, get_secret_key_from_env
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionBackend()
+    return SQLiteSessionBackend(str(tmp_path / "sessions.sqlite3"))
+
+
+def test_backend_save_load_delete(backend):
+    backend.save("sid", b"payload", time.time() + 60)
+    assert backend.load("sid") == b"payload"
+    backend.delete("sid")
+    assert backend.load("sid") is None
+
+
+def test_backend_expired_session_is_not_loaded(backend):
+    backend.save("sid", b"payload", time.time() - 1)
+    assert backend.load("sid") is None
+
+
+def _make_app(backend, secret_key):
+    app = Flask(__name__)
+    app.secret_key = secret_key
+    app.session_interface = ServerSideSessionInterface(backend)
+
+    @app.route("/set")
+    def set_value():
+        session["value"] = "x" * 10_000  # 쿠키 한도보다 큰 값도 서버에 저장
+        return ""
+
+    @app.route("/get")
+    def get_value():
+        return session.get("value", "")
+
+    return app
+
+
+def test_workers_with_same_key_share_sessions(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    first = _make_app(SQLiteSessionBackend(path), b"shared-key").test_client()
+    second = _make_app(SQLiteSessionBackend(path), b"shared-key").test_client()
+
+    first.get("/set")
+    cookie = first.get_cookie("session")
+    assert len(cookie.value) < 200
+    second.set_cookie("session", cookie.value)
+    assert second.get("/get").data == b"x" * 10_000
+
+
+def test_bad_signature_starts_new_session(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    first = _make_app(SQLiteSessionBackend(path), b"key-one").test_client()
+    other = _make_app(SQLiteSessionBackend(path), b"key-two").test_client()
+
+    first.get("/set")
+    other.set_cookie("session", first.get_cookie("session").value)
+    assert other.get("/get").data == b""
+
+
+def test_secret_key_from_env(monkeypatch):
+    monkeypatch.setenv("FLASK_SECRET_KEY", "configured")
+    assert get_secret_key_from_env() == b"configured"
+
+
+def test_missing_secret_key_warns_for_sqlite(monkeypatch):
+    monkeypatch.delenv("FLASK_SECRET_KEY", raising=False)
+    monkeypatch.setenv("SESSION_BACKEND", "sqlite")
+    with pytest.warns(RuntimeWarning, match="FLASK_SECRET_KEY"):
+        assert len(get_secret_key_from_env()) == 24
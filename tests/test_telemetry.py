@@ -0,0 +1,31 @@
+"""telemetry 지표 렌더링 테스트"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telemetry  # noqa: E402
+from topic_scoring import TopicScorer  # noqa: E402
+from workflow_state import TopicSuggestion  # noqa: E402
+
+
+def test_topic_selection_metrics_use_score_buckets():
+    telemetry.registry.clear()
+    topics = [
+        TopicSuggestion(keyword="라떼 아트", title="집에서 라떼 아트 " * 5, reason=""),
+        TopicSuggestion(keyword="라떼 아트", title="집에서 라떼 아트 연습하기", reason=""),
+    ]
+    TopicScorer(weights={"title_length": 1.0}).select("카페", topics)
+
+    metrics = telemetry.render_metrics()
+    assert "# TYPE topic_selection_score histogram" in metrics
+    assert 'topic_selection_score_bucket{le="0.5"}' in metrics
+    assert 'topic_selection_score_bucket{le="300"}' not in metrics
+    assert "topic_selection_reordered_total 1" in metrics
+
+
+def test_duration_histograms_keep_duration_buckets():
+    telemetry.registry.clear()
+    telemetry.registry.observe("workflow_node_duration_seconds", 2.0, node="planner")
+    metrics = telemetry.render_metrics()
+    assert 'workflow_node_duration_seconds_bucket{node="planner",le="300"} 1' in metrics
@@ -0,0 +1,59 @@
+"""작성 주제 색인 테스트"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telemetry  # noqa: E402
+from agent_planner import PlannerAgent  # noqa: E402
+from topic_index import TopicIndex  # noqa: E402
+from workflow_state import TopicSuggestion  # noqa: E402
+
+
+def _topic(keyword, title):
+    return TopicSuggestion(keyword=keyword, title=title, reason="")
+
+
+def test_same_keyword_is_duplicate():
+    index = TopicIndex(":memory:")
+    index.add_many("세무사", [
+        _topic("종합소득세 신고", f"종합소득세 신고 가이드 {i}") for i in range(10)
+    ])
+    assert index.max_similarity("세무사", _topic("종합소득세  신고", "전혀 다른 제목")) == 1.0
+    # 같은 키워드 주제가 limit개 이상이면 limit개만 반환
+    assert len(index.find_similar("세무사", _topic("종합소득세 신고", "제목"), limit=3)) == 3
+
+
+def test_similar_title_is_duplicate_and_other_business_type_is_not():
+    index = TopicIndex(":memory:")
+    index.add("세무사", _topic("프리랜서 종합소득세", "프리랜서 종합소득세 신고 방법 총정리"))
+    similar = _topic("프리랜서 종소세", "프리랜서 종합소득세 신고 방법 정리")
+    assert index.is_duplicate("세무사", similar)
+    assert not index.is_duplicate("카페", similar)
+    assert not index.is_duplicate("세무사", _topic("법인 설립", "법인 설립 절차와 비용"))
+
+
+def test_exclude_written_keeps_fresh_topics_when_extra_request_fails():
+    index = TopicIndex(":memory:")
+    index.add("세무사", _topic("연말정산", "연말정산 환급 많이 받는 법"))
+    agent = PlannerAgent(llm=object(), topic_index=index)
+
+    def fail(business_type, avoid=None):
+        raise RuntimeError("LLM 오류")
+
+    agent._plan = fail
+    topics = [_topic("연말정산", "연말정산 환급"), _topic("부가세 신고", "부가가치세 신고 기한")]
+    assert agent._exclude_written("세무사", topics) == [topics[1]]
+
+
+def test_exclude_written_metrics_are_rendered():
+    index = TopicIndex(":memory:")
+    index.add("세무사", _topic("연말정산", "연말정산 환급 많이 받는 법"))
+    agent = PlannerAgent(llm=object(), topic_index=index)
+    agent._plan = lambda business_type, avoid=None: []
+    agent._exclude_written("세무사", [_topic("연말정산", "연말정산 환급"), _topic("부가세", "부가세 신고")])
+
+    metrics = telemetry.render_metrics()
+    assert "# TYPE topic_index_checks_total counter" in metrics
+    assert 'topic_index_checks_total{result="duplicate"}' in metrics
+    assert 'topic_index_checks_total{result="new"}' in metrics
@@ -0,0 +1,70 @@
+"""WriterAgent.regenerate / stale_platforms 테스트"""
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_writer import PLATFORM_TONES, WriterAgent  # noqa: E402
+from fake_llm import FakeChatModel  # noqa: E402
+from workflow_state import TopicSuggestion, create_initial_state  # noqa: E402
+
+TOPIC = TopicSuggestion(keyword="라떼 아트", title="집에서 라떼 아트 연습하기", reason="")
+
+
+def _numbered_llm(**kwargs):
+    """호출할 때마다 다른 본문을 만드는 가짜 모델"""
+    counter = itertools.count(1)
+    return FakeChatModel(response_fn=lambda messages: f"본문 {next(counter)}", **kwargs)
+
+
+def _written_state(agent):
+    state = create_initial_state("카페")
+    state["selected_topic"] = TOPIC
+    return agent.write_content(state)
+
+
+def test_regenerate_keeps_other_platforms():
+    agent = WriterAgent(llm=_numbered_llm())
+    state = _written_state(agent)
+    before = {v.platform: v for v in state["content_versions"]}
+
+    state = agent.regenerate(state, ["tistory"])
+    after = {v.platform: v for v in state["content_versions"]}
+
+    assert agent.llm.calls == 4
+    assert [v.platform for v in state["content_versions"]] == list(PLATFORM_TONES)
+    assert after["tistory"].content != before["tistory"].content
+    for platform in ("naver", "google"):
+        assert after[platform] == before[platform]
+        assert after[platform].content.encode("utf-8") == before[platform].content.encode("utf-8")
+
+
+def test_stale_platforms_detects_changed_input():
+    agent = WriterAgent(llm=_numbered_llm())
+    state = _written_state(agent)
+    assert agent.stale_platforms(state) == []
+
+    # 해시가 다른 글은 다시 작성 대상, 해시가 없는 글은 유지
+    versions = state["content_versions"]
+    versions[0] = versions[0].model_copy(update={"input_hash": "outdated"})
+    versions[1] = versions[1].model_copy(update={"input_hash": None})
+    assert agent.stale_platforms(state) == ["naver"]
+
+    kept = versions[1]
+    state = agent.write_content(state)
+    assert agent.llm.calls == 4
+    assert state["content_versions"][1] == kept
+    assert agent.stale_platforms(state) == []
+
+
+def test_stale_platforms_after_topic_or_model_change():
+    agent = WriterAgent(llm=_numbered_llm())
+    state = _written_state(agent)
+
+    state["selected_topic"] = TOPIC.model_copy(update={"title": "라떼 아트 도구 고르기"})
+    assert agent.stale_platforms(state) == list(PLATFORM_TONES)
+
+    state["selected_topic"] = TOPIC
+    other_model = WriterAgent(llm=_numbered_llm(model="other-model"))
+    assert other_model.stale_platforms(state) == list(PLATFORM_TONES)
@@ -0,0 +1,29 @@
+"""WriterAgent.stream_content 동시 스트리밍 테스트"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_writer import PLATFORM_TONES, WriterAgent  # noqa: E402
+from fake_llm import FakeChatModel  # noqa: E402
+from workflow_state import TopicSuggestion  # noqa: E402
+
+TOPIC = TopicSuggestion(keyword="라떼 아트", title="집에서 라떼 아트 연습하기", reason="")
+
+
+def test_concurrent_stream_completes():
+    agent = WriterAgent(llm=FakeChatModel(), concurrent=True)
+    done = list(agent.stream_content(TOPIC, "카페"))[-1]
+    assert done["event"] == "done"
+    assert [v.platform for v in done["content_versions"]] == list(PLATFORM_TONES)
+
+
+def test_closing_stream_does_not_wait_for_platforms():
+    """소비자가 중간에 멈추면 남은 플랫폼 스트림을 기다리지 않음"""
+    agent = WriterAgent(llm=FakeChatModel(tokens_per_second=50), concurrent=True)
+    stream = agent.stream_content(TOPIC, "카페")
+    next(stream)
+    started = time.monotonic()
+    stream.close()
+    assert time.monotonic() - started < 1.0
@@ -0,0 +1,315 @@
+"""
+작성한 주제 색인
+업종별로 이미 작성한 주제(키워드, 제목)를 MinHash 서명으로 저장하고 LSH 버킷으로 찾아,
+기획 단계가 비슷한 주제를 다시 추천하거나 선택하지 않도록 합니다.
+
+- 유사도: 정규화한 키워드가 같으면 1.0 (같은 키워드의 글끼리 검색 순위를 나눠 가지므로),
+  아니면 키워드/제목의 글자 2-gram 집합의 Jaccard 유사도를 MinHash로 추정
+- 조회: 키워드 색인과 밴드별 LSH 버킷 색인에서 찾은 후보만 서명으로 비교 (전체 주제 수와 무관)
+"""
+import array
+import functools
+import hashlib
+import operator
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from workflow_state import TopicSuggestion
+
+# MinHash 서명 길이와 LSH 밴드 구성
+# (밴드 32개 x 4행, 밴드 2개 이상 겹친 주제만 비교: 유사도 0.5인 주제는 약 60%, 0.6이면 93%,
+#  0.7이면 99%가 후보가 되고 0.3 이하는 3% 미만. 중복 주제는 보통 비슷한 작성 주제가 여럿이라
+#  그중 하나만 후보가 되어도 찾음)
+NUM_PERM = 128
+BAND_ROWS = 4
+BANDS = NUM_PERM // BAND_ROWS
+# 이 유사도 이상이면 이미 작성한 주제로 판단
+DEFAULT_THRESHOLD = 0.5
+# 밴드가 이 개수 이상 겹쳐야 후보로 비교 (밴드 하나만 우연히 겹친 주제 제외)
+MIN_BAND_HITS = 2
+# 서명으로 비교할 버킷 후보 최대 개수 (겹친 밴드가 많은 순)
+MAX_CANDIDATES = 64
+# blake2b 64바이트 출력 하나에서 32비트 해시 16개를 얻음 (person으로 출력을 구분)
+_DIGESTS_PER_SHINGLE = NUM_PERM // 16
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]")
+
+
+class SimilarTopic(NamedTuple):
+    """색인에서 찾은 비슷한 주제"""
+    keyword: str
+    title: str
+    similarity: float  # 0~1 (키워드가 같으면 1.0)
+
+
+def normalize_text(text: str) -> str:
+    """비교용 정규화 (소문자, 한글/영문/숫자만 남김)"""
+    return _NON_WORD.sub("", text.lower())
+
+
+def _bigrams(text: str) -> set:
+    text = normalize_text(text)
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def shingles(keyword: str, title: str) -> set:
+    """주제의 shingle 집합 (키워드 2-gram, 제목 2-gram)"""
+    result = {f"k:{gram}" for gram in _bigrams(keyword)}
+    result.update(f"t:{gram}" for gram in _bigrams(title))
+    return result
+
+
+@functools.lru_cache(maxsize=65536)
+def _shingle_hashes(shingle: str) -> Tuple[int, ...]:
+    """shingle 하나의 독립적인 32비트 해시 NUM_PERM개 (한글 2-gram은 종류가 한정되어 캐시 적중률이 높음)"""
+    data = shingle.encode("utf-8")
+    values = array.array("I")
+    for i in range(_DIGESTS_PER_SHINGLE):
+        values.frombytes(hashlib.blake2b(data, digest_size=64, person=bytes([i])).digest())
+    return tuple(values)
+
+
+def minhash(keyword: str, title: str) -> array.array:
+    """
+    주제의 MinHash 서명 (NUM_PERM개의 32비트 정수)
+    해시 함수마다 shingle 해시의 최솟값을 취합니다 (최솟값 계산은 C 수준의 map/zip으로 처리).
+    """
+    rows = [_shingle_hashes(shingle) for shingle in shingles(keyword, title)]
+    if not rows:
+        return array.array("I", [0] * NUM_PERM)
+    return array.array("I", map(min, zip(*rows)))
+
+
+def similarity(left: array.array, right: array.array) -> float:
+    """두 서명의 추정 Jaccard 유사도"""
+    return sum(map(operator.eq, left, right)) / len(left)
+
+
+def topic_similarity(
+    keyword: str, signature: array.array, other_keyword: str, other_signature: array.array
+) -> float:
+    """정규화한 키워드가 같으면 1.0, 아니면 서명의 추정 Jaccard 유사도"""
+    if keyword and keyword == other_keyword:
+        return 1.0
+    return similarity(signature, other_signature)
+
+
+def _band_keys(business_type: str, signature: array.array) -> List[int]:
+    """업종별 LSH 버킷 키 (밴드 번호 << 32 | 업종과 밴드 값의 CRC32, SQLite INTEGER 범위)"""
+    seed = zlib.crc32(business_type.encode("utf-8"))
+    data = signature.tobytes()
+    size = BAND_ROWS * signature.itemsize
+    return [
+        (band << 32) | zlib.crc32(data[band * size:(band + 1) * size], seed)
+        for band in range(BANDS)
+    ]
+
+
+class TopicIndex:
+    """SQLite 파일 기반 작성 주제 색인 (path=":memory:"면 메모리에만 저장)"""
+
+    def __init__(self, path: str = "topic_index.sqlite3", threshold: float = DEFAULT_THRESHOLD):
+        """
+        Args:
+            path: SQLite 파일 경로
+            threshold: 이 유사도 이상이면 중복으로 판단
+        """
+        self.path = path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS topics (
+                id INTEGER PRIMARY KEY,
+                business_type TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                title TEXT NOT NULL,
+                normalized_keyword TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                UNIQUE (business_type, keyword, title)
+            );
+            CREATE INDEX IF NOT EXISTS idx_topics_keyword
+                ON topics (business_type, normalized_keyword);
+            CREATE TABLE IF NOT EXISTS topic_bands (
+                band_key INTEGER NOT NULL,
+                topic_id INTEGER NOT NULL,
+                PRIMARY KEY (band_key, topic_id)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    def add(self, business_type: str, topic: TopicSuggestion) -> None:
+        """작성한 주제 등록 (같은 키워드/제목은 한 번만 저장)"""
+        self.add_many(business_type, [topic])
+
+    def add_many(self, business_type: str, topics: Iterable[TopicSuggestion]) -> None:
+        """작성한 주제 여러 개를 한 트랜잭션으로 등록"""
+        rows = [(t, minhash(t.keyword, t.title)) for t in topics]
+        with self._lock:
+            for topic, signature in rows:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO topics VALUES (NULL, ?, ?, ?, ?, ?, ?)",
+                    (business_type, topic.keyword, topic.title, normalize_text(topic.keyword),
+                     signature.tobytes(), time.time())
+                )
+                if cursor.rowcount == 0:
+                    continue
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO topic_bands VALUES (?, ?)",
+                    [(key, cursor.lastrowid) for key in _band_keys(business_type, signature)]
+                )
+            self._conn.commit()
+
+    def find_similar(
+        self,
+        business_type: str,
+        topic: TopicSuggestion,
+        threshold: Optional[float] = None,
+        limit: int = 5
+    ) -> List[SimilarTopic]:
+        """
+        업종의 작성 주제 중 topic과 비슷한 주제를 유사도 높은 순으로 반환합니다.
+
+        Args:
+            business_type: 업종
+            topic: 확인할 주제
+            threshold: 최소 유사도 (기본값: 색인의 threshold)
+            limit: 최대 반환 개수
+        """
+        threshold = self.threshold if threshold is None else threshold
+        return [
+            match for match in self._candidates(business_type, topic, limit=limit)
+            if match.similarity >= threshold
+        ][:limit]
+
+    def max_similarity(self, business_type: str, topic: TopicSuggestion) -> float:
+        """작성 주제와의 최대 유사도 (비슷한 주제가 없으면 0, 참신도 = 1 - 이 값)"""
+        matches = self._candidates(business_type, topic)
+        return matches[0].similarity if matches else 0.0
+
+    def is_duplicate(self, business_type: str, topic: TopicSuggestion) -> bool:
+        """이미 작성한 주제와 threshold 이상 비슷한지 여부"""
+        return self.max_similarity(business_type, topic) >= self.threshold
+
+    def _candidates(
+        self, business_type: str, topic: TopicSuggestion,
+        signature: Optional[array.array] = None, limit: int = 1
+    ) -> List[SimilarTopic]:
+        """
+        키워드가 같거나 LSH 버킷이 MIN_BAND_HITS개 이상 겹치는 작성 주제 (유사도 높은 순)
+        키워드가 같은 주제는 유사도가 1.0이므로 limit개를 찾으면 버킷 조회 없이 바로 반환하고,
+        버킷 후보는 겹친 밴드가 많은 순으로 MAX_CANDIDATES개까지만 서명으로 비교합니다.
+        """
+        if signature is None:
+            signature = minhash(topic.keyword, topic.title)
+        normalized = normalize_text(topic.keyword)
+        with self._lock:
+            exact = self._conn.execute(
+                """SELECT keyword, title FROM topics
+                WHERE business_type = ? AND normalized_keyword = ? LIMIT ?""",
+                (business_type, normalized, limit)
+            ).fetchall() if normalized else []
+            if len(exact) >= limit:
+                return [SimilarTopic(keyword, title, 1.0) for keyword, title in exact]
+
+            keys = _band_keys(business_type, signature)
+            rows = self._conn.execute(
+                f"""SELECT keyword, title, signature FROM topics
+                WHERE id IN (
+                    SELECT topic_id FROM topic_bands WHERE band_key IN ({", ".join("?" * len(keys))})
+                    GROUP BY topic_id HAVING COUNT(*) >= ?
+                    ORDER BY COUNT(*) DESC LIMIT ?
+                ) AND (? = '' OR normalized_keyword != ?)""",
+                (*keys, MIN_BAND_HITS, MAX_CANDIDATES, normalized, normalized)
+            ).fetchall()
+
+        matches = [SimilarTopic(keyword, title, 1.0) for keyword, title in exact]
+        for keyword, title, blob in rows:
+            stored = array.array("I")
+            stored.frombytes(blob)
+            matches.append(SimilarTopic(keyword, title, similarity(signature, stored)))
+        matches.sort(key=lambda m: -m.similarity)
+        return matches
+
+    def filter_new(
+        self, business_type: str, topics: List[TopicSuggestion]
+    ) -> Tuple[List[TopicSuggestion], List[TopicSuggestion]]:
+        """
+        후보 주제를 새 주제와 중복 주제로 나눕니다.
+        작성 주제와 비슷하거나, 앞선 후보와 비슷한 후보는 중복으로 분류합니다.
+
+        Returns:
+            (새 주제 목록, 중복 주제 목록) (각각 입력 순서 유지)
+        """
+        fresh: List[Tuple[TopicSuggestion, str, array.array]] = []
+        duplicates: List[TopicSuggestion] = []
+        for topic in topics:
+            normalized = normalize_text(topic.keyword)
+            signature = minhash(topic.keyword, topic.title)
+            matches = self._candidates(business_type, topic, signature)
+            if (matches and matches[0].similarity >= self.threshold) or any(
+                topic_similarity(normalized, signature, other_keyword, other) >= self.threshold
+                for _, other_keyword, other in fresh
+            ):
+                duplicates.append(topic)
+            else:
+                fresh.append((topic, normalized, signature))
+        return [topic for topic, _, _ in fresh], duplicates
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total, business_types = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT business_type) FROM topics"
+            ).fetchone()
+        return {"topics": total, "business_types": business_types, "threshold": self.threshold}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM topics").fetchone()[0]
+
+
+_default_index: Optional[TopicIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_default_topic_index() -> Optional[TopicIndex]:
+    """
+    환경 변수로 설정된 기본 주제 색인 (설정되지 않았으면 None)
+
+    - TOPIC_INDEX_PATH: SQLite 파일 경로 (설정하면 색인 사용)
+    - TOPIC_DUPLICATE_THRESHOLD: 중복으로 판단할 유사도 (기본값: 0.5)
+    """
+    global _default_index
+
+    path = os.getenv("TOPIC_INDEX_PATH", "").strip()
+    if not path:
+        return None
+
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = TopicIndex(
+                path,
+                threshold=float(os.getenv("TOPIC_DUPLICATE_THRESHOLD", DEFAULT_THRESHOLD))
+            )
+        return _default_index
+
+
+def get_topic_index(config: Optional[Dict[str, Any]]) -> Optional[TopicIndex]:
+    """노드 config의 configurable["topic_index"] 또는 기본 색인"""
+    configurable = (config or {}).get("configurable", {})
+    index = configurable.get("topic_index")
+    return index if index is not None else get_default_topic_index()
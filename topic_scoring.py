@@ -0,0 +1,291 @@
+"""
+주제 선택 점수
+LLM 호출 없이 로컬 데이터만으로 추천 주제를 채점하여, 작성/검수 비용을 쓰기 전에 가장 좋은 주제를 고릅니다.
+
+기본 점수 항목 (각 0~1, 가중 평균):
+- novelty: 작성한 주제와 겹치지 않는 정도 (주제 색인이 있을 때)
+- title_length: 제목이 35자 이내인지
+- seasonality: 이번 달(또는 인접한 달)의 계절 키워드를 담고 있는지
+- volume: 키워드 검색량 CSV의 검색량 (CSV가 있을 때)
+
+점수를 낼 수 없는 항목(None)은 가중 평균에서 빠지며, register_scorer로 항목을 추가할 수 있습니다.
+"""
+import csv
+import datetime
+import functools
+import math
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+import telemetry
+from topic_index import TopicIndex, get_topic_index, normalize_text
+from workflow_state import TopicSuggestion
+
+# 제목 최대 글자 수 (기획 프롬프트의 "35자 이내"와 같음)
+MAX_TITLE_LENGTH = 35
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "novelty": 0.4,
+    "volume": 0.25,
+    "title_length": 0.2,
+    "seasonality": 0.15,
+}
+
+# 월별 계절 키워드 (TOPIC_SEASONALITY_CSV로 교체 가능)
+DEFAULT_SEASONALITY: Dict[int, List[str]] = {
+    1: ["연말정산", "새해", "신년", "설날", "겨울"],
+    2: ["연말정산", "설날", "졸업", "입학", "겨울"],
+    3: ["법인세", "입학", "개강", "봄", "이사"],
+    4: ["봄", "벚꽃", "나들이", "이사"],
+    5: ["종합소득세", "가정의달", "어린이날", "어버이날", "웨딩"],
+    6: ["여름", "장마", "다이어트"],
+    7: ["부가세", "여름", "휴가", "방학", "장마"],
+    8: ["휴가", "여름", "방학", "폭염"],
+    9: ["추석", "가을", "환절기"],
+    10: ["가을", "단풍", "환절기"],
+    11: ["수능", "김장", "겨울", "연말정산"],
+    12: ["연말", "크리스마스", "겨울", "연말정산"],
+}
+
+# (업종, 주제) → 0~1 점수 (점수를 낼 수 없으면 None)
+Scorer = Callable[["TopicScorer", str, TopicSuggestion], Optional[float]]
+
+
+class TopicScore(NamedTuple):
+    """주제 하나의 채점 결과"""
+    topic: TopicSuggestion
+    score: float  # 항목별 점수의 가중 평균 (0~1)
+    duplicate: bool  # 작성한 주제와 중복인지 (중복이 아닌 주제를 먼저 고름)
+    components: Dict[str, float]  # 항목별 점수 (점수를 낼 수 없는 항목은 제외)
+
+
+def _novelty(scorer: "TopicScorer", business_type: str, topic: TopicSuggestion) -> Optional[float]:
+    if scorer.topic_index is None:
+        return None
+    return 1.0 - scorer.topic_index.max_similarity(business_type, topic)
+
+
+def _title_length(scorer: "TopicScorer", business_type: str, topic: TopicSuggestion) -> Optional[float]:
+    """35자 이내면 1.0, 넘으면 넘은 만큼 감점 (두 배 길이면 0)"""
+    length = len(topic.title.strip())
+    if length == 0:
+        return 0.0
+    if length <= MAX_TITLE_LENGTH:
+        return 1.0
+    return max(0.0, 1.0 - (length - MAX_TITLE_LENGTH) / MAX_TITLE_LENGTH)
+
+
+def _seasonality(scorer: "TopicScorer", business_type: str, topic: TopicSuggestion) -> Optional[float]:
+    """이번 달 계절 키워드를 담으면 1.0, 인접한 달이면 0.5"""
+    text = normalize_text(f"{topic.keyword} {topic.title}")
+    month = scorer.today().month
+    for offset, score in ((0, 1.0), (-1, 0.5), (1, 0.5)):
+        terms = scorer.seasonality.get((month - 1 + offset) % 12 + 1, [])
+        if any(normalize_text(term) in text for term in terms):
+            return score
+    return 0.0
+
+
+def _volume(scorer: "TopicScorer", business_type: str, topic: TopicSuggestion) -> Optional[float]:
+    """
+    키워드 검색량을 로그 척도로 0~1로 변환 (CSV의 최대 검색량이 1.0)
+    키워드가 CSV에 없으면 키워드에 포함된 CSV 키워드 중 가장 큰 검색량의 절반으로 계산합니다.
+    """
+    volumes = scorer.keyword_volumes
+    if not volumes:
+        return None
+
+    def lookup(term: str) -> Optional[float]:
+        return volumes.get((business_type, term), volumes.get(("", term)))
+
+    keyword = normalize_text(topic.keyword)
+    volume = lookup(keyword)
+    if volume is None:
+        # 키워드의 부분 문자열만 찾아보므로 CSV 크기와 무관하게 일정한 시간
+        contained = [
+            v for v in (
+                lookup(keyword[start:end])
+                for start in range(len(keyword))
+                for end in range(start + 2, len(keyword) + 1)
+            ) if v is not None
+        ]
+        volume = max(contained) / 2 if contained else 0.0
+
+    top = scorer.max_volume
+    return math.log1p(volume) / math.log1p(top) if top > 0 else 0.0
+
+
+SCORERS: Dict[str, Scorer] = {
+    "novelty": _novelty,
+    "title_length": _title_length,
+    "seasonality": _seasonality,
+    "volume": _volume,
+}
+
+
+def register_scorer(name: str, scorer: Scorer, weight: float = 0.0) -> None:
+    """
+    점수 항목을 등록합니다 (같은 이름이면 교체).
+
+    Args:
+        name: 항목 이름 (weights의 키)
+        scorer: (TopicScorer, 업종, 주제) → 0~1 점수 또는 None
+        weight: 기본 가중치 (TopicScorer에 weights를 넘기지 않을 때 사용)
+    """
+    SCORERS[name] = scorer
+    DEFAULT_WEIGHTS.setdefault(name, weight)
+
+
+class TopicScorer:
+    """로컬 데이터로 추천 주제를 채점하고 가장 좋은 주제를 고르는 선택기"""
+
+    def __init__(
+        self,
+        topic_index: Optional[TopicIndex] = None,
+        keyword_volumes: Optional[Dict[Tuple[str, str], float]] = None,
+        seasonality: Optional[Dict[int, List[str]]] = None,
+        weights: Optional[Dict[str, float]] = None,
+        today: Optional[Callable[[], datetime.date]] = None
+    ):
+        """
+        Args:
+            topic_index: 작성 주제 색인 (None이면 novelty 항목 제외)
+            keyword_volumes: {(업종 또는 "", 정규화한 키워드): 검색량} (None이면 volume 항목 제외)
+            seasonality: {월: 계절 키워드 목록} (기본값: DEFAULT_SEASONALITY)
+            weights: {항목 이름: 가중치} (기본값: DEFAULT_WEIGHTS, 0이면 해당 항목 제외)
+            today: 오늘 날짜를 반환하는 함수 (테스트/벤치마크용)
+        """
+        self.topic_index = topic_index
+        self.keyword_volumes = keyword_volumes or {}  # 캐시된 표를 공유하므로 수정하지 않음
+        self.max_volume = max(self.keyword_volumes.values(), default=0.0)
+        self.seasonality = seasonality if seasonality is not None else DEFAULT_SEASONALITY
+        self.weights = dict(weights if weights is not None else DEFAULT_WEIGHTS)
+        self.today = today or datetime.date.today
+
+        unknown = set(self.weights) - set(SCORERS)
+        if unknown:
+            raise ValueError(f"알 수 없는 점수 항목: {', '.join(sorted(unknown))}")
+
+    def score(self, business_type: str, topic: TopicSuggestion) -> TopicScore:
+        """주제 하나 채점"""
+        components: Dict[str, float] = {}
+        for name, weight in self.weights.items():
+            if weight <= 0:
+                continue
+            value = SCORERS[name](self, business_type, topic)
+            if value is not None:
+                components[name] = max(0.0, min(1.0, value))
+
+        total_weight = sum(self.weights[name] for name in components)
+        score = sum(
+            self.weights[name] * value for name, value in components.items()
+        ) / total_weight if total_weight else 0.0
+
+        duplicate = (
+            self.topic_index is not None
+            and "novelty" in components
+            and 1.0 - components["novelty"] >= self.topic_index.threshold
+        )
+        return TopicScore(topic, round(score, 4), duplicate, components)
+
+    def rank(self, business_type: str, topics: List[TopicSuggestion]) -> List[TopicScore]:
+        """
+        주제를 좋은 순으로 정렬합니다.
+        중복이 아닌 주제가 먼저 오고, 같은 점수면 추천 순서를 유지합니다.
+        """
+        scores = [self.score(business_type, topic) for topic in topics]
+        return sorted(scores, key=lambda s: (s.duplicate, -s.score))
+
+    def select(self, business_type: str, topics: List[TopicSuggestion]) -> TopicSuggestion:
+        """가장 좋은 주제 하나를 고릅니다."""
+        if not topics:
+            raise ValueError("선택할 주제가 없습니다.")
+
+        ranked = self.rank(business_type, topics)
+        best = ranked[0]
+        telemetry.registry.observe("topic_selection_score", best.score)
+        if best.topic is not topics[0]:
+            telemetry.registry.inc("topic_selection_reordered_total")
+        return best.topic
+
+
+def load_keyword_volumes(path: str) -> Dict[Tuple[str, str], float]:
+    """
+    키워드 검색량 CSV를 읽습니다.
+    keyword, volume 열이 필수이며, business_type 열이 있으면 해당 업종에만 적용합니다.
+    노드 실행마다 호출되므로 파일이 바뀌지 않았으면 (mtime 기준) 읽어 둔 표를 그대로 반환합니다.
+    """
+    return _load_keyword_volumes(path, os.path.getmtime(path))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_keyword_volumes(path: str, mtime: float) -> Dict[Tuple[str, str], float]:
+    volumes: Dict[Tuple[str, str], float] = {}
+    with open(path, encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            keyword = normalize_text(row.get("keyword") or "")
+            try:
+                volume = float((row.get("volume") or "").replace(",", ""))
+            except ValueError:
+                continue
+            if keyword:
+                volumes[((row.get("business_type") or "").strip(), keyword)] = volume
+    return volumes
+
+
+def load_seasonality(path: str) -> Dict[int, List[str]]:
+    """계절 키워드 CSV를 읽습니다 (month(1~12), keyword 열, 파일이 바뀌지 않았으면 캐시 사용)."""
+    return _load_seasonality(path, os.path.getmtime(path))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_seasonality(path: str, mtime: float) -> Dict[int, List[str]]:
+    table: Dict[int, List[str]] = {}
+    with open(path, encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            try:
+                month = int(row.get("month") or "")
+            except ValueError:
+                continue
+            keyword = (row.get("keyword") or "").strip()
+            if 1 <= month <= 12 and keyword:
+                table.setdefault(month, []).append(keyword)
+    return table
+
+
+def _parse_weights(value: str) -> Dict[str, float]:
+    """가중치 문자열 파싱 (예: novelty=0.5,volume=0.3, 지정하지 않은 항목은 기본값)"""
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip():
+            weights[name.strip()] = float(weight)
+    return weights
+
+
+def create_topic_scorer_from_env(topic_index: Optional[TopicIndex] = None) -> TopicScorer:
+    """
+    환경 변수로 주제 선택기를 생성합니다.
+
+    - TOPIC_KEYWORD_VOLUME_CSV: 키워드 검색량 CSV 경로 (keyword, volume[, business_type] 열)
+    - TOPIC_SEASONALITY_CSV: 계절 키워드 CSV 경로 (month, keyword 열, 기본값: 내장 표)
+    - TOPIC_SCORE_WEIGHTS: 항목별 가중치 (예: "novelty=0.5,volume=0.3,seasonality=0")
+    """
+    volume_path = os.getenv("TOPIC_KEYWORD_VOLUME_CSV", "").strip()
+    seasonality_path = os.getenv("TOPIC_SEASONALITY_CSV", "").strip()
+    weights = os.getenv("TOPIC_SCORE_WEIGHTS", "").strip()
+
+    return TopicScorer(
+        topic_index=topic_index,
+        keyword_volumes=load_keyword_volumes(volume_path) if volume_path else None,
+        seasonality=load_seasonality(seasonality_path) if seasonality_path else None,
+        weights=_parse_weights(weights) if weights else None
+    )
+
+
+def get_topic_scorer(config: Optional[Dict[str, Any]]) -> TopicScorer:
+    """노드 config의 configurable["topic_scorer"] 또는 환경 변수로 만든 선택기"""
+    configurable = (config or {}).get("configurable", {})
+    scorer = configurable.get("topic_scorer")
+    if scorer is not None:
+        return scorer
+    return create_topic_scorer_from_env(get_topic_index(config))
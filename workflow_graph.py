@@ -1,15 +1,57 @@
 """
 LangGraph를 사용한 멀티 에이전트 워크플로우 구현
-Agent 1(기획) → Agent 2(작성) 간 데이터 흐름을 관리합니다.
+Agent 1(기획) → Agent 2(작성) → Agent 3(검수) 간 데이터 흐름을 관리합니다.
 """
-from typing import Literal
+from typing import Any, Callable, Dict, List, Literal, Optional
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
+from checkpoint import checkpointed
+from telemetry import instrumented
+from topic_scoring import get_topic_scorer
 from workflow_state import WorkflowState
 from agent_planner import planner_node
+from agent_reviewer import (  # noqa: F401 (한도 상수 재노출)
+    DEFAULT_REVIEW_TIME_BUDGET, DEFAULT_REVIEW_TOKEN_BUDGET, MAX_REVIEW_RETRIES,
+    can_retry_review, reviewer_node
+)
 from agent_writer import writer_node
 
 
-def create_workflow() -> StateGraph:
+NodeOverrides = Optional[Dict[str, Callable]]
+
+
+def _add_linear_flow(
+    workflow: StateGraph,
+    order: List[str],
+    nodes: Dict[str, Callable],
+    stop_after: Optional[str],
+    finish: bool = True
+) -> None:
+    """
+    order 순서대로 노드를 추가하고 직선으로 연결합니다.
+    stop_after가 지정되면 해당 노드 다음에 바로 종료합니다.
+    finish가 False면 (stop_after가 없을 때) 마지막 노드의 다음 엣지는 호출한 쪽에서 연결합니다.
+    각 노드는 실행 직후 체크포인트를 저장하고, 실행 시간/토큰/비용을 계측하도록 감쌉니다.
+    """
+    if stop_after is not None:
+        if stop_after not in order:
+            raise ValueError(f"알 수 없는 노드: {stop_after}")
+        finish = True
+        order = order[:order.index(stop_after) + 1]
+
+    for name in order:
+        workflow.add_node(name, instrumented(name, checkpointed(name, nodes[name])))
+
+    workflow.set_entry_point(order[0])
+    for current, following in zip(order, order[1:]):
+        workflow.add_edge(current, following)
+    if finish:
+        workflow.add_edge(order[-1], END)
+
+
+def create_workflow(
+    nodes: NodeOverrides = None, stop_after: Optional[str] = None
+) -> StateGraph:
     """
     멀티 에이전트 워크플로우 그래프를 생성합니다.
 
@@ -18,88 +60,113 @@ def create_workflow() -> StateGraph:
     2. planner → topic_selection (사용자 선택 대기)
     3. topic_selection → writer (Agent 2: Claude)
     4. writer → END
+
+    Args:
+        nodes: 기본 노드 함수를 대체할 {노드 이름: 함수}
+        stop_after: 이 노드까지만 실행하고 종료 (예: "planner")
     """
 
     # StateGraph 초기화
     workflow = StateGraph(WorkflowState)
 
-    # 노드 추가
-    workflow.add_node("planner", planner_node)
-    workflow.add_node("writer", writer_node)
-    workflow.add_node("topic_selection", topic_selection_node)
+    node_functions = {
+        "planner": planner_node,
+        "topic_selection": topic_selection_node,
+        "writer": writer_node,
+        **(nodes or {}),
+    }
 
-    # 엣지 정의
-    workflow.set_entry_point("planner")
-    workflow.add_edge("planner", "topic_selection")
-    workflow.add_edge("topic_selection", "writer")
-    workflow.add_edge("writer", END)
+    # 노드 추가 및 엣지 정의
+    _add_linear_flow(
+        workflow, ["planner", "topic_selection", "writer"], node_functions, stop_after
+    )
 
     return workflow
 
 
-def topic_selection_node(state: WorkflowState) -> WorkflowState:
+def topic_selection_node(
+    state: WorkflowState, config: Optional[RunnableConfig] = None
+) -> Dict[str, Any]:
     """
-    사용자가 주제를 선택할 수 있도록 대기하는 노드
+    사용자가 주제를 선택할 수 있도록 대기하는 노드 (바뀐 필드만 반환)
     실제 구현에서는 사용자 입력을 받아야 하지만,
-    여기서는 첫 번째 주제를 자동 선택합니다.
+    여기서는 LLM 호출 없이 로컬 점수(작성 주제와의 중복, 제목 길이, 계절성, 키워드 검색량)가
+    가장 높은 주제를 자동 선택합니다.
+    config의 configurable에 topic_scorer가 있으면 해당 선택기를 사용합니다.
     """
-    if state.get("topic_suggestions") and not state.get("selected_topic"):
-        # 첫 번째 주제 자동 선택 (데모용)
-        state["selected_topic"] = state["topic_suggestions"][0]
+    suggestions = state.get("topic_suggestions")
+    if suggestions and not state.get("selected_topic"):
+        scorer = get_topic_scorer(config)
+        return {"selected_topic": scorer.select(state["business_type"], suggestions)}
 
-    return state
+    return {}
 
 
-def create_advanced_workflow() -> StateGraph:
+def create_advanced_workflow(
+    nodes: NodeOverrides = None, stop_after: Optional[str] = None
+) -> StateGraph:
     """
-    고급 워크플로우: Agent 3(편집), Agent 4(이미지), Agent 5(퍼블리싱) 포함
-    추후 확장을 위한 스켈레톤 코드
+    고급 워크플로우: Agent 3(검수) 포함, Agent 4(이미지), Agent 5(퍼블리싱)는 추후 확장
+
+    워크플로우 흐름:
+    1. planner → topic_selection → writer
+    2. writer → reviewer (Agent 3: GPT)
+    3. reviewer → writer (불합격한 플랫폼만 피드백을 반영해 다시 작성) 또는 END
+
+    재작성 횟수와 루프의 토큰/시간 예산은 should_retry의 configurable로 제한합니다.
+
+    Args:
+        nodes: 기본 노드 함수를 대체할 {노드 이름: 함수}
+        stop_after: 이 노드까지만 실행하고 종료 (예: "planner")
     """
 
     workflow = StateGraph(WorkflowState)
 
-    # 기본 노드
-    workflow.add_node("planner", planner_node)
-    workflow.add_node("topic_selection", topic_selection_node)
-    workflow.add_node("writer", writer_node)
+    node_functions = {
+        "planner": planner_node,
+        "topic_selection": topic_selection_node,
+        "writer": writer_node,
+        "reviewer": reviewer_node,
+        **(nodes or {}),
+    }
+
+    # 기본 노드 및 기본 플로우 (stop_after가 있으면 재작성 루프 없이 종료)
+    _add_linear_flow(
+        workflow, ["planner", "topic_selection", "writer", "reviewer"],
+        node_functions, stop_after, finish=False
+    )
+    if stop_after is not None:
+        return workflow
 
     # 추가 노드 (스켈레톤)
-    # workflow.add_node("reviewer", reviewer_node)  # Agent 3
     # workflow.add_node("image_generator", image_generator_node)  # Agent 4
     # workflow.add_node("publisher", publisher_node)  # Agent 5
 
-    # 기본 플로우
-    workflow.set_entry_point("planner")
-    workflow.add_edge("planner", "topic_selection")
-    workflow.add_edge("topic_selection", "writer")
-
-    # 조건부 라우팅 (추후 구현)
-    # workflow.add_conditional_edges(
-    #     "reviewer",
-    #     should_retry,
-    #     {
-    #         "retry": "writer",  # 검수 실패 시 다시 작성
-    #         "continue": "image_generator"  # 검수 통과 시 이미지 생성
-    #     }
-    # )
-
-    workflow.add_edge("writer", END)
+    workflow.add_conditional_edges(
+        "reviewer",
+        should_retry,
+        {
+            "retry": "writer",  # 검수 실패 시 불합격한 플랫폼만 다시 작성
+            "continue": END  # 추후 이미지 생성(image_generator)으로 진행
+        }
+    )
 
     return workflow
 
 
-def should_retry(state: WorkflowState) -> Literal["retry", "continue"]:
+def should_retry(
+    state: WorkflowState, config: Optional[RunnableConfig] = None
+) -> Literal["retry", "continue"]:
     """
     Agent 3(검수) 결과에 따라 다음 노드를 결정합니다.
-    - retry: Agent 2로 돌아가서 다시 작성
-    - continue: Agent 4(이미지 생성)로 진행
+    상태는 바꾸지 않으며, retry_count와 review_usage는 writer/reviewer 노드가 갱신합니다.
+    - retry: Agent 2로 돌아가서 불합격한 플랫폼만 다시 작성
+    - continue: 다음 단계로 진행 (통과, 재시도 횟수 초과, 토큰/시간 예산 소진)
+
+    configurable:
+        max_review_retries: 최대 재작성 횟수 (기본값: 2)
+        review_token_budget: 검수/재작성 루프의 토큰 예산 (기본값: 60,000)
+        review_time_budget: 검수/재작성 루프의 시간 예산(초) (기본값: 300)
     """
-    if state.get("retry_count", 0) >= 2:
-        # 최대 재시도 횟수 초과 시 강제 진행
-        return "continue"
-
-    if not state.get("review_passed", False):
-        state["retry_count"] = state.get("retry_count", 0) + 1
-        return "retry"
-
-    return "continue"
+    # 통과했거나, 재시도 횟수 초과/토큰·시간 예산 소진 시 불합격 상태(review_passed=False) 그대로 진행
+    return "retry" if can_retry_review(state, config) else "continue"
@@ -0,0 +1,100 @@
+"""
+워크플로우 실행기
+컴파일된 LangGraph 그래프를 프로세스 안에서 한 번만 만들어 재사용하고,
+CLI(main.py)와 웹(app.py)이 같은 경로로 워크플로우를 실행하도록 합니다.
+"""
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+import telemetry
+from checkpoint import CheckpointStore, get_default_checkpoint_store
+from workflow_graph import NodeOverrides, create_advanced_workflow, create_workflow
+from workflow_state import WorkflowState
+
+
+WORKFLOW_VARIANTS = {
+    "basic": create_workflow,
+    "advanced": create_advanced_workflow,
+}
+
+_compiled_workflows: Dict[Tuple[Hashable, ...], Any] = {}
+_compiled_lock = threading.Lock()
+
+
+def get_compiled_workflow(
+    variant: str = "basic",
+    nodes: NodeOverrides = None,
+    stop_after: Optional[str] = None
+):
+    """
+    컴파일된 워크플로우를 반환합니다 (설정별로 한 번만 생성/검증).
+
+    Args:
+        variant: 워크플로우 종류 ("basic" 또는 "advanced")
+        nodes: 기본 노드 함수를 대체할 {노드 이름: 함수}
+        stop_after: 이 노드까지만 실행하고 종료
+
+    Returns:
+        컴파일된 그래프 (스레드 간 공유 가능)
+    """
+    if variant not in WORKFLOW_VARIANTS:
+        raise ValueError(f"알 수 없는 워크플로우: {variant}")
+
+    key = (variant, stop_after, tuple(sorted((nodes or {}).items())))
+
+    with _compiled_lock:
+        compiled = _compiled_workflows.get(key)
+        if compiled is None:
+            compiled = WORKFLOW_VARIANTS[variant](
+                nodes=nodes, stop_after=stop_after
+            ).compile()
+            _compiled_workflows[key] = compiled
+        return compiled
+
+
+def run_workflow(
+    state: WorkflowState,
+    variant: str = "basic",
+    stop_after: Optional[str] = None,
+    configurable: Optional[Dict[str, Any]] = None,
+    nodes: NodeOverrides = None,
+    thread_id: Optional[str] = None,
+    checkpoint_store: Optional[CheckpointStore] = None
+) -> WorkflowState:
+    """
+    워크플로우를 실행하고 최종 상태를 반환합니다.
+
+    이미 채워진 단계(예: topic_suggestions, selected_topic)는 노드에서 건너뛰므로
+    웹처럼 단계별로 나눠 실행할 때도 같은 그래프를 사용할 수 있습니다.
+
+    Args:
+        state: 초기 상태
+        variant: 워크플로우 종류 ("basic" 또는 "advanced")
+        stop_after: 이 노드까지만 실행하고 종료 (예: "planner")
+        configurable: 노드에 전달할 실행 설정
+            (예: {"planner_model": "gemini", "gemini_api_key": "..."})
+        nodes: 기본 노드 함수를 대체할 {노드 이름: 함수}
+        thread_id: 체크포인트 ID. 지정하면 노드마다 상태를 저장하고,
+            같은 ID의 체크포인트가 있으면 state 대신 마지막 저장 상태에서 이어서 실행
+        checkpoint_store: 체크포인트 저장소 (기본값: CHECKPOINT_PATH의 SQLite 파일)
+    """
+    configurable = dict(configurable or {})
+
+    if thread_id is not None:
+        store = checkpoint_store or get_default_checkpoint_store()
+        saved = store.load(thread_id)
+        if saved is not None:
+            state = saved
+        configurable.update({"thread_id": thread_id, "checkpoint_store": store})
+
+    app = get_compiled_workflow(variant, nodes=nodes, stop_after=stop_after)
+
+    # 노드별 계측값을 실행 단위(글 한 편)로 합산하여 JSON 로그로 남김
+    with telemetry.span(f"workflow:{variant}", kind="workflow", thread_id=thread_id,
+                        business_type=state.get("business_type")):
+        return app.invoke(state, config={"configurable": configurable})
+
+
+def clear_compiled_workflows() -> None:
+    """컴파일된 워크플로우 캐시 비우기 (노드 코드를 다시 불러온 경우 등)"""
+    with _compiled_lock:
+        _compiled_workflows.clear()
@@ -2,22 +2,39 @@
 멀티 에이전트 워크플로우의 상태 정의
 각 에이전트 간에 전달되는 데이터 구조를 정의합니다.
 """
-from typing import TypedDict, List, Optional
-from pydantic import BaseModel
+import hashlib
+from typing import Any, TypedDict, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
 
 
 class TopicSuggestion(BaseModel):
-    """주제 제안 데이터 모델"""
+    """주제 제안 데이터 모델 (불변: 노드와 체크포인트가 복사 없이 같은 객체를 공유)"""
+    model_config = ConfigDict(frozen=True)
+
     keyword: str
     title: str
     reason: str
 
 
 class ContentVersion(BaseModel):
-    """플랫폼별 콘텐츠 버전"""
+    """플랫폼별 콘텐츠 버전 (불변)"""
+    model_config = ConfigDict(frozen=True)
+
     platform: str  # "naver", "tistory", "google"
     content: str
     tone: str  # "friendly", "professional", "casual"
+    input_hash: Optional[str] = None  # 작성 당시 입력(주제, 톤 가이드라인, 모델) 해시
+
+
+class ReviewResult(BaseModel):
+    """플랫폼별 검수 결과 (불변)"""
+    model_config = ConfigDict(frozen=True)
+
+    platform: str
+    passed: bool
+    score: int  # 0~100
+    feedback: str  # 다시 작성할 때 반영할 수정 사항
+    content_hash: str  # 검수한 본문의 해시 (본문이 바뀌지 않았으면 다시 검수하지 않음)
 
 
 class WorkflowState(TypedDict):
@@ -31,10 +48,13 @@ class WorkflowState(TypedDict):
 
     # Agent 2 (Claude) Output
     content_versions: Optional[List[ContentVersion]]  # 플랫폼별 작성된 글
+    content_errors: Optional[Dict[str, str]]  # 작성 실패한 플랫폼별 오류 메시지
 
     # Agent 3 (GPT-4o) Output
     review_passed: Optional[bool]  # 검수 통과 여부
     review_feedback: Optional[str]  # 검수 피드백
+    review_results: Optional[Dict[str, ReviewResult]]  # 플랫폼별 검수 결과
+    review_usage: Optional[Dict[str, float]]  # 검수/재작성 루프에 쓴 토큰 수(tokens)와 시간(seconds)
 
     # Agent 4 (GPT-4o + DALL-E) Output
     image_prompt: Optional[str]  # 생성된 이미지 프롬프트
@@ -46,3 +66,144 @@ class WorkflowState(TypedDict):
     # Workflow Control
     retry_count: int  # Agent 3에서 다시 Agent 2로 돌아간 횟수
     current_step: str  # 현재 진행 중인 단계
+
+
+def create_initial_state(
+    business_type: str, selected_topic: Optional[TopicSuggestion] = None
+) -> WorkflowState:
+    """
+    워크플로우 초기 상태를 생성합니다.
+
+    Args:
+        business_type: 업종
+        selected_topic: 미리 정한 주제 (있으면 기획 단계를 건너뜀)
+    """
+    return {
+        "business_type": business_type,
+        "topic_suggestions": [selected_topic] if selected_topic else None,
+        "selected_topic": selected_topic,
+        "content_versions": None,
+        "content_errors": None,
+        "review_passed": None,
+        "review_feedback": None,
+        "review_results": None,
+        "review_usage": None,
+        "image_prompt": None,
+        "image_url": None,
+        "published_urls": None,
+        "retry_count": 0,
+        "current_step": "writing" if selected_topic else "planning"
+    }
+
+
+def add_review_usage(state: WorkflowState, tokens: int, seconds: float) -> None:
+    """검수/재작성 루프에 쓴 토큰 수와 시간을 누적 (예산 초과 시 루프 종료에 사용)"""
+    usage = dict(state.get("review_usage") or {"tokens": 0, "seconds": 0.0})
+    usage["tokens"] = usage.get("tokens", 0) + tokens
+    usage["seconds"] = round(usage.get("seconds", 0.0) + seconds, 3)
+    state["review_usage"] = usage
+
+
+def text_hash(text: str) -> str:
+    """본문을 식별하는 해시 (검수 결과 비교, 체크포인트에 본문을 한 번만 저장할 때 키로 사용)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def updated_fields(before: Dict[str, Any], after: WorkflowState) -> Dict[str, Any]:
+    """
+    노드 실행 전후 상태를 비교하여 바뀐 필드만 반환합니다 (값은 복사하지 않음).
+    노드가 전체 상태 대신 이 결과를 반환하면 LangGraph가 바뀐 필드만 갱신합니다.
+
+    Args:
+        before: 노드 실행 전 상태의 얕은 복사본 (dict(state))
+        after: 노드 실행 후 상태
+    """
+    return {
+        key: value for key, value in after.items()
+        if key not in before or before[key] is not value
+    }
+
+
+def version_to_dict(
+    version: ContentVersion, texts: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    ContentVersion을 dict로 변환합니다.
+    texts를 넘기면 본문 대신 content_ref(본문 해시)를 넣고 본문은 texts에 한 번만 모읍니다.
+    """
+    if texts is None:
+        return version.model_dump()
+
+    ref = text_hash(version.content)
+    texts[ref] = version.content
+    data = version.model_dump(exclude={"content"})
+    data["content_ref"] = ref
+    return data
+
+
+def version_from_dict(
+    data: Dict[str, Any], texts: Optional[Dict[str, str]] = None
+) -> ContentVersion:
+    """version_to_dict로 만든 dict를 ContentVersion으로 복원"""
+    if "content_ref" in data:
+        data = dict(data)
+        data["content"] = (texts or {})[data.pop("content_ref")]
+    return ContentVersion(**data)
+
+
+def state_to_dict(
+    state: WorkflowState, texts: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    상태를 JSON 직렬화 가능한 dict로 변환 (체크포인트 저장용)
+
+    Args:
+        state: 워크플로우 상태
+        texts: 지정하면 글 본문을 {본문 해시: 본문}으로 따로 모으고 상태에는 해시만 남김
+    """
+    data: Dict[str, Any] = dict(state)
+
+    if data.get("topic_suggestions") is not None:
+        data["topic_suggestions"] = [t.model_dump() for t in data["topic_suggestions"]]
+    if data.get("selected_topic") is not None:
+        data["selected_topic"] = data["selected_topic"].model_dump()
+    if data.get("content_versions") is not None:
+        data["content_versions"] = [
+            version_to_dict(c, texts) for c in data["content_versions"]
+        ]
+    if data.get("review_results") is not None:
+        data["review_results"] = {
+            platform: r.model_dump() for platform, r in data["review_results"].items()
+        }
+
+    return data
+
+
+def state_from_dict(
+    data: Dict[str, Any], texts: Optional[Dict[str, str]] = None
+) -> WorkflowState:
+    """
+    state_to_dict로 만든 dict를 상태로 복원
+
+    Args:
+        data: state_to_dict의 결과 (JSON에서 읽은 값)
+        texts: content_ref로 저장한 본문 {본문 해시: 본문}
+    """
+    state: Dict[str, Any] = dict(data)
+
+    if state.get("topic_suggestions") is not None:
+        state["topic_suggestions"] = [
+            TopicSuggestion(**t) for t in state["topic_suggestions"]
+        ]
+    if state.get("selected_topic") is not None:
+        state["selected_topic"] = TopicSuggestion(**state["selected_topic"])
+    if state.get("content_versions") is not None:
+        state["content_versions"] = [
+            version_from_dict(c, texts) for c in state["content_versions"]
+        ]
+    if state.get("review_results") is not None:
+        state["review_results"] = {
+            platform: ReviewResult(**r) for platform, r in state["review_results"].items()
+        }
+
+    return state